@@ -1,21 +1,33 @@
 from flask import Flask
-from flask_smorest import Api
 from extension import db
+import db_routing
+import query_counter
+import metrics
+from recipes.http_cache import response_cache
 from recipes.recipe_api import blp as RecipesBlueprint
 from mood.mood_api import blp as MoodBlueprint
 from children_info.children_api import blp as ChildBlueprint
 from meals.meal_api import blp as MealBlueprint
+from insights.insights_api import blp as InsightsBlueprint
+from mood.cli import mood_cli
+from mood.ingest import mood_ingest
 import config
 from flask_cors import CORS
 import os
 from schemas.common import ErrorSchema
+from spec_file import SpecFileApi
 
 def create_app():
     app = Flask(__name__)
     app.config.from_object(config.Config)
 
     db.init_app(app)
-    api = Api(app)
+    db_routing.init_app(app)
+    query_counter.init_app(app)
+    response_cache.init_app(app)
+    metrics.init_app(app)
+    mood_ingest.init_app(app)
+    api = SpecFileApi(app)
     
     components = api.spec.components
     
@@ -40,8 +52,10 @@ def create_app():
     api.register_blueprint(MealBlueprint)
     api.register_blueprint(MoodBlueprint)
     api.register_blueprint(ChildBlueprint)
+    api.register_blueprint(InsightsBlueprint)
     
     app.url_map.strict_slashes = False
+    app.cli.add_command(mood_cli)
     
     frontend_urls = os.getenv("FRONTEND_URL", "http://localhost:8081").split(",")
     CORS(
@@ -52,7 +66,5 @@ def create_app():
 
     return app
 
-app = create_app() 
-
 if __name__ == "__main__":
-    app.run(debug=True)
+    create_app().run(debug=True)
@@ -0,0 +1,120 @@
+"""
+ASGI entry point for high-concurrency serving:
+
+    uvicorn asgi:app --workers 4
+    gunicorn -k uvicorn.workers.UvicornWorker -w 4 asgi:app
+
+The busiest mood log and meal endpoints (mood/mood_async.py,
+meals/meal_async.py) run as coroutines on an async SQLAlchemy session, so
+a request waiting on Postgres does not hold a worker. Every other route,
+the OpenAPI docs and CORS preflights fall through to the Flask app, which
+asgiref runs in a thread pool.
+"""
+import logging
+import os
+import time
+
+from asgiref.wsgi import WsgiToAsgi
+
+from app import create_app
+from async_db import async_db
+from async_routes import AsyncRequest, HTTPError
+from fast_json import dumps
+from meals.meal_async import router as meal_router
+from metrics import REQUEST_SECONDS
+from mood.ingest import mood_ingest
+from mood.mood_async import router as mood_router
+
+logger = logging.getLogger(__name__)
+
+ROUTERS = [mood_router, meal_router]
+
+
+class AsyncApp:
+    def __init__(self, flask_app, routers):
+        self.flask_app = flask_app
+        self.routers = routers
+        self.wsgi = WsgiToAsgi(flask_app)
+        self.origins = {
+            origin.encode() for origin in os.getenv("FRONTEND_URL", "http://localhost:8081").split(",")
+        }
+        self.expose_headers = ", ".join(flask_app.config["CORS_EXPOSE_HEADERS"]).encode()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            return await self._lifespan(receive, send)
+
+        route = self._match(scope)
+        if route is None:
+            return await self.wsgi(scope, receive, send)
+
+        endpoint, handler, kwargs = route
+        started = time.perf_counter()
+        headers = {}
+        try:
+            request = AsyncRequest(scope, await self._read_body(receive))
+            # (payload, status) or (payload, status, extra headers)
+            payload, status, *extra = await handler(request, **kwargs)
+            if extra:
+                headers = extra[0]
+        except HTTPError as exc:
+            payload, status = exc.body, exc.status
+        except Exception:
+            logger.exception("Exception on %s %s", scope["method"], scope["path"])
+            payload, status = HTTPError(500).body, 500
+
+        await self._respond(scope, send, status, dumps(payload), headers)
+        REQUEST_SECONDS.labels(
+            endpoint.split(".")[0], endpoint, scope["method"], status
+        ).observe(time.perf_counter() - started)
+
+    def _match(self, scope):
+        if scope["type"] != "http":
+            return None
+        for router in self.routers:
+            route = router.match(scope["method"], scope["path"])
+            if route is not None:
+                return route
+        return None
+
+    async def _read_body(self, receive):
+        body = b""
+        while True:
+            message = await receive()
+            body += message.get("body", b"")
+            if not message.get("more_body"):
+                return body
+
+    async def _respond(self, scope, send, status, body, extra_headers):
+        headers = [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+        ]
+        headers += [(name.lower().encode(), value.encode()) for name, value in extra_headers.items()]
+        origin = dict(scope["headers"]).get(b"origin")
+        if origin in self.origins:
+            # Same headers flask-cors adds to the Flask routes
+            headers += [
+                (b"access-control-allow-origin", origin),
+                (b"access-control-allow-credentials", b"true"),
+                (b"access-control-expose-headers", self.expose_headers),
+                (b"vary", b"Origin"),
+            ]
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                mood_ingest.start()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await async_db.dispose()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+
+flask_app = create_app()
+async_db.init_app(flask_app)
+app = AsyncApp(flask_app, ROUTERS)
@@ -0,0 +1,46 @@
+"""
+Async SQLAlchemy engine and sessions for the ASGI serving mode (asgi.py).
+
+Uses the same DATABASE_URL and pool settings as the Flask-SQLAlchemy
+engine, swapping in an asyncio driver: asyncpg for PostgreSQL, aiosqlite
+for SQLite. The models are shared; only the session differs.
+"""
+from contextlib import asynccontextmanager
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
+
+
+def async_url(url):
+    url = make_url(url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No asyncio driver configured for {backend!r} databases")
+    return url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}")
+
+
+class AsyncDatabase:
+    def __init__(self):
+        self.engine = None
+        self._sessionmaker = None
+
+    def init_app(self, app):
+        self.engine = create_async_engine(
+            async_url(app.config["SQLALCHEMY_DATABASE_URI"]),
+            **app.config.get("SQLALCHEMY_ENGINE_OPTIONS", {}),
+        )
+        self._sessionmaker = async_sessionmaker(self.engine, expire_on_commit=False)
+
+    @asynccontextmanager
+    async def session(self):
+        async with self._sessionmaker() as session:
+            yield session
+
+    async def dispose(self):
+        if self.engine is not None:
+            await self.engine.dispose()
+
+
+async_db = AsyncDatabase()
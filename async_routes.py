@@ -0,0 +1,105 @@
+"""
+Minimal routing for the coroutine endpoints served by asgi.py.
+
+An AsyncRouter plays the part of a Blueprint: it holds `async def`
+handlers under a URL prefix and the same endpoint names as the Flask
+views they mirror, so metrics and logs line up across both serving
+modes. Request bodies and query strings are validated with the existing
+marshmallow schemas and errors use flask-smorest's response format.
+"""
+import json
+import re
+from urllib.parse import parse_qs
+
+from marshmallow import EXCLUDE, ValidationError
+
+_CONVERTERS = {"int": (r"\d+", int), "string": (r"[^/]+", str)}
+_PLACEHOLDER = re.compile(r"<(?:(\w+):)?(\w+)>")
+
+STATUS_PHRASES = {
+    400: "Bad Request",
+    404: "Not Found",
+    422: "Unprocessable Entity",
+    500: "Internal Server Error",
+}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, errors=None):
+        super().__init__(status)
+        self.status = status
+        self.body = {"code": status, "status": STATUS_PHRASES.get(status, "")}
+        if errors is not None:
+            self.body["errors"] = errors
+
+
+class AsyncRequest:
+    def __init__(self, scope, body):
+        self.method = scope["method"]
+        self.path = scope["path"]
+        self.body = body
+        self.args = {
+            key: values[0]
+            for key, values in parse_qs(scope.get("query_string", b"").decode("latin-1")).items()
+        }
+
+    def json(self):
+        try:
+            return json.loads(self.body or b"null")
+        except ValueError:
+            raise HTTPError(400) from None
+
+
+def _load(schema, data, location, **kwargs):
+    try:
+        return schema.load(data, **kwargs)
+    except ValidationError as exc:
+        raise HTTPError(422, {location: exc.messages}) from None
+
+
+def load_json(schema, request):
+    return _load(schema, request.json(), "json")
+
+
+def load_query(schema, request):
+    # Same as webargs: unknown query parameters are ignored
+    return _load(schema, request.args, "query", unknown=EXCLUDE)
+
+
+def _compile(rule):
+    converters = {}
+    regex, pos = "", 0
+    for placeholder in _PLACEHOLDER.finditer(rule):
+        kind, name = placeholder.group(1) or "string", placeholder.group(2)
+        pattern, converters[name] = _CONVERTERS[kind]
+        regex += re.escape(rule[pos:placeholder.start()]) + f"(?P<{name}>{pattern})"
+        pos = placeholder.end()
+    regex += re.escape(rule[pos:])
+    # strict_slashes is off in create_app(), so a trailing slash is optional
+    return re.compile(regex.rstrip("/") + "/?$"), converters
+
+
+class AsyncRouter:
+    def __init__(self, name, url_prefix=""):
+        self.name = name
+        self.url_prefix = url_prefix
+        self.routes = []  # (regex, converters, methods, endpoint, handler)
+
+    def route(self, rule, methods):
+        def decorator(handler):
+            regex, converters = _compile(self.url_prefix + rule)
+            endpoint = f"{self.name}.{handler.__name__}"
+            self.routes.append((regex, converters, set(methods), endpoint, handler))
+            return handler
+        return decorator
+
+    def match(self, method, path):
+        """Return (endpoint, handler, view kwargs) or None."""
+        for regex, converters, methods, endpoint, handler in self.routes:
+            if method not in methods:
+                continue
+            found = regex.match(path)
+            if found:
+                kwargs = {name: converters[name](value) for name, value in found.groupdict().items()}
+                return endpoint, handler, kwargs
+        return None
@@ -0,0 +1,53 @@
+"""
+Compare two benchmarks.load result files.
+
+    python -m benchmarks.compare base.json head.json [--threshold 10]
+
+Prints p50/p95/p99 per endpoint with the relative change and exits
+non-zero if any endpoint's p95 regressed by more than --threshold percent.
+"""
+import argparse
+import json
+import sys
+
+
+def _change(old, new):
+    if not old or new is None:
+        return None
+    return (new - old) / old * 100
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("base")
+    parser.add_argument("head")
+    parser.add_argument("--threshold", type=float, default=10.0,
+                        help="p95 regression (percent) that fails the comparison")
+    args = parser.parse_args()
+
+    with open(args.base) as f:
+        base = json.load(f)
+    with open(args.head) as f:
+        head = json.load(f)
+
+    print(f"base {base.get('revision')} ({base['timestamp']})  vs  head {head.get('revision')} ({head['timestamp']})\n")
+    print(f"{'endpoint':<42}{'p50 ms':>16}{'p95 ms':>16}{'p99 ms':>16}{'p95 Δ':>9}")
+
+    regressions = []
+    for name in sorted(set(base["endpoints"]) | set(head["endpoints"])):
+        old, new = base["endpoints"].get(name, {}), head["endpoints"].get(name, {})
+        cells = "".join(
+            f"{str(old.get(k)) + ' → ' + str(new.get(k)):>16}" for k in ("p50_ms", "p95_ms", "p99_ms")
+        )
+        delta = _change(old.get("p95_ms"), new.get("p95_ms"))
+        print(f"{name:<42}{cells}{'' if delta is None else f'{delta:+.0f}%':>9}")
+        if delta is not None and delta > args.threshold:
+            regressions.append(name)
+
+    if regressions:
+        print(f"\np95 regressed more than {args.threshold:.0f}%: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""
+Concurrent-connection capacity: WSGI (gunicorn sync workers) vs ASGI
+(uvicorn workers running asgi.py), same worker count, same database.
+
+    python -m benchmarks.concurrency --database-url postgresql://... --workers 4
+    python -m benchmarks.concurrency --levels 10,50,200,500 --seconds 10
+
+For each concurrency level, that many clients each hold one connection at
+a time and loop over a mood/meal request mix for --seconds. Reported per
+server and level: throughput, p50/p95/p99 latency and the share of
+requests that failed or took longer than --timeout. Capacity is the
+highest level whose p95 stays under --slo-ms with no failures.
+
+Use Postgres for meaningful numbers; SQLite serializes writers and the
+default fresh SQLite file only checks that both servers run.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from benchmarks.load import _percentile
+from benchmarks.seed import Volumes
+
+SERVERS = {
+    "wsgi": lambda port, workers: [
+        sys.executable, "-m", "gunicorn", "-w", str(workers), "-b", f"127.0.0.1:{port}",
+        "--log-level", "warning", "app:create_app()",
+    ],
+    "asgi": lambda port, workers: [
+        sys.executable, "-m", "uvicorn", "--workers", str(workers), "--port", str(port),
+        "--log-level", "warning", "asgi:app",
+    ],
+}
+
+
+def _mix(child_ids, rng):
+    child_id = rng.choice(child_ids)
+    roll = rng.random()
+    if roll < 0.35:
+        return "GET", f"/mood_logs/latest/{child_id}", None
+    if roll < 0.55:
+        end = datetime.now() - timedelta(days=rng.randint(0, 300))
+        query = f"start={(end - timedelta(days=7)).isoformat()}&end={end.isoformat()}"
+        return "GET", f"/mood_logs/range/{child_id}?{query}", None
+    if roll < 0.70:
+        return "GET", f"/meals/child/{child_id}?limit=20", None
+    if roll < 0.90:
+        return "POST", "/mood_logs/", {"child_id": child_id, "mood": rng.choice(["happy", "sad"])}
+    return "POST", "/meals/", {"child_id": child_id, "meal_name": "Bench", "meal_type": "Lunch"}
+
+
+async def _request(port, method, path, body, timeout):
+    payload = json.dumps(body).encode() if body is not None else b""
+    head = (
+        f"{method} {path} HTTP/1.1\r\nHost: 127.0.0.1\r\nConnection: close\r\n"
+        f"Content-Type: application/json\r\nContent-Length: {len(payload)}\r\n\r\n"
+    ).encode()
+
+    async def exchange():
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        try:
+            writer.write(head + payload)
+            await writer.drain()
+            response = await reader.read()
+        finally:
+            writer.close()
+        return int(response.split(b" ", 2)[1])
+
+    return await asyncio.wait_for(exchange(), timeout)
+
+
+async def _run_level(port, child_ids, clients, seconds, timeout, seed):
+    latencies, failures = [], 0
+    deadline = time.perf_counter() + seconds
+
+    async def client(n):
+        nonlocal failures
+        rng = random.Random(seed + n)
+        while time.perf_counter() < deadline:
+            method, path, body = _mix(child_ids, rng)
+            started = time.perf_counter()
+            try:
+                status = await _request(port, method, path, body, timeout)
+            except (OSError, asyncio.TimeoutError, IndexError, ValueError):
+                failures += 1
+                continue
+            if status >= 500:
+                failures += 1
+            else:
+                latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client(n) for n in range(clients)))
+    wall = time.perf_counter() - started
+
+    values = sorted(latencies)
+    total = len(values) + failures
+    ms = lambda v: round(v * 1000, 1) if v is not None else None
+    return {
+        "clients": clients,
+        "requests": total,
+        "throughput_rps": round(len(values) / wall, 1),
+        "failure_rate": round(failures / total, 4) if total else None,
+        "p50_ms": ms(_percentile(values, 50)),
+        "p95_ms": ms(_percentile(values, 95)),
+        "p99_ms": ms(_percentile(values, 99)),
+    }
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_for(port, process, seconds=30):
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("server exited during startup")
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError("server did not start listening")
+
+
+def bench_server(name, args, child_ids, env):
+    port = _free_port()
+    cwd = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    process = subprocess.Popen(SERVERS[name](port, args.workers), cwd=cwd, env=env)
+    try:
+        _wait_for(port, process)
+        return [
+            asyncio.run(_run_level(port, child_ids, level, args.seconds, args.timeout, args.seed))
+            for level in args.levels
+        ]
+    finally:
+        process.send_signal(signal.SIGTERM)
+        process.wait(timeout=30)
+
+
+def capacity(rows, slo_ms):
+    passing = [r["clients"] for r in rows if not r["failure_rate"] and r["p95_ms"] is not None and r["p95_ms"] <= slo_ms]
+    return max(passing, default=0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--database-url", help="defaults to a fresh SQLite file")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--levels", type=lambda s: [int(v) for v in s.split(",")], default=[10, 50, 100, 200])
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--timeout", type=float, default=5, help="per request, seconds")
+    parser.add_argument("--slo-ms", type=float, default=250, help="p95 target for the capacity figure")
+    parser.add_argument("--servers", default="wsgi,asgi")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write the results JSON here")
+    args = parser.parse_args()
+
+    database_url = args.database_url or "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db")
+    os.environ["DATABASE_URL"] = database_url
+
+    from app import create_app
+    from benchmarks.seed import seed
+    from extension import db
+
+    app = create_app()
+    with app.app_context():
+        db.create_all(bind_key=None)
+        child_ids = seed(Volumes(children=100, moods_per_child=200, meals_per_child=200,
+                                 recipes=100, ingredients=50), args.seed)
+        db.engine.dispose()
+
+    env = dict(os.environ, DATABASE_URL=database_url)
+    results = {}
+    for name in args.servers.split(","):
+        results[name] = bench_server(name, args, child_ids, env)
+        print(f"\n{name} ({args.workers} workers)")
+        print(f"{'clients':>8}{'req/s':>9}{'fail %':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+        for row in results[name]:
+            print(f"{row['clients']:>8}{row['throughput_rps']:>9}{(row['failure_rate'] or 0) * 100:>8.1f}"
+                  f"{row['p50_ms']!s:>9}{row['p95_ms']!s:>9}{row['p99_ms']!s:>9}")
+
+    print()
+    for name, rows in results.items():
+        print(f"{name}: capacity {capacity(rows, args.slo_ms)} concurrent clients at p95 <= {args.slo_ms:.0f} ms")
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump({"database": database_url.split("://")[0], "workers": args.workers,
+                       "slo_ms": args.slo_ms, "results": results}, f, indent=2)
+        print(f"\nresults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
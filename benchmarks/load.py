@@ -0,0 +1,258 @@
+"""
+Load test: seed a database, then drive every route of create_app() with a
+weighted, realistic request mix and report per-endpoint throughput and
+latency percentiles.
+
+    python -m benchmarks.load --requests 5000 --output benchmarks/results/HEAD.json
+    python -m benchmarks.compare benchmarks/results/base.json benchmarks/results/HEAD.json
+
+Requests go through the Flask test client in-process, so the numbers
+measure the app and the database, not the network or the WSGI server.
+By default a fresh SQLite file is used; pass --database-url to point at a
+local Postgres instead (it must be empty, the schema is created).
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+
+from benchmarks.seed import WORDS, Volumes
+
+# Routes deliberately left out of the mix
+SKIPPED_RULES = {"static", "api-docs.openapi_json", "api-docs.openapi_swagger_ui"}
+# Full-text queries for /recipes/search, matching the seeded cooking steps
+SEARCH_QUERIES = ["oven", "no-bake", "roasted pumpkin", "baking", "simmer soup", "sliced mango"]
+
+
+class Context:
+    """Ids the request builders pick from; rows created during the run are
+    tracked so they can be updated and deleted without touching seed data."""
+
+    def __init__(self, child_ids):
+        self.lock = threading.Lock()
+        self.child_ids = list(child_ids)
+        self.created = defaultdict(list)
+
+    def child(self, rng):
+        return rng.choice(self.child_ids)
+
+    def add(self, kind, row_id):
+        with self.lock:
+            self.created[kind].append(row_id)
+
+    def pick(self, kind, rng, remove=False):
+        with self.lock:
+            ids = self.created[kind]
+            if not ids:
+                return None
+            i = rng.randrange(len(ids))
+            return ids.pop(i) if remove else ids[i]
+
+
+def _window(rng, days):
+    end = datetime.now() - timedelta(days=rng.randint(0, 300))
+    return {"start": (end - timedelta(days=days)).isoformat(), "end": end.isoformat()}
+
+
+def _days(rng, days):
+    end = date.today() - timedelta(days=rng.randint(0, 300))
+    return {"start": (end - timedelta(days=days)).isoformat(), "end": end.isoformat()}
+
+
+def _mood_body(ctx, rng):
+    return {"child_id": ctx.child(rng), "mood": rng.choice(["happy", "sad", "neutral"])}
+
+
+def _meal_body(ctx, rng):
+    return {"child_id": ctx.child(rng), "meal_name": "Bench", "meal_type": "Lunch",
+            "servings_fruit": 1, "servings_grain": 0.5}
+
+
+# endpoint -> (weight, builder(ctx, rng) -> (method, url, params, json) or None)
+MIX = {
+    "mood_logs.get_latest_mood": (15, lambda ctx, rng: ("GET", f"/mood_logs/latest/{ctx.child(rng)}", None, None)),
+    "mood_logs.get_moods_by_time_range": (10, lambda ctx, rng: ("GET", f"/mood_logs/range/{ctx.child(rng)}", _window(rng, 7), None)),
+    "mood_logs.get_mood_log": (5, lambda ctx, rng: ("GET", f"/mood_logs/{ctx.child(rng)}", {"limit": 50}, None)),
+    "mood_logs.get_all_mood_logs": (1, lambda ctx, rng: ("GET", "/mood_logs/", {"limit": 50}, None)),
+    "mood_logs.get_mood_summary": (6, lambda ctx, rng: ("GET", f"/mood_logs/summary/{ctx.child(rng)}", _days(rng, 30), None)),
+    "mood_logs.create_mood_log": (10, lambda ctx, rng: ("POST", "/mood_logs/", None, _mood_body(ctx, rng))),
+    "mood_logs.create_mood_logs_bulk": (1, lambda ctx, rng: ("POST", "/mood_logs/bulk", None, {"items": [_mood_body(ctx, rng) for _ in range(20)]})),
+    "mood_logs.update_mood_log": (1, lambda ctx, rng: (lambda i: i and ("PUT", f"/mood_logs/{i}", None, {"notes": "edited"}))(ctx.pick("mood_log", rng))),
+    "mood_logs.delete_mood_log": (0.5, lambda ctx, rng: (lambda i: i and ("DELETE", f"/mood_logs/{i}", None, None))(ctx.pick("mood_log", rng, remove=True))),
+    "meals.get_meals_by_child": (5, lambda ctx, rng: ("GET", f"/meals/child/{ctx.child(rng)}", {"limit": 50}, None)),
+    "meals.get_meals_by_time_range": (8, lambda ctx, rng: ("GET", f"/meals/range/{ctx.child(rng)}", _window(rng, 7), None)),
+    "meals.get_meals_summary": (8, lambda ctx, rng: ("GET", f"/meals/summary/{ctx.child(rng)}", {**_window(rng, 30), "bucket": "day"}, None)),
+    "meals.create_meal": (8, lambda ctx, rng: ("POST", "/meals/", None, _meal_body(ctx, rng))),
+    "meals.create_meals_bulk": (1, lambda ctx, rng: ("POST", "/meals/bulk", None, {"items": [_meal_body(ctx, rng) for _ in range(20)]})),
+    "meals.update_meal": (1, lambda ctx, rng: (lambda i: i and ("PUT", f"/meals/{i}", None, {"servings_fruit": 2}))(ctx.pick("meal", rng))),
+    "meals.delete_meal": (0.5, lambda ctx, rng: (lambda i: i and ("DELETE", f"/meals/{i}", None, None))(ctx.pick("meal", rng, remove=True))),
+    "children.get_children": (5, lambda ctx, rng: ("GET", "/children/", {"ids": ",".join(str(ctx.child(rng)) for _ in range(3))}, None)),
+    "children.get_dashboard": (5, lambda ctx, rng: ("GET", "/children/dashboard", {"ids": ",".join(str(ctx.child(rng)) for _ in range(4))}, None)),
+    "children.create_child": (0.5, lambda ctx, rng: ("POST", "/children/", None, {"name": "Bench", "gender": "F", "date_of_birth": "2018-05-01", "meals_per_day": 3})),
+    "children.update_child": (0.5, lambda ctx, rng: (lambda i: i and ("PUT", f"/children/{i}", None, {"meals_per_day": 4}))(ctx.pick("child", rng))),
+    "children.delete_child": (0.2, lambda ctx, rng: (lambda i: i and ("DELETE", f"/children/{i}", None, None))(ctx.pick("child", rng, remove=True))),
+    "children.export_child_history": (0.2, lambda ctx, rng: ("GET", f"/children/{ctx.child(rng)}/export", None, None)),
+    "recipes.get_all_recipes": (5, lambda ctx, rng: ("GET", "/recipes/", {"recipe_name": rng.choice(WORDS)[:rng.randint(2, 5)]}, None)),
+    "recipes.search_recipes": (3, lambda ctx, rng: ("GET", "/recipes/search", {"q": rng.choice(SEARCH_QUERIES)}, None)),
+    "recipes.get_makeable_recipes": (3, lambda ctx, rng: ("GET", "/recipes/makeable", {"ingredient_ids": ",".join(str(rng.randint(1, 200)) for _ in range(15)), "max_missing": 3}, None)),
+    "recipes.get_all_ingredients": (3, lambda ctx, rng: ("GET", "/recipes/ingredients", {"ingredient_name": rng.choice(WORDS)[:3]}, None)),
+    "recipes.get_all_dietary_guidelines": (3, lambda ctx, rng: ("GET", "/recipes/dietary-guidelines", {"age": rng.randint(2, 13)}, None)),
+    "recipes.get_recipe_ingredients": (3, lambda ctx, rng: ("GET", "/recipes/recipe_ingredients", {"recipe_id": rng.randint(1, 500)}, None)),
+    "recipes.get_meal_plan": (1, lambda ctx, rng: ("GET", f"/recipes/meal-plan/{ctx.child(rng)}", {"dietary_preferences": rng.choice(["Vegetarian", "Vegan"])} if rng.random() < 0.3 else None, None)),
+    "recipes.get_recipe_recommendations": (4, lambda ctx, rng: ("GET", f"/recipes/recommendations/{ctx.child(rng)}", {"limit": 10}, None)),
+    "insights.get_mood_nutrition_correlation": (2, lambda ctx, rng: ("GET", f"/insights/mood-nutrition/{ctx.child(rng)}", {**_days(rng, 60), "max_lag": 3}, None)),
+    "metrics": (0.2, lambda ctx, rng: ("GET", "/metrics", None, None)),
+}
+
+# Responses that create a row the mix may later update or delete
+CREATED_KIND = {
+    "mood_logs.create_mood_log": ("mood_log", "mood_log_id"),
+    "meals.create_meal": ("meal", "meal_id"),
+    "children.create_child": ("child", "child_id"),
+}
+
+
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    rank = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+def _summarize(latencies, errors, wall_seconds):
+    values = sorted(latencies)
+    ms = lambda v: round(v * 1000, 3) if v is not None else None
+    return {
+        "requests": len(values),
+        "errors": errors,
+        "throughput_rps": round(len(values) / wall_seconds, 1) if wall_seconds else None,
+        "mean_ms": ms(sum(values) / len(values)) if values else None,
+        "p50_ms": ms(_percentile(values, 50)),
+        "p95_ms": ms(_percentile(values, 95)),
+        "p99_ms": ms(_percentile(values, 99)),
+    }
+
+
+def _git_revision():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(app, child_ids, n_requests, threads, rng_seed):
+    ctx = Context(child_ids)
+    names = list(MIX)
+    weights = [MIX[name][0] for name in names]
+    latencies = defaultdict(list)
+    errors = defaultdict(int)
+    record_lock = threading.Lock()
+
+    def worker(worker_no, count):
+        rng = random.Random(rng_seed + worker_no)
+        client = app.test_client()
+        done = 0
+        while done < count:
+            name = rng.choices(names, weights)[0]
+            request = MIX[name][1](ctx, rng)
+            if not request:
+                continue  # nothing of that kind created yet
+            method, url, params, body = request
+            started = time.perf_counter()
+            response = client.open(url, method=method, query_string=params, json=body)
+            response.get_data()  # drain streamed bodies
+            elapsed = time.perf_counter() - started
+            with record_lock:
+                latencies[name].append(elapsed)
+                if response.status_code >= 500:
+                    errors[name] += 1
+            if name in CREATED_KIND and response.status_code == 201:
+                kind, id_field = CREATED_KIND[name]
+                ctx.add(kind, response.json[id_field])
+            done += 1
+
+    per_thread = [n_requests // threads + (1 if i < n_requests % threads else 0) for i in range(threads)]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        list(pool.map(worker, range(threads), per_thread))
+    wall = time.perf_counter() - started
+
+    endpoints = {
+        name: _summarize(latencies[name], errors[name], wall)
+        for name in sorted(latencies)
+    }
+    total = _summarize([v for vs in latencies.values() for v in vs], sum(errors.values()), wall)
+    return endpoints, total, wall
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    defaults = Volumes()
+    for field, value in defaults.as_dict().items():
+        parser.add_argument(f"--{field.replace('_', '-')}", type=int, default=value)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--threads", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--database-url", help="defaults to a fresh SQLite file")
+    parser.add_argument("--output", help="write the results JSON here")
+    args = parser.parse_args()
+
+    volumes = Volumes(**{f: getattr(args, f) for f in defaults.as_dict()})
+    database_url = args.database_url or "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db")
+    os.environ["DATABASE_URL"] = database_url
+
+    from app import create_app
+    from benchmarks.seed import seed
+    from extension import db
+
+    app = create_app()
+    with app.app_context():
+        db.create_all(bind_key=None)  # replicas get the schema by replication
+        started = time.perf_counter()
+        child_ids = seed(volumes, args.seed)
+        seed_seconds = time.perf_counter() - started
+
+    uncovered = sorted(
+        rule.endpoint for rule in app.url_map.iter_rules()
+        if rule.endpoint not in MIX and rule.endpoint not in SKIPPED_RULES
+    )
+    if uncovered:
+        print(f"warning: routes missing from the request mix: {', '.join(uncovered)}")
+
+    endpoints, total, wall = run(app, child_ids, args.requests, args.threads, args.seed)
+
+    print(f"seeded in {seed_seconds:.1f}s; {total['requests']} requests in {wall:.1f}s "
+          f"({total['throughput_rps']} req/s, {args.threads} thread(s))\n")
+    print(f"{'endpoint':<42}{'n':>6}{'err':>5}{'req/s':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    for name, row in endpoints.items():
+        print(f"{name:<42}{row['requests']:>6}{row['errors']:>5}{row['throughput_rps']:>8}"
+              f"{row['p50_ms']:>9}{row['p95_ms']:>9}{row['p99_ms']:>9}")
+
+    if args.output:
+        result = {
+            "revision": _git_revision(),
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "database": database_url.split("://")[0],
+            "volumes": volumes.as_dict(),
+            "requests": args.requests,
+            "threads": args.threads,
+            "total": total,
+            "endpoints": endpoints,
+        }
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"\nresults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
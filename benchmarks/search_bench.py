@@ -0,0 +1,92 @@
+"""
+Name search: trigram index vs. the previous ILIKE '%term%' query.
+
+    python -m benchmarks.search_bench [n_recipes]
+
+Seeds an in-memory SQLite catalog (100k recipes by default) and reports,
+for a set of autocomplete terms, the mean time of:
+  - the previous ILIKE path: the query, marshmallow dump and JSON encoding,
+    limited to the same MAX_NAME_MATCHES rows so both return as much
+  - the index lookup alone
+  - the full GET /recipes/?recipe_name=... request through the test
+    client (lookup, IN (...) query, serialization), with the catalog
+    response cache bypassed
+"""
+import os
+import random
+import sys
+import time
+
+os.environ["DATABASE_URL"] = "sqlite://"
+
+from app import create_app
+from extension import db
+from fast_json import dumps
+from models import Recipe
+from recipes.http_cache import response_cache
+from recipes.search_index import MAX_NAME_MATCHES, recipe_search
+from schemas.recipes import Recipe as RecipeSchema
+
+app = create_app()
+
+WORDS = [
+    "apple", "banana", "bread", "carrot", "chicken", "curry", "egg", "fish",
+    "garlic", "honey", "lentil", "mango", "noodle", "oat", "pasta", "pumpkin",
+    "rice", "salad", "soup", "spinach", "tofu", "tomato", "yoghurt", "zucchini",
+]
+TERMS = ["ba", "bre", "chick", "pumpkin soup", "tofu", "oghu", "xyz"]
+REPEATS = 20
+
+
+def _seed(n):
+    rng = random.Random(42)
+    db.session.execute(
+        Recipe.__table__.insert(),
+        [{"recipe_name": " ".join(rng.sample(WORDS, 3)).title()} for _ in range(n)],
+    )
+    db.session.commit()
+
+
+def _time(fn):
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        fn()
+    return (time.perf_counter() - start) / REPEATS * 1000
+
+
+def main(n=100_000):
+    with app.app_context():
+        db.create_all(bind_key=None)  # replicas get the schema by replication
+        _seed(n)
+        start = time.perf_counter()
+        recipe_search.reload()
+        print(f"{n} recipes, index built in {(time.perf_counter() - start) * 1000:.0f} ms\n")
+        print(f"{'term':<14}{'matches':>9}{'returned':>10}{'ILIKE ms':>11}{'index ms':>11}"
+              f"{'request ms':>12}{'speedup':>9}")
+        client = app.test_client()
+        schema = RecipeSchema(many=True)
+        for term in TERMS:
+            ilike = lambda: dumps(schema.dump(
+                Recipe.query.filter(Recipe.recipe_name.ilike(f"%{term}%"))
+                .limit(MAX_NAME_MATCHES).all()
+            ))
+            matches = db.session.query(Recipe.recipe_id).filter(
+                Recipe.recipe_name.ilike(f"%{term}%")).count()
+
+            def request():
+                response_cache.backend.bump_version()
+                response = client.get("/recipes/", query_string={"recipe_name": term})
+                assert response.status_code == 200
+                return response.get_data()
+
+            returned = len(client.get("/recipes/", query_string={"recipe_name": term}).json)
+            assert returned == min(matches, MAX_NAME_MATCHES)
+            ilike_ms = _time(ilike)
+            index_ms = _time(lambda: recipe_search.search(term, limit=MAX_NAME_MATCHES))
+            request_ms = _time(request)
+            print(f"{term!r:<14}{matches:>9}{returned:>10}{ilike_ms:>11.2f}{index_ms:>11.2f}"
+                  f"{request_ms:>12.2f}{ilike_ms / request_ms:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,137 @@
+"""
+Synthetic data generator for benchmarks.
+
+Fills an (empty) database with children, their mood logs and meals, and a
+recipe catalog. Rows are inserted with Core executemany in batches, so
+seeding millions of rows stays reasonably quick. Deterministic for a given
+seed.
+"""
+import random
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, timedelta
+
+from extension import db
+from models import (
+    Children, DietaryGuidelines, Ingredient, Meals, MoodLog, Recipe, RecipeIngredient,
+)
+from mood.services import backfill_mood_rollup
+from schemas.meals import MEAL_TYPES
+from schemas.mood_logs import MOOD_TYPES
+
+BATCH_SIZE = 5000
+
+WORDS = [
+    "apple", "banana", "bread", "carrot", "chicken", "curry", "egg", "fish",
+    "garlic", "honey", "lentil", "mango", "noodle", "oat", "pasta", "pumpkin",
+    "rice", "salad", "soup", "spinach", "tofu", "tomato", "yoghurt", "zucchini",
+]
+STEPS = [
+    "Preheat the oven to 180C.", "Mix everything in a large bowl.", "Bake for 20 minutes.",
+    "Chill in the fridge until set; no baking needed.", "Simmer gently on the stove.",
+    "Slice the {} thinly.", "Stir in the chopped {}.", "Roast the {} until golden.",
+    "Blend until smooth.", "Serve warm with {}.",
+]
+CATEGORIES = ["fruit", "vegetable", "grain", "protein", "dairy"]
+RECIPE_TYPES = ["Breakfast", "Lunch", "Dinner", "Snack"]
+CUISINES = ["Australian", "Italian", "Chinese", "Indian", "Mexican"]
+PREFERENCES = [None, "Vegetarian", "Vegan", "Gluten Free"]
+
+# (min_age, max_age, veg, fruit, grain, meat, dairy) per gender
+GUIDELINES = [
+    (2, 3, 2.5, 1.0, 4.0, 1.0, 1.5),
+    (4, 8, 4.5, 1.5, 4.0, 1.5, 1.5),
+    (9, 11, 5.0, 2.0, 5.0, 2.5, 2.5),
+    (12, 13, 5.5, 2.0, 6.0, 2.5, 3.5),
+]
+
+
+@dataclass
+class Volumes:
+    children: int = 200
+    moods_per_child: int = 500
+    meals_per_child: int = 500
+    recipes: int = 5000
+    ingredients: int = 500
+    ingredients_per_recipe: int = 6
+    history_days: int = 365
+
+    def as_dict(self):
+        return asdict(self)
+
+
+def _insert(model, rows):
+    for start in range(0, len(rows), BATCH_SIZE):
+        db.session.execute(model.__table__.insert(), rows[start:start + BATCH_SIZE])
+
+
+def _servings(rng, high=3.0):
+    return round(rng.uniform(0, high), 2)
+
+
+def seed(volumes, rng_seed=42):
+    """Insert `volumes` worth of rows and commit. Returns the child ids."""
+    rng = random.Random(rng_seed)
+    now = datetime.now()
+
+    _insert(DietaryGuidelines, [
+        dict(gender=gender, age_group=f"{lo}-{hi}", min_age=lo, max_age=hi,
+             servings_veg_legumes_beans=veg, servings_fruit=fruit, servings_grain=grain,
+             servings_meat_fish_eggs_nuts_seeds=meat, servings_milk_yoghurt_cheese=dairy)
+        for gender in ("M", "F")
+        for lo, hi, veg, fruit, grain, meat, dairy in GUIDELINES
+    ])
+
+    _insert(Ingredient, [
+        dict(ingredient_name=f"{rng.choice(WORDS)} {i}", category=rng.choice(CATEGORIES))
+        for i in range(volumes.ingredients)
+    ])
+    _insert(Recipe, [
+        dict(
+            recipe_name=" ".join(rng.sample(WORDS, 3)).title(),
+            recipe_type=rng.choice(RECIPE_TYPES),
+            cuisine_type=rng.choice(CUISINES),
+            dietary_preferences=rng.choice(PREFERENCES),
+            cooking_steps=" ".join(step.format(rng.choice(WORDS)) for step in rng.sample(STEPS, 4)),
+            servings_veg_legumes_beans=_servings(rng), servings_fruit=_servings(rng),
+            servings_grain=_servings(rng), servings_meat_fish_eggs_nuts_seeds=_servings(rng),
+            servings_milk_yoghurt_cheese=_servings(rng),
+        )
+        for _ in range(volumes.recipes)
+    ])
+    db.session.flush()
+    recipe_ids = [r for (r,) in db.session.query(Recipe.recipe_id)]
+    ingredient_ids = [i for (i,) in db.session.query(Ingredient.ingredient_id)]
+    _insert(RecipeIngredient, [
+        dict(recipe_id=recipe_id, ingredient_id=ingredient_id, grams=rng.randint(5, 300))
+        for recipe_id in recipe_ids
+        for ingredient_id in rng.sample(ingredient_ids, min(volumes.ingredients_per_recipe, len(ingredient_ids)))
+    ])
+
+    _insert(Children, [
+        dict(name=f"child {i}", gender=rng.choice(["M", "F"]), meals_per_day=rng.randint(3, 5),
+             date_of_birth=date.today() - timedelta(days=rng.randint(2 * 365, 12 * 365)))
+        for i in range(volumes.children)
+    ])
+    db.session.flush()
+    child_ids = [c for (c,) in db.session.query(Children.child_id)]
+
+    span = volumes.history_days * 86400
+    for child_id in child_ids:
+        _insert(MoodLog, [
+            dict(child_id=child_id, mood=rng.choice(MOOD_TYPES),
+                 created_at=now - timedelta(seconds=rng.randint(0, span)))
+            for _ in range(volumes.moods_per_child)
+        ])
+        _insert(Meals, [
+            dict(child_id=child_id, meal_name=rng.choice(WORDS).title(),
+                 meal_type=rng.choice(MEAL_TYPES),
+                 servings_veg_legumes_beans=_servings(rng, 2), servings_fruit=_servings(rng, 2),
+                 servings_grain=_servings(rng, 2), servings_meat_fish_eggs_nuts_seeds=_servings(rng, 2),
+                 servings_milk_yoghurt_cheese=_servings(rng, 2),
+                 created_at=now - timedelta(seconds=rng.randint(0, span)))
+            for _ in range(volumes.meals_per_child)
+        ])
+
+    db.session.commit()
+    backfill_mood_rollup()
+    return child_ids
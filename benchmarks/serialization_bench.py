@@ -0,0 +1,98 @@
+"""
+List serialization: ORM objects + marshmallow + Flask JSON vs. column
+tuples + orjson (fast_json.py).
+
+    python -m benchmarks.serialization_bench [n_rows]
+
+Seeds an in-memory SQLite database with one child's meals and mood logs
+(20k each by default) and reports the mean time to build the JSON body of
+a full range response both ways, split into query and encode time. The
+two bodies are checked to decode to the same data.
+"""
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+os.environ["DATABASE_URL"] = "sqlite://"
+
+from flask import json as flask_json
+from sqlalchemy import select
+
+from app import create_app
+from extension import db
+from fast_json import dump_columns, dumps, rows_to_dicts
+from models import Children, Meals, MoodLog
+from schemas.meals import Meal
+from schemas.mood_logs import MoodLog as MoodLogSchema
+
+app = create_app()
+
+REPEATS = 10
+
+
+def _seed(n):
+    rng = random.Random(42)
+    now = datetime.now()
+    db.session.add(Children(name="bench", gender="F", date_of_birth=now.date(), meals_per_day=3))
+    db.session.flush()
+    db.session.execute(Meals.__table__.insert(), [
+        dict(child_id=1, meal_name="Bench", meal_type="Lunch",
+             servings_fruit=round(rng.uniform(0, 2), 2), servings_grain=round(rng.uniform(0, 2), 2),
+             servings_veg_legumes_beans=1, servings_meat_fish_eggs_nuts_seeds=0.5,
+             servings_milk_yoghurt_cheese=0, created_at=now - timedelta(minutes=i))
+        for i in range(n)
+    ])
+    db.session.execute(MoodLog.__table__.insert(), [
+        dict(child_id=1, mood="happy", notes="bench" if i % 2 else None,
+             created_at=now - timedelta(minutes=i))
+        for i in range(n)
+    ])
+    db.session.commit()
+
+
+def _time(fn):
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        result = fn()
+    return (time.perf_counter() - start) / REPEATS * 1000, result
+
+
+def _compare(label, model, schema):
+    order = model.created_at.asc()
+
+    def orm_query():
+        db.session.expunge_all()
+        return model.query.filter(model.child_id == 1).order_by(order).all()
+
+    def tuple_query():
+        return db.session.execute(
+            select(*dump_columns(schema, model)).where(model.child_id == 1).order_by(order)
+        ).all()
+
+    orm_ms, objects = _time(orm_query)
+    orm_encode_ms, slow_body = _time(lambda: flask_json.dumps(schema.__class__(many=True).dump(objects)))
+    tuple_ms, rows = _time(tuple_query)
+    tuple_encode_ms, fast_body = _time(lambda: dumps(rows_to_dicts(rows)))
+    assert json.loads(slow_body) == json.loads(fast_body)
+
+    slow, fast = orm_ms + orm_encode_ms, tuple_ms + tuple_encode_ms
+    print(f"{label:<10}{'ORM + marshmallow':<22}{orm_ms:>9.1f}{orm_encode_ms:>10.1f}{slow:>9.1f}")
+    print(f"{'':<10}{'tuples + orjson':<22}{tuple_ms:>9.1f}{tuple_encode_ms:>10.1f}{fast:>9.1f}"
+          f"{slow / fast:>9.1f}x")
+
+
+def main(n=20_000):
+    with app.app_context():
+        db.create_all(bind_key=None)  # replicas get the schema by replication
+        _seed(n)
+        print(f"{n} rows per response, mean of {REPEATS} runs (ms)\n")
+        print(f"{'':<10}{'path':<22}{'query':>9}{'encode':>10}{'total':>9}{'speedup':>9}")
+        _compare("meals", Meals, Meal())
+        _compare("moods", MoodLog, MoodLogSchema())
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
@@ -0,0 +1,131 @@
+"""
+Cold start: how long a fresh process takes to import and build the app,
+and how long gunicorn takes to answer its first request, with and without
+the startup options.
+
+    python -m benchmarks.startup [--runs 5] [--workers 4]
+
+Reported (median of --runs):
+  - import + create_app() in a new interpreter, generating the OpenAPI
+    spec vs. loading a pre-generated openapi.json (OPENAPI_SPEC_FILE)
+  - gunicorn wsgi:app, from launch to the first 200 on /openapi.json, and
+    the total proportional memory (PSS) of master + workers, with
+    --preload on and off (Linux only for PSS)
+"""
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CREATE_SCHEMA = (
+    "from app import create_app; from extension import db; "
+    "app = create_app(); app.app_context().push(); db.create_all(bind_key=None)"
+)
+CREATE_APP = (
+    "import time; started = time.perf_counter(); "
+    "from app import create_app; create_app(); "
+    "print(time.perf_counter() - started)"
+)
+
+
+def _create_app_seconds(env):
+    out = subprocess.check_output([sys.executable, "-c", CREATE_APP], cwd=ROOT, env=env, text=True)
+    return float(out.strip().splitlines()[-1])
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _pss_kb(pid):
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                if line.startswith("Pss:"):
+                    return int(line.split()[1])
+    except OSError:
+        return None
+    return None
+
+
+def _children(pid):
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children") as f:
+            return [int(p) for p in f.read().split()]
+    except OSError:
+        return []
+
+
+def _gunicorn_boot(env, workers, preload):
+    port = _free_port()
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-w", str(workers), "-b", f"127.0.0.1:{port}",
+         "--log-level", "warning", "wsgi:app"],
+        cwd=ROOT, env=dict(env, GUNICORN_PRELOAD="true" if preload else "false"),
+    )
+    try:
+        deadline = time.monotonic() + 60
+        while time.monotonic() < deadline:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/openapi.json", timeout=1):
+                    break
+            except OSError:
+                time.sleep(0.02)
+        else:
+            raise RuntimeError("gunicorn did not answer")
+        boot = time.perf_counter() - started
+        time.sleep(2)  # let every worker finish booting before measuring memory
+        pss = [_pss_kb(pid) for pid in [process.pid] + _children(process.pid)]
+        return boot, sum(pss) / 1024 if None not in pss else None
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    env = dict(os.environ, DATABASE_URL="sqlite:///" + os.path.join(workdir, "startup.db"))
+    env.pop("OPENAPI_SPEC_FILE", None)
+    subprocess.check_call([sys.executable, "-c", CREATE_SCHEMA], cwd=ROOT, env=env)
+    spec_file = os.path.join(workdir, "openapi.json")
+    subprocess.check_call(
+        [sys.executable, "-m", "flask", "--app", "app:create_app", "openapi", "write",
+         "--format=json", spec_file],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL,
+    )
+    spec_env = dict(env, OPENAPI_SPEC_FILE=spec_file)
+
+    median = lambda fn: statistics.median(fn() for _ in range(args.runs))
+    generated = median(lambda: _create_app_seconds(env))
+    from_file = median(lambda: _create_app_seconds(spec_env))
+    print(f"import + create_app(), median of {args.runs}")
+    print(f"  spec generated         {generated * 1000:8.0f} ms")
+    print(f"  spec from openapi.json {from_file * 1000:8.0f} ms")
+
+    print(f"\ngunicorn wsgi:app, {args.workers} workers, spec from openapi.json")
+    print(f"  {'':<12}{'first response ms':>19}{'total PSS MiB':>15}")
+    for preload in (False, True):
+        runs = [_gunicorn_boot(spec_env, args.workers, preload) for _ in range(args.runs)]
+        boot = statistics.median(r[0] for r in runs)
+        pss = [r[1] for r in runs if r[1] is not None]
+        pss_cell = f"{statistics.median(pss):15.1f}" if pss else f"{'n/a':>15}"
+        print(f"  {'preload' if preload else 'no preload':<12}{boot * 1000:19.0f}{pss_cell}")
+
+
+if __name__ == "__main__":
+    main()
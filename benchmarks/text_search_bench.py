@@ -0,0 +1,83 @@
+"""
+Recipe full-text search: inverted index vs. ILIKE over names and steps.
+
+    python -m benchmarks.text_search_bench [n_recipes]
+
+Seeds an in-memory SQLite catalog (100k recipes by default) with varied
+cooking steps, then reports the index build time and the mean time per
+query for the index (top 20, ranked) and for the equivalent unranked
+`ILIKE '%word%'` scan, plus the cost of one incremental update.
+"""
+import os
+import random
+import sys
+import time
+
+os.environ["DATABASE_URL"] = "sqlite://"
+
+from sqlalchemy import and_, or_
+
+from app import create_app
+from benchmarks.seed import STEPS, WORDS
+from extension import db
+from models import Recipe
+from recipes.text_index import recipe_text_search
+
+app = create_app()
+
+QUERIES = ["oven", "no-bake", "roast pumpkin", "baking", "simmer soup", "sliced mango", "xyz"]
+REPEATS = 50
+
+
+def _seed(n):
+    rng = random.Random(42)
+    db.session.execute(
+        Recipe.__table__.insert(),
+        [
+            {
+                "recipe_name": " ".join(rng.sample(WORDS, 3)).title(),
+                "cooking_steps": " ".join(step.format(rng.choice(WORDS)) for step in rng.sample(STEPS, 4)),
+            }
+            for _ in range(n)
+        ],
+    )
+    db.session.commit()
+
+
+def _time(fn, repeats=REPEATS):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats * 1000
+
+
+def _ilike(query):
+    words = query.replace("-", " ").split()
+    return db.session.query(Recipe.recipe_id).filter(and_(*(
+        or_(Recipe.recipe_name.ilike(f"%{w}%"), Recipe.cooking_steps.ilike(f"%{w}%")) for w in words
+    )))
+
+
+def main(n=100_000):
+    with app.app_context():
+        db.create_all(bind_key=None)  # replicas get the schema by replication
+        _seed(n)
+        start = time.perf_counter()
+        recipe_text_search.reload()
+        print(f"{n} recipes, index built in {(time.perf_counter() - start) * 1000:.0f} ms\n")
+        print(f"{'query':<16}{'ILIKE rows':>11}{'ILIKE ms':>10}{'index ms':>10}")
+        for query in QUERIES:
+            rows = _ilike(query).count()
+            ilike_ms = _time(lambda: _ilike(query).all(), repeats=3)
+            index_ms = _time(lambda: recipe_text_search.search(query, limit=20))
+            print(f"{query!r:<16}{rows:>11}{ilike_ms:>10.1f}{index_ms:>10.3f}")
+
+        recipe = db.session.get(Recipe, 1)
+        upsert_ms = _time(lambda: recipe_text_search.upsert(1, {
+            "recipe_name": recipe.recipe_name, "cooking_steps": recipe.cooking_steps,
+        }))
+        print(f"\nincremental update of one recipe: {upsert_ms:.3f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,51 @@
+from marshmallow import ValidationError
+from sqlalchemy import insert
+
+from extension import db
+from models import Children
+
+MAX_BULK_ITEMS = 500
+
+
+def bulk_create(model, schema, items, build_row, on_created=None):
+    """
+    Validate `items` one by one with `schema`, then insert every valid row
+    in a single executemany and commit once.
+
+    Every item must reference an existing child; all referenced child_ids
+    are checked with one query. `build_row(payload)` maps a loaded payload
+    to a column dict. `on_created(rows)` runs in the same transaction, just
+    before the commit. Returns (created rows, [{"index", "errors"}]).
+    """
+    loaded, errors = [], []
+    for index, item in enumerate(items):
+        try:
+            loaded.append((index, schema.load(item)))
+        except ValidationError as exc:
+            errors.append({"index": index, "errors": exc.messages})
+
+    child_ids = {payload["child_id"] for _, payload in loaded}
+    known = {
+        child_id for (child_id,) in
+        db.session.query(Children.child_id).filter(Children.child_id.in_(child_ids))
+    } if child_ids else set()
+
+    rows = []
+    for index, payload in loaded:
+        if payload["child_id"] in known:
+            rows.append(build_row(payload))
+        else:
+            errors.append({"index": index, "errors": {"child_id": ["Child not found"]}})
+    errors.sort(key=lambda e: e["index"])
+
+    created = []
+    if rows:
+        # A batched INSERT ... RETURNING may return rows in any order; `created`
+        # must follow the order of the valid items
+        created = db.session.scalars(
+            insert(model).returning(model, sort_by_parameter_order=True), rows
+        ).all()
+        if on_created is not None:
+            on_created(created)
+        db.session.commit()
+    return created, errors
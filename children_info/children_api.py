@@ -1,14 +1,15 @@
-from flask_smorest import Blueprint
-from flask import request
+from metrics import InstrumentedBlueprint
+from flask import request, Response, stream_with_context
 from extension import db
 from models import Children 
 
 from schemas.children import (
-    Child, CreateChild, UpdateChild, GetChildrenQuery
+    Child, CreateChild, UpdateChild, GetChildrenQuery, ExportQuery, DashboardQuery, DashboardEntry
 )
 from schemas.common import MessageSchema 
+from children_info.services import child_dashboard, iter_child_history, iter_ndjson, iter_csv
 
-blp = Blueprint("children", __name__, url_prefix="/children", description="Children CRUD API")
+blp = InstrumentedBlueprint("children", __name__, url_prefix="/children", description="Children CRUD API")
 
 # ---------------------------
 # Read All + filter by ids
@@ -29,6 +30,19 @@ def get_children(query_args):
     return children  # marshmallow handles serialization
 
 
+# ---------------------------
+# Dashboard: child, latest mood and today's meals for many children at once
+# ---------------------------
+@blp.route("/dashboard", methods=["GET"])
+@blp.arguments(DashboardQuery, location="query")
+@blp.response(200, DashboardEntry(many=True))
+@blp.doc(description="For each child ID: the child, their latest mood log, today's meal totals and daily "
+                     "guideline targets. Runs a fixed number of queries however many IDs are given; "
+                     "unknown IDs are skipped.")
+def get_dashboard(query_args):
+    return child_dashboard([int(x) for x in query_args["ids"].split(",")])
+
+
 # ---------------------------
 # Create
 # ---------------------------
@@ -76,4 +90,30 @@ def delete_child(child_id):
     child = Children.query.get_or_404(child_id)
     db.session.delete(child)
     db.session.commit()
-    return {"message": f"Child {child_id} deleted successfully"}
\ No newline at end of file
+    return {"message": f"Child {child_id} deleted successfully"}
+
+
+# ---------------------------
+# Export full history
+# ---------------------------
+@blp.route("/<int:child_id>/export", methods=["GET"])
+@blp.arguments(ExportQuery, location="query")
+@blp.doc(
+    description="Stream a child's complete mood and meal history, oldest first, as NDJSON or CSV.",
+    responses={"200": {"description": "application/x-ndjson or text/csv stream"}},
+)
+def export_child_history(query_args, child_id):
+    if not Children.query.get(child_id):
+        return {"error": "Child not found"}, 404
+
+    if query_args["format"] == "csv":
+        body, mimetype = iter_csv(iter_child_history(child_id)), "text/csv"
+    else:
+        body, mimetype = iter_ndjson(iter_child_history(child_id)), "application/x-ndjson"
+
+    filename = f"child-{child_id}-history.{query_args['format']}"
+    return Response(
+        stream_with_context(body),
+        mimetype=mimetype,
+        headers={"Content-Disposition": f"attachment; filename={filename}"},
+    )
\ No newline at end of file
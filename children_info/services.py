@@ -0,0 +1,150 @@
+import csv
+import heapq
+import io
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+
+from sqlalchemy import Float, cast, func, select
+
+from extension import db
+from models import Children, Meals, MoodLog, SERVING_FIELDS
+from mood.ingest import mood_ingest
+from recipes.services import get_guideline_for_child
+
+EXPORT_BATCH_SIZE = 500
+
+CSV_COLUMNS = [
+    "type", "id", "child_id", "created_at",
+    "mood", "notes",
+    "meal_name", "meal_type", *SERVING_FIELDS,
+]
+
+def _plain(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+def _stream(model, id_column, record_type, child_id):
+    table = model.__table__
+    stmt = (
+        select(table)
+        .where(table.c.child_id == child_id)
+        .order_by(table.c.created_at, id_column)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+    for row in db.session.execute(stmt):
+        record = {"type": record_type, "id": getattr(row, id_column.key)}
+        record.update(
+            (k, _plain(v)) for k, v in row._mapping.items() if k != id_column.key
+        )
+        yield row.created_at, record
+
+def iter_child_history(child_id):
+    """
+    Every mood log and meal of a child as plain dicts, oldest first.
+
+    Both tables are read through server-side cursors in batches of
+    EXPORT_BATCH_SIZE and merged on created_at, so memory stays flat
+    regardless of history length.
+    """
+    merged = heapq.merge(
+        _stream(MoodLog, MoodLog.mood_log_id, "mood_log", child_id),
+        _stream(Meals, Meals.meal_id, "meal", child_id),
+        key=lambda item: item[0],
+    )
+    for _, record in merged:
+        yield record
+
+def iter_ndjson(records):
+    for record in records:
+        yield json.dumps(record) + "\n"
+
+def iter_csv(records):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=CSV_COLUMNS, extrasaction="ignore")
+    writer.writeheader()
+    for record in records:
+        writer.writerow(record)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+# ---------------------------
+# Dashboard
+# ---------------------------
+def _latest_moods(child_ids):
+    """child_id -> newest mood log (as a dict), one windowed query for all children."""
+    ranked = (
+        select(
+            MoodLog.mood_log_id, MoodLog.child_id, MoodLog.mood, MoodLog.notes, MoodLog.created_at,
+            func.row_number().over(
+                partition_by=MoodLog.child_id,
+                order_by=(MoodLog.created_at.desc(), MoodLog.mood_log_id.desc()),
+            ).label("position"),
+        )
+        .where(MoodLog.child_id.in_(child_ids))
+        .subquery()
+    )
+    rows = db.session.execute(
+        select(ranked.c.mood_log_id, ranked.c.child_id, ranked.c.mood, ranked.c.notes, ranked.c.created_at)
+        .where(ranked.c.position == 1)
+    )
+    latest = {row.child_id: row._asdict() for row in rows}
+    # read-your-writes for mood logs still in this worker's ingest buffer
+    for child_id in child_ids:
+        accepted = mood_ingest.latest_accepted(child_id)
+        if accepted and (child_id not in latest or accepted["created_at"] > latest[child_id]["created_at"]):
+            latest[child_id] = accepted
+    return latest
+
+def _meal_totals(child_ids, day):
+    """child_id -> meal count and serving totals for `day`, one grouped query for all children."""
+    rows = db.session.execute(
+        select(
+            Meals.child_id,
+            func.count(Meals.meal_id).label("meal_count"),
+            *[cast(func.sum(getattr(Meals, f)), Float).label(f) for f in SERVING_FIELDS],
+        )
+        .where(
+            Meals.child_id.in_(child_ids),
+            Meals.created_at >= datetime.combine(day, time.min),
+            Meals.created_at <= datetime.combine(day, time.max),
+        )
+        .group_by(Meals.child_id)
+    )
+    return {row.child_id: row._asdict() for row in rows}
+
+def child_dashboard(child_ids, day=None):
+    """
+    Child row, latest mood log, the day's meal totals and daily guideline
+    targets for each child, in three queries however many children are
+    asked for. Unknown ids are skipped; results follow `child_ids` order.
+    """
+    day = day or date.today()
+    children = {
+        child.child_id: child
+        for child in db.session.scalars(select(Children).where(Children.child_id.in_(child_ids)))
+    }
+    if not children:
+        return []
+    latest = _latest_moods(list(children))
+    meals = _meal_totals(list(children), day)
+
+    dashboard = []
+    for child_id in dict.fromkeys(child_ids):
+        child = children.get(child_id)
+        if child is None:
+            continue
+        guideline = get_guideline_for_child(child, day)
+        totals = meals.get(child_id, {"meal_count": 0})
+        dashboard.append({
+            "child": child,
+            "latest_mood": latest.get(child_id),
+            "today": {"meal_count": totals["meal_count"], **{f: totals.get(f) or 0.0 for f in SERVING_FIELDS}},
+            "targets": {f: getattr(guideline, f) for f in SERVING_FIELDS} if guideline else None,
+        })
+    return dashboard
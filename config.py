@@ -4,6 +4,28 @@ from dotenv import load_dotenv
 
 load_dotenv() # Load environment variables from a .env file if present
 
+def _env_bool(name, default):
+    return os.getenv(name, str(default)).lower() in ("1", "true", "yes")
+
+def _engine_options(url):
+    """Pool settings for every engine (primary and replicas), from env vars."""
+    options = {
+        "pool_pre_ping": _env_bool("DB_POOL_PRE_PING", True),
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),  # seconds
+    }
+    if url and not url.startswith("sqlite"):
+        # QueuePool sizing; SQLite uses single-connection pools
+        options.update(
+            pool_size=int(os.getenv("DB_POOL_SIZE", "5")),
+            max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "10")),
+            pool_timeout=int(os.getenv("DB_POOL_TIMEOUT", "30")),
+        )
+    return options
+
+def _replica_binds():
+    urls = [u.strip() for u in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if u.strip()]
+    return {f"replica_{i}": url for i, url in enumerate(urls)}
+
 class Config:
     API_TITLE = "Child Emotional Health API"
     API_VERSION = "v1"
@@ -11,6 +33,58 @@ class Config:
     OPENAPI_URL_PREFIX = "/"
     OPENAPI_SWAGGER_UI_PATH = "/swagger-ui"
     OPENAPI_SWAGGER_UI_URL = "https://cdn.jsdelivr.net/npm/swagger-ui-dist/"
+    # Serve this pre-generated openapi.json instead of building the spec on boot (see spec_file.py)
+    OPENAPI_SPEC_FILE = os.getenv("OPENAPI_SPEC_FILE")
+
+    # Response headers browsers may read cross-origin (picked up by flask-cors)
+    CORS_EXPOSE_HEADERS = ["X-Next-Cursor"]
 
     SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL")  # PostgreSQL
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SQLALCHEMY_ENGINE_OPTIONS = _engine_options(SQLALCHEMY_DATABASE_URI)
+
+    # Read replicas (comma-separated DATABASE_REPLICA_URLS) serve GET/HEAD requests;
+    # see db_routing.py. A replica that fails is skipped for REPLICA_RETRY_SECONDS.
+    # Locally, two SQLite files stand in for primary and replica:
+    #   DATABASE_URL=sqlite:///$PWD/primary.db DATABASE_REPLICA_URLS=sqlite:///$PWD/replica.db
+    # and `python replica_routing.py` checks which one reads, writes and flushes use.
+    SQLALCHEMY_BINDS = _replica_binds()
+    REPLICA_RETRY_SECONDS = int(os.getenv("REPLICA_RETRY_SECONDS", "30"))
+    # Report the number of SQL statements each request ran in an X-Query-Count header
+    SQL_QUERY_COUNT_HEADER = os.getenv("SQL_QUERY_COUNT_HEADER", "false").lower() == "true"
+    # Requests slower than this are logged together with the SQL they ran
+    SLOW_REQUEST_MS = int(os.getenv("SLOW_REQUEST_MS", "500"))
+
+    # Cache-Control max-age for catalog GETs
+    CATALOG_CACHE_MAX_AGE = int(os.getenv("CATALOG_CACHE_MAX_AGE", "60"))
+    # Catalog response cache: in-process LRU unless RESPONSE_CACHE_URL (redis://...) is set.
+    # TTL bounds how long a write made outside this worker can go unseen with the local cache.
+    RESPONSE_CACHE_URL = os.getenv("RESPONSE_CACHE_URL")
+    RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", "60"))
+    RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "1024"))
+    # Seconds before each worker re-reads the dietary_guidelines reference table
+    GUIDELINE_CACHE_TTL = int(os.getenv("GUIDELINE_CACHE_TTL", "300"))
+    # Seconds before each worker rebuilds its ingredient/recipe name search index
+    SEARCH_INDEX_TTL = int(os.getenv("SEARCH_INDEX_TTL", "600"))
+    # Seconds before each worker rebuilds its recipe servings matrix for recommendations
+    RECIPE_MATRIX_TTL = int(os.getenv("RECIPE_MATRIX_TTL", "600"))
+    # Seconds before each worker rebuilds its ingredient -> recipes lists for /recipes/makeable
+    PANTRY_INDEX_TTL = int(os.getenv("PANTRY_INDEX_TTL", "600"))
+    # Weekly meal plans: solver time budget, and the per-worker cache shared by children
+    # with the same guideline, meals per day and preferences (see recipes/meal_plan.py)
+    MEAL_PLAN_TIME_BUDGET_MS = int(os.getenv("MEAL_PLAN_TIME_BUDGET_MS", "200"))
+    MEAL_PLAN_CACHE_TTL = int(os.getenv("MEAL_PLAN_CACHE_TTL", "600"))
+    MEAL_PLAN_CACHE_SIZE = int(os.getenv("MEAL_PLAN_CACHE_SIZE", "256"))
+    # Per-worker memo of meal/mood correlations; dropped on this worker's writes for the child
+    CORRELATION_CACHE_TTL = int(os.getenv("CORRELATION_CACHE_TTL", "300"))
+    CORRELATION_CACHE_SIZE = int(os.getenv("CORRELATION_CACHE_SIZE", "1024"))
+    # "buffered" answers mood log POSTs with 202 once they are fsync'd to a local append-only
+    # log, and a background thread flushes them to mood_logs in batches (see mood/ingest.py).
+    # Read-your-writes on /mood_logs/latest then only holds on the worker that took the POST,
+    # so only turn it on with a single worker (WEB_CONCURRENCY=1) or sticky routing per child
+    MOOD_INGEST_MODE = os.getenv("MOOD_INGEST_MODE", "direct")
+    MOOD_INGEST_DIR = os.getenv("MOOD_INGEST_DIR", "var/mood-ingest")
+    MOOD_INGEST_FLUSH_MS = int(os.getenv("MOOD_INGEST_FLUSH_MS", "200"))
+    MOOD_INGEST_BATCH_SIZE = int(os.getenv("MOOD_INGEST_BATCH_SIZE", "500"))
+    # A fully flushed segment larger than this is deleted and a new one started
+    MOOD_INGEST_SEGMENT_BYTES = int(os.getenv("MOOD_INGEST_SEGMENT_BYTES", str(16 * 1024 * 1024)))
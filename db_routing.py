@@ -0,0 +1,89 @@
+"""
+Read-replica routing for the Flask-SQLAlchemy session.
+
+GET and HEAD requests are served by one of the `replica_*` binds from
+SQLALCHEMY_BINDS; everything else, and anything flushed, uses the primary.
+The replica is chosen once per request (round-robin) so a request sees a
+single consistent snapshot. A replica that cannot be connected to is
+skipped for REPLICA_RETRY_SECONDS and the request falls back to the next
+replica or the primary.
+"""
+import itertools
+import threading
+import time
+
+from flask import g, has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from sqlalchemy.exc import DBAPIError, OperationalError
+
+READ_ONLY_METHODS = ("GET", "HEAD")
+REPLICA_PREFIX = "replica_"
+
+_lock = threading.Lock()
+_round_robin = itertools.count()
+_down_until = {}  # bind key -> monotonic time the replica may be retried
+_verified = set()  # bind keys that have accepted a connection since last failure
+_retry_seconds = 30
+
+
+def replica_keys(engines):
+    return sorted(k for k in engines if k and k.startswith(REPLICA_PREFIX))
+
+
+def mark_down(key):
+    with _lock:
+        _verified.discard(key)
+        _down_until[key] = time.monotonic() + _retry_seconds
+
+
+def _usable(key, engine):
+    if time.monotonic() < _down_until.get(key, 0):
+        return False
+    if key in _verified:
+        return True
+    try:
+        with engine.connect():
+            pass
+    except (DBAPIError, OperationalError):
+        mark_down(key)
+        return False
+    with _lock:
+        _verified.add(key)
+    return True
+
+
+def _choose_replica(engines):
+    keys = replica_keys(engines)
+    if not keys:
+        return None
+    start = next(_round_robin)
+    for offset in range(len(keys)):
+        key = keys[(start + offset) % len(keys)]
+        if _usable(key, engines[key]):
+            return engines[key]
+    return None
+
+
+class RoutingSession(Session):
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing and has_request_context() \
+                and request.method in READ_ONLY_METHODS:
+            if "read_replica" not in g:
+                g.read_replica = _choose_replica(self._db.engines)
+            if g.read_replica is not None:
+                return g.read_replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def init_app(app):
+    """Take a replica out of rotation when it reports a dropped connection."""
+    global _retry_seconds
+    _retry_seconds = app.config.get("REPLICA_RETRY_SECONDS", 30)
+    with app.app_context():
+        engines = app.extensions["sqlalchemy"].engines
+        for key in replica_keys(engines):
+            @event.listens_for(engines[key], "handle_error")
+            def _on_error(context, key=key):
+                if context.is_disconnect:
+                    mark_down(key)
@@ -0,0 +1,58 @@
+"""
+Fast path for large list responses.
+
+Instead of hydrating ORM objects and dumping them through a marshmallow
+`Schema(many=True)`, select just the columns the schema dumps (Numeric
+servings cast to float in SQL) and encode the rows with orjson:
+
+    rows = db.session.execute(
+        select(*dump_columns(MealSchema(), Meals)).where(...)
+    ).all()
+    return json_response(rows_to_dicts(rows))
+
+Keep `@blp.response(200, Schema(many=True))` on the view: flask-smorest
+still documents the schema and passes the prebuilt Response through as is.
+The output matches what the schema would produce for the same rows.
+"""
+import orjson
+from flask import Response
+from marshmallow import fields
+from sqlalchemy import Float, cast
+
+JSON_OPTIONS = orjson.OPT_SORT_KEYS | orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS
+
+
+def dump_columns(schema, model):
+    """Labelled column expressions for every field `schema` dumps."""
+    columns = []
+    for name, field in schema.dump_fields.items():
+        column = getattr(model, field.attribute or name)
+        if isinstance(field, fields.Float):
+            column = cast(column, Float)
+        columns.append(column.label(field.data_key or name))
+    return columns
+
+
+def rows_to_dicts(rows):
+    if not rows:
+        return []
+    keys = rows[0]._fields
+    return [dict(zip(keys, row)) for row in rows]
+
+
+def page_dict(page):
+    """A keyset_paginate page of Rows as plain data."""
+    return {"items": rows_to_dicts(page["items"]), "next_cursor": page["next_cursor"]}
+
+
+def page_headers(page):
+    """X-Next-Cursor for a keyset page served as a bare list."""
+    return {"X-Next-Cursor": page["next_cursor"]} if page["next_cursor"] else {}
+
+
+def dumps(payload):
+    return orjson.dumps(payload, option=JSON_OPTIONS)
+
+
+def json_response(payload, status=200, headers=None):
+    return Response(dumps(payload), status=status, headers=headers, mimetype="application/json")
@@ -0,0 +1,79 @@
+# gunicorn.conf.py -- picked up automatically by `gunicorn wsgi:app`
+#
+# With preload (the default here) the master imports wsgi.py and builds the
+# app once, warms the per-worker catalog caches, then forks: workers start
+# without re-importing anything and share those pages copy-on-write.
+import gc
+import os
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+preload_app = os.getenv("GUNICORN_PRELOAD", "true").lower() == "true"
+
+
+def _flask_app(server):
+    # asgi:app under UvicornWorker is an AsyncApp wrapping the Flask app
+    app = server.app.wsgi()
+    return getattr(app, "flask_app", app)
+
+
+def when_ready(server):
+    """Runs in the master after the app is loaded, before any worker forks."""
+    if not preload_app:
+        return
+    from extension import db
+    from recipes.guideline_index import guideline_index
+    from recipes.pantry import pantry_index
+    from recipes.recommender import recipe_matrix
+    from recipes.search_index import ingredient_search, recipe_search
+    from recipes.text_index import recipe_text_search
+
+    app = _flask_app(server)
+    with app.app_context():
+        try:
+            for cache in (guideline_index, ingredient_search, recipe_search, recipe_text_search,
+                          recipe_matrix, pantry_index):
+                cache.reload()
+        except Exception:
+            server.log.exception("Could not warm catalog caches; workers will load them lazily")
+        # Connections must not be shared across processes
+        for engine in db.engines.values():
+            engine.dispose()
+    # Keep the preloaded objects out of the collector so a GC pass in a
+    # worker does not write to (and un-share) every inherited page
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    if not preload_app:
+        return
+    from extension import db
+
+    app = _flask_app(server)
+    with app.app_context():
+        # Drop any pool inherited from the master without closing its sockets
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+
+
+def post_worker_init(worker):
+    """Runs in each worker once the app is loaded, with or without preload."""
+    from mood.ingest import mood_ingest
+
+    # Start the worker's ingest segment now so segments left by a crashed
+    # worker are recovered on restart, not on the first mood log POST
+    mood_ingest.start()
+    if mood_ingest.enabled and worker.cfg.workers > 1:
+        # The pending entries live in this worker's memory only
+        worker.log.warning(
+            "MOOD_INGEST_MODE=buffered with %d workers: /mood_logs/latest only sees a "
+            "worker's own unflushed POSTs; use one worker or route each child to one worker",
+            worker.cfg.workers,
+        )
+
+
+def child_exit(server, worker):
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
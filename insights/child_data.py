@@ -0,0 +1,57 @@
+"""
+Change notifications for a child's logged data (meals and mood logs).
+
+Same shape as recipes/catalog.py: per-worker structures derived from a
+child's history register with `on_child_data_change` and are called after
+a commit that wrote meals or mood logs, with the set of affected child ids.
+ORM bulk inserts (`session.execute(insert(Model), rows)`) are included.
+"""
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from models import Meals, MoodLog
+
+CHILD_DATA_MODELS = (Meals, MoodLog)
+
+_listeners = []
+
+
+def on_child_data_change(listener):
+    """Register `listener(child_ids)`; usable as a decorator."""
+    _listeners.append(listener)
+    return listener
+
+
+def _record(session, child_ids):
+    if child_ids:
+        session.info.setdefault("child_data_changes", set()).update(child_ids)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changes(session, flush_context):
+    _record(session, {
+        obj.child_id for obj in session.new | session.dirty | session.deleted
+        if isinstance(obj, CHILD_DATA_MODELS)
+    })
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_bulk_inserts(orm_execute_state):
+    mapper = orm_execute_state.bind_mapper
+    if orm_execute_state.is_insert and mapper is not None and mapper.class_ in CHILD_DATA_MODELS:
+        params = orm_execute_state.parameters or []
+        rows = params if isinstance(params, list) else [params]
+        _record(orm_execute_state.session, {row["child_id"] for row in rows if "child_id" in row})
+
+
+@event.listens_for(Session, "after_commit")
+def _notify_listeners(session):
+    child_ids = session.info.pop("child_data_changes", None)
+    if child_ids:
+        for listener in _listeners:
+            listener(child_ids)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changes(session):
+    session.info.pop("child_data_changes", None)
@@ -0,0 +1,152 @@
+"""
+Lagged correlation between a child's daily nutrition and their mood.
+
+Each day in the window gets a nutrition vector (servings per food group
+plus the number of meals, from the meals GROUP BY) and a mood score (the
+mean of MOOD_SCORES over that day's mood logs, from mood_daily_rollup).
+For every lag L in 0..max_lag, each nutrition feature on day t is
+correlated (Pearson) with the mood score on day t + L, using only days
+where both were logged. All lags and features are computed in one
+broadcast over a (lags x features x days) array.
+"""
+import threading
+import time
+from collections import Counter, OrderedDict
+from datetime import datetime, time as day_time
+
+import numpy as np
+from flask import current_app
+
+from insights.child_data import on_child_data_change
+from meals.services import summarize_servings
+from models import SERVING_FIELDS
+from mood.services import daily_mood_counts
+from schemas.mood_logs import MOOD_TYPES
+
+# Ordinal mood score, best to worst, following MOOD_TYPES
+MOOD_SCORES = dict(zip(MOOD_TYPES, [2, 1, 0, -1, -2]))
+FEATURES = SERVING_FIELDS + ["meal_count"]
+MIN_PAIRED_DAYS = 3
+
+
+def daily_series(child_id, start, end):
+    """(features x days) nutrition array and a mood score per day; NaN where nothing was logged."""
+    n_days = (end - start).days + 1
+    nutrition = np.full((len(FEATURES), n_days), np.nan)
+    mood = np.full(n_days, np.nan)
+
+    buckets = summarize_servings(
+        child_id, datetime.combine(start, day_time.min), datetime.combine(end, day_time.max), "day"
+    )
+    for bucket in buckets:
+        day = (bucket["period_start"] - start).days
+        nutrition[:, day] = [float(bucket[f] or 0) for f in FEATURES]
+
+    for entry in daily_mood_counts(child_id, start, end):
+        scored = {m: c for m, c in entry["counts"].items() if m in MOOD_SCORES}
+        if scored:
+            mood[(entry["day"] - start).days] = (
+                sum(MOOD_SCORES[m] * c for m, c in scored.items()) / sum(scored.values())
+            )
+    return nutrition, mood
+
+
+def lagged_correlations(nutrition, mood, max_lag):
+    """
+    Pearson r and paired-day count for every (lag, feature).
+
+    Returns two (max_lag + 1, n_features) arrays; r is NaN where fewer than
+    MIN_PAIRED_DAYS days pair up or either side is constant.
+    """
+    n_days = mood.shape[0]
+    lags = np.arange(max_lag + 1)
+    # shifted[l, t] = mood[t + l]
+    index = np.arange(n_days)[None, :] + lags[:, None]
+    shifted = np.where(index < n_days, mood[np.minimum(index, n_days - 1)], np.nan)
+
+    x = np.broadcast_to(nutrition[None, :, :], (len(lags),) + nutrition.shape)
+    y = np.broadcast_to(shifted[:, None, :], x.shape)
+    paired = ~np.isnan(x) & ~np.isnan(y)
+    n = paired.sum(axis=-1)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        x = np.where(paired, x, 0.0)
+        y = np.where(paired, y, 0.0)
+        dx = np.where(paired, x - (x.sum(-1) / n)[..., None], 0.0)
+        dy = np.where(paired, y - (y.sum(-1) / n)[..., None], 0.0)
+        r = (dx * dy).sum(-1) / np.sqrt((dx * dx).sum(-1) * (dy * dy).sum(-1))
+    r[(n < MIN_PAIRED_DAYS) | ~np.isfinite(r)] = np.nan
+    return r, n
+
+
+def mood_nutrition_correlation(child_id, start, end, max_lag):
+    nutrition, mood = daily_series(child_id, start, end)
+    r, n = lagged_correlations(nutrition, mood, max_lag)
+    return {
+        "child_id": child_id,
+        "start": start,
+        "end": end,
+        "max_lag": max_lag,
+        "days_with_meals": int((~np.isnan(nutrition[0])).sum()),
+        "days_with_moods": int((~np.isnan(mood)).sum()),
+        "correlations": [
+            {
+                "feature": feature,
+                "lag": lag,
+                "r": None if np.isnan(r[lag, i]) else round(float(r[lag, i]), 4),
+                "paired_days": int(n[lag, i]),
+            }
+            for lag in range(max_lag + 1)
+            for i, feature in enumerate(FEATURES)
+        ],
+    }
+
+
+class CorrelationMemo:
+    """
+    Per-worker memo of results keyed by (child_id, start, end, max_lag).
+
+    A commit in this worker that writes a child's meals or mood logs drops
+    that child's entries; CORRELATION_CACHE_TTL bounds how long writes made
+    by other workers go unseen. Least recently used entries beyond
+    CORRELATION_CACHE_SIZE are evicted.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (result, computed_at)
+        self._generation = Counter()  # child_id -> invalidations so far
+
+    def get(self, child_id, start, end, max_lag):
+        key = (child_id, start, end, max_lag)
+        config = current_app.config
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and time.monotonic() - entry[1] <= config.get("CORRELATION_CACHE_TTL", 300):
+                self._entries.move_to_end(key)
+                return entry[0]
+            generation = self._generation[child_id]
+
+        result = mood_nutrition_correlation(child_id, start, end, max_lag)
+        with self._lock:
+            if self._generation[child_id] != generation:
+                return result  # data changed while computing; don't memoize
+            self._entries[key] = (result, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > config.get("CORRELATION_CACHE_SIZE", 1024):
+                self._entries.popitem(last=False)
+        return result
+
+    def invalidate(self, child_ids):
+        with self._lock:
+            self._generation.update(child_ids)
+            for key in [k for k in self._entries if k[0] in child_ids]:
+                del self._entries[key]
+
+
+correlation_memo = CorrelationMemo()
+
+
+@on_child_data_change
+def _invalidate_on_write(child_ids):
+    correlation_memo.invalidate(child_ids)
@@ -0,0 +1,25 @@
+from flask import jsonify
+
+from metrics import InstrumentedBlueprint
+from models import Children
+
+from schemas.insights import CorrelationQuery, MoodNutritionCorrelation
+from insights.correlation import correlation_memo
+
+blp = InstrumentedBlueprint("insights", __name__, url_prefix="/insights",
+                            description="Analytics across a child's meals and moods")
+
+# ---------------------------
+# Meal / mood correlation
+# ---------------------------
+@blp.route("/mood-nutrition/<int:child_id>", methods=["GET"])
+@blp.arguments(CorrelationQuery, location="query")
+@blp.response(200, MoodNutritionCorrelation)
+@blp.doc(description="Correlate daily servings with the mood score on the same and following days")
+def get_mood_nutrition_correlation(query_args, child_id):
+    if not Children.query.get(child_id):
+        return jsonify({"error": "Child not found"}), 404
+
+    return correlation_memo.get(
+        child_id, query_args["start"], query_args["end"], query_args["max_lag"]
+    )
@@ -1,25 +1,28 @@
-from flask_smorest import Blueprint
-from flask import request
+from metrics import InstrumentedBlueprint
+from flask import request, jsonify
 from extension import db
 from models import Meals, Children
 from datetime import datetime
 
 from schemas.meals import (
-    Meal, CreateMeal, UpdateMeal, MealsRangeQuery
+    Meal, CreateMeal, UpdateMeal, MealsRangeQuery, MealPage, MealsPeriod,
+    MealsSummaryQuery, MealsSummary, BulkCreateMeals, BulkMealsResponse
 )
-from schemas.common import MessageSchema
+from schemas.common import MessageSchema, NEXT_CURSOR_HEADER, PageQuery
+from pagination import keyset_paginate
+from bulk import bulk_create
+from meals.services import summarize_servings, bucket_targets
+from recipes.services import get_guideline_for_child
+from fast_json import dump_columns, json_response, page_dict, page_headers, rows_to_dicts
+from sqlalchemy import select
 
-blp = Blueprint("meals", __name__, url_prefix="/meals", description="meals CRUD API")
+blp = InstrumentedBlueprint("meals", __name__, url_prefix="/meals", description="meals CRUD API")
 
-@blp.route("/", methods=["POST"])
-@blp.arguments(CreateMeal()) # request schema
-@blp.response(201, Meal()) # response schema
-@blp.doc(description="Create a new meal record")
-def create_meal(payload):
-    if not Children.query.get(payload["child_id"]):
-        return {"error": "Child not found"}, 404
+# Column tuples dumped straight to JSON for list responses (see fast_json.py)
+MEAL_COLUMNS = dump_columns(Meal(), Meals)
 
-    new_meal = Meals(
+def _meal_columns(payload):
+    return dict(
         meal_name=payload["meal_name"],
         servings_fruit=payload.get("servings_fruit", 0.0),
         servings_grain=payload.get("servings_grain", 0.0),
@@ -30,19 +33,43 @@ def create_meal(payload):
         meal_type=payload["meal_type"],
         created_at=datetime.now(),
     )
+
+@blp.route("/", methods=["POST"])
+@blp.arguments(CreateMeal()) # request schema
+@blp.response(201, Meal()) # response schema
+@blp.doc(description="Create a new meal record")
+def create_meal(payload):
+    if not Children.query.get(payload["child_id"]):
+        return jsonify({"error": "Child not found"}), 404
+
+    new_meal = Meals(**_meal_columns(payload))
     db.session.add(new_meal)
     db.session.commit()
     return new_meal, 201
 
 
+@blp.route("/bulk", methods=["POST"])
+@blp.arguments(BulkCreateMeals())
+@blp.response(201, BulkMealsResponse())
+@blp.doc(description="Create many meal records in one transaction; invalid items are reported by index")
+def create_meals_bulk(payload):
+    created, errors = bulk_create(Meals, CreateMeal(), payload["items"], _meal_columns)
+    return {"created": created, "errors": errors}, 201 if created else 422
+
+
 @blp.route("/child/<int:child_id>", methods=["GET"])
-@blp.response(200, Meal(many=True)) # response schema (array of Meal)
-@blp.doc(description="Get all meals for a specific child")
-def get_meals_by_child(child_id):
+@blp.arguments(PageQuery, location="query")
+@blp.response(200, MealPage()) # response schema (page of Meal)
+@blp.doc(description="Get meals for a specific child, newest first, one page at a time")
+def get_meals_by_child(page_args, child_id):
     if not Children.query.get(child_id):
-        return {"error": "Child not found"}, 404
-    meals = Meals.query.filter_by(child_id=child_id).all()
-    return meals
+        return jsonify({"error": "Child not found"}), 404
+    page = keyset_paginate(
+        select(*MEAL_COLUMNS).where(Meals.child_id == child_id),
+        Meals.created_at, Meals.meal_id,
+        cursor=page_args.get("cursor"), limit=page_args["limit"],
+    )
+    return json_response(page_dict(page))
 
 
 @blp.route("/<int:meal_id>", methods=["PUT"])
@@ -68,25 +95,57 @@ def delete_meal(meal_id):
 
 @blp.route("/range/<int:child_id>", methods=["GET"])
 @blp.arguments(MealsRangeQuery, location="query")
-@blp.response(200, Meal(many=True))
-@blp.doc(description="Get all meals for a child within a time range")
+@blp.response(
+    200,
+    {"oneOf": [Meal(many=True), MealsPeriod(many=True)]},
+    description="Meals, oldest first; with granularity, one total per non-empty period",
+    headers=NEXT_CURSOR_HEADER,
+)
+@blp.doc(description="Get a child's meals within a time range, oldest first, at most `limit` per response; "
+                     "X-Next-Cursor carries the cursor for the rest. With granularity=hour|day|week|month, "
+                     "returns one {period_start, meal_count, servings_*} total per non-empty period instead "
+                     "(not paged).")
 def get_meals_by_time_range(query_args, child_id):
     start_time = query_args["start"]
     end_time = query_args["end"]
 
     child = Children.query.get(child_id)
     if not child:
-        return {"error": "Child not found"}, 404
+        return jsonify({"error": "Child not found"}), 404
+
+    if query_args.get("granularity"):
+        return json_response(summarize_servings(child_id, start_time, end_time, query_args["granularity"]))
 
-    meals = (
-        Meals.query
-        .filter(
+    page = keyset_paginate(
+        select(*MEAL_COLUMNS).where(
             Meals.child_id == child_id,
             Meals.created_at >= start_time,
             Meals.created_at <= end_time
-        )
-        .order_by(Meals.created_at.asc())
-        .all()
+        ),
+        Meals.created_at, Meals.meal_id,
+        cursor=query_args.get("cursor"), limit=query_args["limit"], ascending=True,
     )
-    
-    return meals
+    return json_response(rows_to_dicts(page["items"]), headers=page_headers(page))
+
+
+@blp.route("/summary/<int:child_id>", methods=["GET"])
+@blp.arguments(MealsSummaryQuery, location="query")
+@blp.response(200, MealsSummary)
+@blp.doc(description="Serving totals per day or week for a child, alongside their dietary guideline targets")
+def get_meals_summary(query_args, child_id):
+    child = Children.query.get(child_id)
+    if not child:
+        return jsonify({"error": "Child not found"}), 404
+
+    bucket = query_args["bucket"]
+    guideline = get_guideline_for_child(child)
+
+    return {
+        "child_id": child_id,
+        "bucket": bucket,
+        "guideline_id": guideline.guideline_id if guideline else None,
+        "targets": bucket_targets(guideline, bucket),
+        "buckets": summarize_servings(
+            child_id, query_args["start"], query_args["end"], bucket
+        ),
+    }
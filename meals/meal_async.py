@@ -0,0 +1,69 @@
+"""
+Coroutine versions of the busiest meal endpoints, served by asgi.py.
+
+Same URLs, schemas and responses as the views in meal_api.py, which stay
+the documented implementation (and serve every other meal route in both
+serving modes).
+"""
+from sqlalchemy import select
+
+from async_db import async_db
+from async_routes import AsyncRouter, load_json, load_query
+from fast_json import page_dict, page_headers, rows_to_dicts
+from meals.meal_api import MEAL_COLUMNS, _meal_columns
+from meals.services import servings_series_query
+from models import Children, Meals
+from pagination import keyset_paginate_async
+from schemas.common import PageQuery
+from schemas.meals import CreateMeal, Meal, MealsRangeQuery
+
+router = AsyncRouter("meals", url_prefix="/meals")
+
+
+@router.route("/", methods=["POST"])
+async def create_meal(request):
+    payload = load_json(CreateMeal(), request)
+    async with async_db.session() as session:
+        if await session.get(Children, payload["child_id"]) is None:
+            return {"error": "Child not found"}, 404
+        meal = Meals(**_meal_columns(payload))
+        session.add(meal)
+        await session.commit()
+    return Meal().dump(meal), 201
+
+
+@router.route("/child/<int:child_id>", methods=["GET"])
+async def get_meals_by_child(request, child_id):
+    page_args = load_query(PageQuery(), request)
+    async with async_db.session() as session:
+        if await session.get(Children, child_id) is None:
+            return {"error": "Child not found"}, 404
+        page = await keyset_paginate_async(
+            session, select(*MEAL_COLUMNS).where(Meals.child_id == child_id),
+            Meals.created_at, Meals.meal_id,
+            cursor=page_args.get("cursor"), limit=page_args["limit"],
+        )
+    return page_dict(page), 200
+
+
+@router.route("/range/<int:child_id>", methods=["GET"])
+async def get_meals_by_time_range(request, child_id):
+    query_args = load_query(MealsRangeQuery(), request)
+    async with async_db.session() as session:
+        if await session.get(Children, child_id) is None:
+            return {"error": "Child not found"}, 404
+        if query_args.get("granularity"):
+            rows = (await session.execute(servings_series_query(
+                child_id, query_args["start"], query_args["end"], query_args["granularity"],
+            ))).all()
+            return [row._asdict() for row in rows], 200
+        page = await keyset_paginate_async(
+            session, select(*MEAL_COLUMNS).where(
+                Meals.child_id == child_id,
+                Meals.created_at >= query_args["start"],
+                Meals.created_at <= query_args["end"],
+            ),
+            Meals.created_at, Meals.meal_id,
+            cursor=query_args.get("cursor"), limit=query_args["limit"], ascending=True,
+        )
+    return rows_to_dicts(page["items"]), 200, page_headers(page)
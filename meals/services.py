@@ -0,0 +1,44 @@
+from sqlalchemy import Float, cast, func, select
+
+from extension import db
+from models import Meals, SERVING_FIELDS
+from time_buckets import bucket_start
+
+BUCKET_DAYS = {"day": 1, "week": 7}
+
+def servings_series_query(child_id, start, end, bucket="day"):
+    """SELECT of per-bucket meal counts and serving totals (as floats) for one child, oldest first."""
+    period = bucket_start(Meals.created_at, bucket).label("period_start")
+    return (
+        select(
+            period,
+            func.count(Meals.meal_id).label("meal_count"),
+            *[cast(func.sum(getattr(Meals, f)), Float).label(f) for f in SERVING_FIELDS],
+        )
+        .where(
+            Meals.child_id == child_id,
+            Meals.created_at >= start,
+            Meals.created_at <= end,
+        )
+        .group_by(period)
+        .order_by(period)
+    )
+
+def summarize_servings(child_id, start, end, bucket="day"):
+    """
+    Per-bucket serving totals and meal counts for one child, summed in SQL.
+
+    Returns one dict per non-empty bucket, oldest first.
+    """
+    rows = db.session.execute(servings_series_query(child_id, start, end, bucket)).all()
+    return [row._asdict() for row in rows]
+
+def bucket_targets(guideline, bucket="day"):
+    """Guideline servings scaled from per-day to per-bucket."""
+    if guideline is None:
+        return None
+    days = BUCKET_DAYS[bucket]
+    return {
+        f: getattr(guideline, f) * days if getattr(guideline, f) is not None else None
+        for f in SERVING_FIELDS
+    }
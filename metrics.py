@@ -0,0 +1,198 @@
+"""
+Per-request performance instrumentation, exported at /metrics.
+
+Every request records, labelled by blueprint and endpoint:
+  - total latency
+  - time spent in SQL and the number of statements
+  - time spent serializing the view's return value (marshmallow + JSON)
+
+Requests slower than SLOW_REQUEST_MS are logged with the SQL they ran.
+Streamed responses (e.g. /children/<id>/export) are recorded once their
+body has been sent, so their latency and SQL include generating it.
+Set PROMETHEUS_MULTIPROC_DIR to aggregate across gunicorn workers.
+"""
+import os
+import time
+from functools import wraps
+
+from flask import Response, g, has_app_context, request
+from flask_smorest import Blueprint
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client.core import CounterMetricFamily
+from sqlalchemy import event
+
+from extension import db
+from query_counter import query_count
+from recipes.http_cache import response_cache
+
+LABELS = ["blueprint", "endpoint"]
+MAX_LOGGED_STATEMENTS = 50
+# Longer statements (e.g. a bulk insert's VALUES list) are cut in the slow-request log
+MAX_LOGGED_SQL_CHARS = 500
+
+REQUEST_SECONDS = Histogram(
+    "hughub_request_duration_seconds", "Request latency",
+    LABELS + ["method", "status"],
+)
+DB_SECONDS = Histogram(
+    "hughub_request_db_seconds", "Time spent executing SQL per request", LABELS,
+)
+SQL_STATEMENTS = Histogram(
+    "hughub_request_sql_statements", "SQL statements executed per request", LABELS,
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, float("inf")),
+)
+SERIALIZATION_SECONDS = Histogram(
+    "hughub_request_serialization_seconds",
+    "Time from the view returning to the response being built", LABELS,
+)
+MOOD_INGEST_DEAD_LETTERS = Counter(
+    "hughub_mood_ingest_dead_letters",
+    "Buffered mood logs written to the dead-letter file because their child was deleted",
+)
+
+
+class InstrumentedBlueprint(Blueprint):
+    """flask-smorest Blueprint that marks when each view returns, so the
+    serialization done by `@blp.response` can be timed separately."""
+
+    def response(self, status_code, schema=None, **kwargs):
+        decorator = super().response(status_code, schema, **kwargs)
+
+        def wrap(func):
+            @wraps(func)
+            def timed_view(*args, **kw):
+                result = func(*args, **kw)
+                g.view_finished_at = time.perf_counter()
+                return result
+            return decorator(timed_view)
+
+        return wrap
+
+
+class _CacheStatsCollector:
+    def collect(self):
+        hits = CounterMetricFamily(
+            "hughub_response_cache_hits", "Catalog response cache hits", labels=["endpoint"])
+        misses = CounterMetricFamily(
+            "hughub_response_cache_misses", "Catalog response cache misses", labels=["endpoint"])
+        for endpoint, counts in response_cache.stats().items():
+            hits.add_metric([endpoint], counts["hits"])
+            misses.add_metric([endpoint], counts["misses"])
+        yield hits
+        yield misses
+
+
+if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+    # Per-process counters; not meaningful when aggregating across workers
+    REGISTRY.register(_CacheStatsCollector())
+
+
+# The start time lives on the statement's execution context, not the
+# connection: a statement that raises never reaches after_cursor_execute,
+# and its context is simply discarded instead of leaving a stale entry.
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context.hughub_started_at = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "hughub_started_at", None)
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+    if has_app_context():
+        g.sql_seconds = g.get("sql_seconds", 0.0) + elapsed
+        sql_log = g.setdefault("sql_log", [])
+        if len(sql_log) < MAX_LOGGED_STATEMENTS:
+            sql_log.append((elapsed, statement))
+
+
+def _shorten(sql):
+    sql = " ".join(sql.split())
+    if len(sql) > MAX_LOGGED_SQL_CHARS:
+        return sql[:MAX_LOGGED_SQL_CHARS] + "..."
+    return sql
+
+
+def _observed_body(body, on_done):
+    # A generator rather than Response.call_on_close: asgiref's WsgiToAsgi
+    # (asgi.py) exhausts the body but never calls close()
+    try:
+        yield from body
+    finally:
+        on_done()
+
+
+def _metrics_view():
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return Response(generate_latest(registry), mimetype=CONTENT_TYPE_LATEST)
+
+
+def init_app(app):
+    with app.app_context():
+        for engine in db.engines.values():
+            event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+            event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+    slow_ms = app.config.get("SLOW_REQUEST_MS", 500)
+
+    @app.before_request
+    def start_timer():
+        g.request_started_at = time.perf_counter()
+        g.sql_seconds = 0.0
+        g.sql_log = []
+        g.pop("view_finished_at", None)
+
+    def observe(state, labels, method, path, endpoint, status, serialization_seconds):
+        elapsed = time.perf_counter() - state.request_started_at
+        REQUEST_SECONDS.labels(*labels, method, status).observe(elapsed)
+        DB_SECONDS.labels(*labels).observe(state.get("sql_seconds", 0.0))
+        SQL_STATEMENTS.labels(*labels).observe(query_count(state))
+        if serialization_seconds is not None:
+            SERIALIZATION_SECONDS.labels(*labels).observe(serialization_seconds)
+
+        if elapsed * 1000 >= slow_ms:
+            statements = "\n".join(
+                f"  [{seconds * 1000:.1f} ms] {_shorten(sql)}"
+                for seconds, sql in state.get("sql_log", [])
+            )
+            app.logger.warning(
+                "Slow request %s %s (%s): %.0f ms, %d SQL statements, %.0f ms in SQL\n%s",
+                method, path, endpoint, elapsed * 1000,
+                query_count(state), state.get("sql_seconds", 0.0) * 1000, statements,
+            )
+
+    @app.after_request
+    def record_request(response):
+        if g.get("request_started_at") is None or request.endpoint == "metrics":
+            return response
+        serialization_seconds = None
+        if "view_finished_at" in g:
+            serialization_seconds = time.perf_counter() - g.view_finished_at
+        args = (
+            g._get_current_object(),
+            (request.blueprint or "app", request.endpoint or "unmatched"),
+            request.method, request.full_path, request.endpoint, response.status_code,
+            serialization_seconds,
+        )
+        if response.is_streamed:
+            # after_request runs before a streamed body is generated; record
+            # the request once the server has consumed or closed the body
+            response.response = _observed_body(response.response, lambda: observe(*args))
+        else:
+            observe(*args)
+        return response
+
+    app.add_url_rule("/metrics", "metrics", _metrics_view)
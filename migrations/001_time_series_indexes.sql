@@ -0,0 +1,19 @@
+-- Composite time-series indexes for mood_logs and meals (see models.py).
+--
+-- Every per-child read filters on child_id and then ranges or orders on
+-- created_at; the trailing primary key makes keyset pages index-only in order.
+--
+-- CONCURRENTLY cannot run inside a transaction block, so apply with:
+--   psql "$DATABASE_URL" -f migrations/001_time_series_indexes.sql
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_mood_logs_child_id_created_at
+    ON mood_logs (child_id, created_at, mood_log_id);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_mood_logs_created_at
+    ON mood_logs (created_at, mood_log_id);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_meals_child_id_created_at
+    ON meals (child_id, created_at, meal_id);
+
+ANALYZE mood_logs;
+ANALYZE meals;
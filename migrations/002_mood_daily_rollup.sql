@@ -0,0 +1,36 @@
+-- Daily mood rollup (see MoodDailyRollup in models.py).
+--
+-- One row per child, day and mood with the number of mood logs; the mood
+-- log endpoints keep it in step in the same transaction as their writes.
+--
+-- Rollout:
+--   1. Apply before deploying the code that writes to it. This creates the
+--      table and fills it from existing mood logs:
+--        psql "$DATABASE_URL" -f migrations/002_mood_daily_rollup.sql
+--   2. Deploy.
+--   3. Once no instance of the old code is left, rebuild it:
+--        flask --app app:create_app mood-rollup backfill
+--      Mood logs written by the old code between steps 1 and 3 are missing
+--      from the rollup until then. The backfill is idempotent and safe to
+--      run under live traffic.
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS mood_daily_rollup (
+    child_id INTEGER NOT NULL REFERENCES children (child_id) ON DELETE CASCADE,
+    day DATE NOT NULL,
+    mood VARCHAR(50) NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (child_id, day, mood)
+);
+
+DELETE FROM mood_daily_rollup;
+
+INSERT INTO mood_daily_rollup (child_id, day, mood, count)
+SELECT child_id, CAST(date_trunc('day', created_at) AS DATE), mood, count(*)
+FROM mood_logs
+GROUP BY 1, 2, 3;
+
+COMMIT;
+
+ANALYZE mood_daily_rollup;
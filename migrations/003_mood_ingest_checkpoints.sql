@@ -0,0 +1,12 @@
+-- Write-behind ingest checkpoints (see MoodIngestCheckpoint in models.py).
+--
+-- One row per local ingest segment with the byte offset flushed into
+-- mood_logs so far; mood/ingest.py advances it in the same transaction as
+-- the rows it flushes, so replaying a segment after a crash starts exactly
+-- where the last commit ended. Only needed with MOOD_INGEST_MODE=buffered:
+--   psql "$DATABASE_URL" -f migrations/003_mood_ingest_checkpoints.sql
+
+CREATE TABLE IF NOT EXISTS mood_ingest_checkpoints (
+    segment VARCHAR(255) PRIMARY KEY,
+    "offset" BIGINT NOT NULL
+);
@@ -2,6 +2,15 @@ from extension import db
 from datetime import date
 import datetime
 
+# The five food-group servings columns shared by guidelines, recipes and meals
+SERVING_FIELDS = [
+    "servings_veg_legumes_beans",
+    "servings_fruit",
+    "servings_grain",
+    "servings_meat_fish_eggs_nuts_seeds",
+    "servings_milk_yoghurt_cheese",
+]
+
 # Recipe-related models
 class DietaryGuidelines(db.Model):
     __tablename__ = 'dietary_guidelines'
@@ -127,6 +136,11 @@ class Children(db.Model):
 # Mood-related model
 class MoodLog(db.Model):
     __tablename__ = "mood_logs"
+    __table_args__ = (
+        # Serves per-child range scans, latest-mood lookups and keyset pages
+        db.Index("ix_mood_logs_child_id_created_at", "child_id", "created_at", "mood_log_id"),
+        db.Index("ix_mood_logs_created_at", "created_at", "mood_log_id"),
+    )
 
     mood_log_id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     child_id = db.Column(db.Integer, db.ForeignKey('children.child_id', ondelete='CASCADE'), nullable=False)
@@ -145,9 +159,30 @@ class MoodLog(db.Model):
             "created_at": self.created_at.isoformat() if self.created_at else None
         }
         
+# Per child, per day, per mood counts of MoodLog rows, kept in step by
+# mood/services.py in the same transaction as the mood log writes
+class MoodDailyRollup(db.Model):
+    __tablename__ = "mood_daily_rollup"
+
+    child_id = db.Column(db.Integer, db.ForeignKey('children.child_id', ondelete='CASCADE'), primary_key=True)
+    day = db.Column(db.Date, primary_key=True)
+    mood = db.Column(db.String(50), primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+# How far each write-behind ingest segment has been flushed into mood_logs
+# (mood/ingest.py); committed in the same transaction as the flushed rows
+class MoodIngestCheckpoint(db.Model):
+    __tablename__ = "mood_ingest_checkpoints"
+
+    segment = db.Column(db.String(255), primary_key=True)
+    offset = db.Column(db.BigInteger, nullable=False)
+
 # Meal-related model
 class Meals(db.Model):
     __tablename__ = "meals"
+    __table_args__ = (
+        db.Index("ix_meals_child_id_created_at", "child_id", "created_at", "meal_id"),
+    )
 
     meal_id = db.Column(db.Integer, primary_key=True, autoincrement=True)  # SERIAL -> Integer + PK
     meal_name = db.Column(db.String(50), nullable=False)
@@ -0,0 +1,19 @@
+import click
+from flask.cli import AppGroup
+
+from mood.services import backfill_mood_rollup
+
+mood_cli = AppGroup("mood-rollup", help="Daily mood rollup commands.")
+
+
+@mood_cli.command("backfill")
+@click.option("--child-id", type=int, help="Only rebuild this child's rows")
+def backfill(child_id):
+    """
+    Rebuild mood_daily_rollup from mood_logs.
+
+    Run after deploying code that maintains the rollup, to pick up mood logs
+    written by the previous release. Idempotent; safe under live traffic.
+    """
+    rows = backfill_mood_rollup(child_id)
+    click.echo(f"mood_daily_rollup: {rows} rows written")
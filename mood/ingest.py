@@ -0,0 +1,298 @@
+"""
+Write-behind ingest for mood log POSTs (MOOD_INGEST_MODE=buffered).
+
+A POST appends the mood log to this worker's segment file in
+MOOD_INGEST_DIR, fsyncs it and answers 202. A background thread inserts
+pending entries into mood_logs in batches (every MOOD_INGEST_FLUSH_MS, or
+as soon as MOOD_INGEST_BATCH_SIZE are waiting). Each batch commits together
+with its rollup changes and the segment's checkpoint offset.
+
+Recovery: each worker holds an flock on its own segment. On start, any
+segment whose lock can be taken was left by a dead process. Its entries
+after the committed checkpoint are replayed and the file is removed.
+Because the checkpoint commits with the rows, a replay never inserts an
+entry twice.
+
+Read-your-writes holds only within the accepting worker: it remembers the
+last entry it accepted per child, and /mood_logs/latest returns it when it
+is newer than what the database (or a lagging replica) has. Other workers
+see an entry after the next flush. The mode is off by default; it assumes
+a single worker, or a load balancer that routes each child to one worker,
+and gunicorn.conf.py warns when it runs with more.
+
+Deleted children: a 202 means the entry is on disk, not that it will be
+inserted. If the child is deleted before the flush, the flush (which
+re-checks the children under a key-share lock) writes the entry to this
+worker's dead-letter file, mood-ingest-dead-letter-<host>-<pid>.jsonl in
+MOOD_INGEST_DIR, and counts it in hughub_mood_ingest_dead_letters_total.
+A flush that fails after writing them and is retried may dead-letter the
+same entries twice.
+"""
+import atexit
+import fcntl
+import glob
+import json
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from datetime import datetime
+
+from sqlalchemy import insert, select
+
+from extension import db
+from metrics import MOOD_INGEST_DEAD_LETTERS
+from models import Children, MoodIngestCheckpoint, MoodLog
+from mood.services import apply_rollup_changes, rollup_changes
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_GLOB = "mood-ingest-*.log"
+
+
+def _segment_name():
+    return f"mood-ingest-{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}.log"
+
+
+def _dead_letter_name():
+    # .jsonl, so recovery (SEGMENT_GLOB) never replays it
+    return f"mood-ingest-dead-letter-{socket.gethostname()}-{os.getpid()}.jsonl"
+
+
+def _open_locked(path, blocking=True):
+    f = open(path, "ab+")
+    try:
+        fcntl.flock(f, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+    except BlockingIOError:
+        f.close()
+        return None
+    return f
+
+
+LOGGED_FIELDS = ("child_id", "mood", "notes", "created_at")
+
+
+def _encode(entry):
+    record = {field: entry[field] for field in LOGGED_FIELDS}
+    record["created_at"] = entry["created_at"].isoformat()
+    return (json.dumps(record) + "\n").encode()
+
+
+def _decode(line):
+    entry = {"mood_log_id": None, **json.loads(line)}
+    entry["created_at"] = datetime.fromisoformat(entry["created_at"])
+    return entry
+
+
+class MoodIngestBuffer:
+    def __init__(self):
+        self.app = None
+        self._pid = None
+
+    @property
+    def enabled(self):
+        return self.app is not None
+
+    def init_app(self, app):
+        if app.config.get("MOOD_INGEST_MODE") != "buffered":
+            return
+        self.app = app
+        self.directory = app.config["MOOD_INGEST_DIR"]
+        self.flush_seconds = app.config["MOOD_INGEST_FLUSH_MS"] / 1000
+        self.batch_size = app.config["MOOD_INGEST_BATCH_SIZE"]
+        self.segment_bytes = app.config["MOOD_INGEST_SEGMENT_BYTES"]
+        os.makedirs(self.directory, exist_ok=True)
+
+    # ---- per-process state, created in the worker so it is never shared across a fork
+
+    def start(self):
+        """Start this process's segment and flush thread (which first recovers orphaned segments)."""
+        if self.enabled:
+            self._ensure_started()
+
+    def _ensure_started(self):
+        if self._pid == os.getpid():
+            return
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._pending = []  # (end offset in segment, entry), oldest first
+        self._latest = {}  # child_id -> last entry accepted by this worker
+        self._stopping = False
+        self._open_segment()
+        self._thread = threading.Thread(target=self._run, name="mood-ingest", daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+
+    def _open_segment(self):
+        self._segment = _segment_name()
+        self._file = _open_locked(os.path.join(self.directory, self._segment))
+
+    # ---- request side
+
+    def child_seen(self, child_id):
+        """True if this worker already accepted an entry for the child."""
+        self._ensure_started()
+        return child_id in self._latest
+
+    def append(self, payload):
+        """Durably append a mood log; returns it as the API shows it (no id until flushed)."""
+        self._ensure_started()
+        entry = {
+            "mood_log_id": None,
+            "child_id": payload["child_id"],
+            "mood": payload["mood"],
+            "notes": payload.get("notes"),
+            "created_at": datetime.now(),
+        }
+        line = _encode(entry)
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._pending.append((self._file.tell(), entry))
+            self._latest[entry["child_id"]] = entry
+            if len(self._pending) >= self.batch_size:
+                self._wake.notify()
+        return dict(entry)
+
+    def latest_accepted(self, child_id):
+        """The last entry this worker accepted for the child, or None."""
+        if not self.enabled or self._pid != os.getpid():
+            return None
+        with self._lock:
+            entry = self._latest.get(child_id)
+            return dict(entry) if entry else None
+
+    # ---- background flush
+
+    def _run(self):
+        with self.app.app_context():
+            self._recover()
+        while True:
+            with self._wake:
+                self._wake.wait_for(
+                    lambda: self._stopping or len(self._pending) >= self.batch_size,
+                    timeout=self.flush_seconds,
+                )
+                batch = self._pending[:self.batch_size]
+                segment = self._segment
+                stopping = self._stopping
+            if batch:
+                try:
+                    with self.app.app_context():
+                        self._write_batch(segment, batch)
+                except Exception:
+                    logger.exception("Mood ingest flush failed; %d entries will be retried", len(batch))
+                    if stopping:
+                        return  # left in the segment for recovery
+                    time.sleep(self.flush_seconds)
+                    continue
+                with self._lock:
+                    del self._pending[:len(batch)]
+                    retired = self._rotate_if_full()
+                if retired:
+                    self._retire(*retired)
+            elif stopping:
+                return
+
+    def _write_batch(self, segment, batch):
+        """Insert one batch and advance the segment checkpoint in a single transaction."""
+        entries = [entry for _, entry in batch]
+        child_ids = {entry["child_id"] for entry in entries}
+        # FOR KEY SHARE on PostgreSQL: the children cannot be deleted until this commits
+        existing = set(db.session.scalars(
+            select(Children.child_id)
+            .where(Children.child_id.in_(child_ids))
+            .with_for_update(read=True, key_share=True)
+        ))
+        kept = [entry for entry in entries if entry["child_id"] in existing]
+        if len(kept) < len(entries):
+            self._dead_letter([entry for entry in entries if entry["child_id"] not in existing])
+        created = []
+        if kept:
+            created = db.session.scalars(
+                insert(MoodLog).returning(MoodLog, sort_by_parameter_order=True),
+                [{field: entry[field] for field in LOGGED_FIELDS} for entry in kept],
+            ).all()
+            apply_rollup_changes(rollup_changes(added=created))
+        db.session.merge(MoodIngestCheckpoint(segment=segment, offset=batch[-1][0]))
+        db.session.commit()
+        for entry, mood_log in zip(kept, created):
+            entry["mood_log_id"] = mood_log.mood_log_id
+
+    def _dead_letter(self, entries):
+        """Keep entries whose child is gone, before the checkpoint moves past them."""
+        path = os.path.join(self.directory, _dead_letter_name())
+        with open(path, "ab") as f:
+            for entry in entries:
+                f.write(_encode(entry))
+            f.flush()
+            os.fsync(f.fileno())
+        MOOD_INGEST_DEAD_LETTERS.inc(len(entries))
+        logger.warning("Wrote %d buffered mood logs for deleted children to %s", len(entries), path)
+
+    def _rotate_if_full(self):
+        # Caller holds the lock. Only a fully flushed segment is rotated out,
+        # so every pending offset refers to the current file.
+        if self._pending or self._file.tell() < self.segment_bytes:
+            return None
+        retired = self._segment, self._file
+        self._open_segment()
+        return retired
+
+    def _retire(self, segment, f):
+        # File first: a crash in between leaves a harmless checkpoint row,
+        # never a segment without its checkpoint
+        os.remove(os.path.join(self.directory, segment))
+        f.close()
+        with self.app.app_context():
+            checkpoint = db.session.get(MoodIngestCheckpoint, segment)
+            if checkpoint is not None:
+                db.session.delete(checkpoint)
+                db.session.commit()
+
+    def _recover(self):
+        for path in sorted(glob.glob(os.path.join(self.directory, SEGMENT_GLOB))):
+            segment = os.path.basename(path)
+            if segment == self._segment:
+                continue
+            f = _open_locked(path, blocking=False)
+            if f is None:
+                continue  # owned by a live worker
+            try:
+                checkpoint = db.session.get(MoodIngestCheckpoint, segment)
+                f.seek(checkpoint.offset if checkpoint else 0)
+                batch, replayed = [], 0
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # torn final write; never acknowledged
+                    batch.append((f.tell(), _decode(line)))
+                    if len(batch) == self.batch_size:
+                        self._write_batch(segment, batch)
+                        replayed, batch = replayed + len(batch), []
+                if batch:
+                    self._write_batch(segment, batch)
+                    replayed += len(batch)
+                logger.info("Recovered %d mood logs from %s", replayed, segment)
+                self._retire(segment, f)
+            except Exception:
+                db.session.rollback()
+                f.close()
+                logger.exception("Could not recover mood ingest segment %s", segment)
+
+    def stop(self, timeout=10):
+        """Flush what is pending and stop the background thread."""
+        if self._pid != os.getpid() or self._stopping:
+            return
+        with self._wake:
+            self._stopping = True
+            self._wake.notify()
+        self._thread.join(timeout)
+        if not self._thread.is_alive() and not self._pending:
+            self._retire(self._segment, self._file)
+
+
+mood_ingest = MoodIngestBuffer()
@@ -1,25 +1,53 @@
-from flask_smorest import Blueprint
+from metrics import InstrumentedBlueprint
 from flask import request, jsonify
 from models import MoodLog, Children
 from extension import db
 from datetime import datetime
 from schemas.mood_logs import (
     MoodLog as MoodLogSchema,
+    MoodSummary,
+    MoodSummaryQuery,
     CreateMoodLog,
     MoodLogsRangeQuery,
+    MoodLogPage,
+    MoodPeriod,
     UpdateMoodLog,
+    BulkCreateMoodLogs,
+    BulkMoodLogsResponse,
 )
-from schemas.common import MessageSchema
+from schemas.common import MessageSchema, NEXT_CURSOR_HEADER, PageQuery
+from pagination import keyset_paginate
+from bulk import bulk_create
+from mood.services import (
+    apply_rollup_changes, daily_mood_counts, mood_series, mood_series_query, rollup_changes,
+)
+from mood.ingest import mood_ingest
+from fast_json import dump_columns, json_response, page_dict, page_headers, rows_to_dicts
+from sqlalchemy import select
 
-blp = Blueprint("mood_logs", __name__, url_prefix="/mood_logs",
+blp = InstrumentedBlueprint("mood_logs", __name__, url_prefix="/mood_logs",
                 description="Mood Logs API")
 
+# Column tuples dumped straight to JSON for list responses (see fast_json.py)
+MOOD_LOG_COLUMNS = dump_columns(MoodLogSchema(), MoodLog)
+
+def _mood_log_columns(payload):
+    return dict(
+        child_id=payload["child_id"],
+        mood=payload["mood"],
+        notes=payload.get("notes"),
+        created_at=datetime.now(),
+    )
+
 # ---------------------------
 # Create Mood Log
 # ---------------------------
 @blp.route("/", methods=["POST"])
 @blp.arguments(CreateMoodLog())  # request schema
 @blp.response(201, MoodLogSchema())  # response schema
+@blp.alt_response(202, schema=MoodLogSchema(),
+                  description="Accepted by the write-behind ingest log (MOOD_INGEST_MODE=buffered); "
+                              "mood_log_id is null until it is flushed")
 @blp.doc(description="Create a new mood log")
 def create_mood_log(payload):
     """
@@ -42,8 +70,13 @@ def create_mood_log(payload):
       201:
         description: Mood log created successfully
     """
+    if mood_ingest.enabled:
+        if not mood_ingest.child_seen(payload["child_id"]) and not Children.query.get(payload["child_id"]):
+            return jsonify({"error": "Child not found"}), 404
+        return mood_ingest.append(payload), 202
+
     if not Children.query.get(payload["child_id"]):
-        return {"error": "Child not found"}, 404
+        return jsonify({"error": "Child not found"}), 404
     # if not (child_id and mood):
     #     return jsonify({"error": "Missing required fields"}), 400
 
@@ -56,48 +89,64 @@ def create_mood_log(payload):
         mood_log.notes = payload.get("notes")
 
     db.session.add(mood_log)
+    apply_rollup_changes(rollup_changes(added=[mood_log]))
     db.session.commit()
     
     return mood_log, 201
 
+
+@blp.route("/bulk", methods=["POST"])
+@blp.arguments(BulkCreateMoodLogs())
+@blp.response(201, BulkMoodLogsResponse())
+@blp.doc(description="Create many mood logs in one transaction; invalid items are reported by index")
+def create_mood_logs_bulk(payload):
+    created, errors = bulk_create(
+        MoodLog, CreateMoodLog(), payload["items"], _mood_log_columns,
+        on_created=lambda rows: apply_rollup_changes(rollup_changes(added=rows)),
+    )
+    return {"created": created, "errors": errors}, 201 if created else 422
+
 # ---------------------------
 # Read All Mood Logs
 # ---------------------------
 @blp.route("/", methods=["GET"])
-@blp.response(200, MoodLogSchema(many=True))  # response schema (array of MoodLog)
-@blp.doc(description="Get all mood logs with optional filters")
-def get_all_mood_logs():
+@blp.arguments(PageQuery, location="query")
+@blp.response(200, MoodLogPage())  # response schema (page of MoodLog)
+@blp.doc(description="Get all mood logs, newest first, one page at a time")
+def get_all_mood_logs(page_args):
     """
     Get all mood logs
     ---
     parameters:
       - in: query
-        name: child_id
+        name: limit
         schema:
           type: integer
         required: false
-        description: Filter by child ID
+        description: Page size
       - in: query
-        name: mood
+        name: cursor
         schema:
           type: string
         required: false
-        description: Filter by mood
+        description: next_cursor from the previous page
     responses:
       200:
-        description: List of mood logs
+        description: Page of mood logs
     """
     # child_id = request.args.get("child_id", type=int)
     # mood = request.args.get("mood", type=str)
 
-    query = MoodLog.query
+    query = select(*MOOD_LOG_COLUMNS)
     # if child_id:
     #     query = query.filter(MoodLog.child_id == child_id)
     # if mood:
     #     query = query.filter(MoodLog.mood.ilike(f"%{mood}%"))
 
-    mood_logs = query.all()
-    return mood_logs
+    return json_response(page_dict(keyset_paginate(
+        query, MoodLog.created_at, MoodLog.mood_log_id,
+        cursor=page_args.get("cursor"), limit=page_args["limit"],
+    )))
 
 
 # ---------------------------
@@ -116,8 +165,9 @@ def get_all_mood_logs():
         }
     ]
 )
-@blp.response(200, MoodLogSchema(many=True))  # response schema (array of MoodLog)
-def get_mood_log(child_id):
+@blp.arguments(PageQuery, location="query")
+@blp.response(200, MoodLogPage())  # response schema (page of MoodLog)
+def get_mood_log(page_args, child_id):
     """
     Get a mood log by child ID
     ---
@@ -130,15 +180,18 @@ def get_mood_log(child_id):
         description: ID of the child 
     responses:
       200:
-        description: Mood log object
+        description: Page of mood logs, newest first
       404:
         description: Mood log not found
     """
     if not Children.query.get(child_id):
         return jsonify({"error": "Child not found"}), 404
-    mood_logs = MoodLog.query.filter(MoodLog.child_id == child_id).all()
 
-    return mood_logs
+    return json_response(page_dict(keyset_paginate(
+        select(*MOOD_LOG_COLUMNS).where(MoodLog.child_id == child_id),
+        MoodLog.created_at, MoodLog.mood_log_id,
+        cursor=page_args.get("cursor"), limit=page_args["limit"],
+    )))
 
 
 # ---------------------------
@@ -153,12 +206,15 @@ def update_mood_log(payload, mood_log_id):
     notes = payload.get("notes")
 
     mood_log = MoodLog.query.get_or_404(mood_log_id)
+    changes = rollup_changes(removed=[mood_log])
 
     if mood:
         mood_log.mood = mood
     if notes is not None:
         mood_log.notes = notes
 
+    changes.update(rollup_changes(added=[mood_log]))
+    apply_rollup_changes(changes)
     db.session.commit()
 
     return mood_log
@@ -189,6 +245,7 @@ def delete_mood_log(mood_log_id):
     """
     mood_log = MoodLog.query.get_or_404(mood_log_id)
     db.session.delete(mood_log)
+    apply_rollup_changes(rollup_changes(removed=[mood_log]))
     db.session.commit()
     return {"message": "Mood log deleted"}
 
@@ -198,7 +255,6 @@ def delete_mood_log(mood_log_id):
 @blp.doc(description="Get the latest mood log for a specific child")
 def get_latest_mood(child_id):
     # ensure the child exists
-    print(child_id)
     child = Children.query.get(child_id)
     if not child:
         return jsonify({"error": "Child not found"}), 404
@@ -210,16 +266,29 @@ def get_latest_mood(child_id):
         .order_by(MoodLog.created_at.desc())
         .first()
     )
+    # read-your-writes for mood logs this worker accepted but has not flushed yet
+    accepted = mood_ingest.latest_accepted(child_id)
+    if accepted and (mood_log is None or accepted["created_at"] > mood_log.created_at):
+        return accepted
 
     if not mood_log:
-        return {"error": "No mood logs found for this child"}, 404
+        return jsonify({"error": "No mood logs found for this child"}), 404
 
     return mood_log
 
 
 @blp.route("/range/<int:child_id>", methods=["GET"])
 @blp.arguments(MoodLogsRangeQuery, location="query")
-@blp.response(200, MoodLogSchema(many=True))  # response schema (array of MoodLog)
+@blp.response(
+    200,
+    {"oneOf": [MoodLogSchema(many=True), MoodPeriod(many=True)]},
+    description="Mood logs, oldest first; with granularity, one entry per non-empty period",
+    headers=NEXT_CURSOR_HEADER,
+)
+@blp.doc(description="Get a child's mood logs within a time range, oldest first, at most `limit` per "
+                     "response; X-Next-Cursor carries the cursor for the rest. With "
+                     "granularity=hour|day|week|month, returns one {period_start, total, counts} per "
+                     "non-empty period instead (not paged).")
 def get_moods_by_time_range(query_args, child_id):       # <-- order matters
     start_time = query_args["start"]
     end_time = query_args["end"]
@@ -229,18 +298,39 @@ def get_moods_by_time_range(query_args, child_id):       # <-- order matters
     if not child:
         return jsonify({"error": "Child not found"}), 404
 
-    mood_logs = (
-        MoodLog.query
-        .filter(
+    if query_args.get("granularity"):
+        series = mood_series(db.session.execute(
+            mood_series_query(child_id, start_time, end_time, query_args["granularity"])
+        ))
+        if not series:
+            return jsonify({"error": "No mood logs found in the specified range"}), 404
+        return json_response(series)
+
+    page = keyset_paginate(
+        select(*MOOD_LOG_COLUMNS).where(
             MoodLog.child_id == child_id,
             MoodLog.created_at >= start_time,
             MoodLog.created_at <= end_time
-        )
-        .order_by(MoodLog.created_at.asc())
-        .all()
+        ),
+        MoodLog.created_at, MoodLog.mood_log_id,
+        cursor=query_args.get("cursor"), limit=query_args["limit"], ascending=True,
     )
 
-    if not mood_logs:
-        return {"error": "No mood logs found in the specified range"}, 404
+    if not page["items"] and not query_args.get("cursor"):
+        return jsonify({"error": "No mood logs found in the specified range"}), 404
+
+    return json_response(rows_to_dicts(page["items"]), headers=page_headers(page))
+
+
+@blp.route("/summary/<int:child_id>", methods=["GET"])
+@blp.arguments(MoodSummaryQuery, location="query")
+@blp.response(200, MoodSummary)
+@blp.doc(description="Mood counts per day for a child, read from the daily rollup")
+def get_mood_summary(query_args, child_id):
+    if not Children.query.get(child_id):
+        return jsonify({"error": "Child not found"}), 404
 
-    return mood_logs
+    return {
+        "child_id": child_id,
+        "days": daily_mood_counts(child_id, query_args["start"], query_args["end"]),
+    }
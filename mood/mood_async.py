@@ -0,0 +1,111 @@
+"""
+Coroutine versions of the busiest mood log endpoints, served by asgi.py.
+
+Same URLs, schemas and responses as the views in mood_api.py, which stay
+the documented implementation (and serve every other mood log route in
+both serving modes).
+"""
+import asyncio
+
+from sqlalchemy import select
+
+from async_db import async_db
+from async_routes import AsyncRouter, load_json, load_query
+from fast_json import page_dict, page_headers, rows_to_dicts
+from models import Children, MoodLog
+from mood.ingest import mood_ingest
+from mood.mood_api import MOOD_LOG_COLUMNS, _mood_log_columns
+from mood.services import mood_series, mood_series_query, rollup_changes, rollup_statements
+from pagination import keyset_paginate_async
+from schemas.common import PageQuery
+from schemas.mood_logs import (
+    CreateMoodLog,
+    MoodLog as MoodLogSchema,
+    MoodLogsRangeQuery,
+)
+
+router = AsyncRouter("mood_logs", url_prefix="/mood_logs")
+
+
+@router.route("/", methods=["POST"])
+async def create_mood_log(request):
+    payload = load_json(CreateMoodLog(), request)
+    if mood_ingest.enabled:
+        if not mood_ingest.child_seen(payload["child_id"]):
+            async with async_db.session() as session:
+                if await session.get(Children, payload["child_id"]) is None:
+                    return {"error": "Child not found"}, 404
+        # the fsync blocks, so keep it off the event loop
+        entry = await asyncio.to_thread(mood_ingest.append, payload)
+        return MoodLogSchema().dump(entry), 202
+
+    async with async_db.session() as session:
+        if await session.get(Children, payload["child_id"]) is None:
+            return {"error": "Child not found"}, 404
+        mood_log = MoodLog(**_mood_log_columns(payload))
+        session.add(mood_log)
+        changes = rollup_changes(added=[mood_log])
+        for statement, params in rollup_statements(session.bind.dialect.name, changes):
+            await session.execute(statement, params)
+        await session.commit()
+    return MoodLogSchema().dump(mood_log), 201
+
+
+@router.route("/<int:child_id>", methods=["GET"])
+async def get_mood_log(request, child_id):
+    page_args = load_query(PageQuery(), request)
+    async with async_db.session() as session:
+        if await session.get(Children, child_id) is None:
+            return {"error": "Child not found"}, 404
+        page = await keyset_paginate_async(
+            session, select(*MOOD_LOG_COLUMNS).where(MoodLog.child_id == child_id),
+            MoodLog.created_at, MoodLog.mood_log_id,
+            cursor=page_args.get("cursor"), limit=page_args["limit"],
+        )
+    return page_dict(page), 200
+
+
+@router.route("/latest/<int:child_id>", methods=["GET"])
+async def get_latest_mood(request, child_id):
+    async with async_db.session() as session:
+        if await session.get(Children, child_id) is None:
+            return {"error": "Child not found"}, 404
+        mood_log = await session.scalar(
+            select(MoodLog)
+            .where(MoodLog.child_id == child_id)
+            .order_by(MoodLog.created_at.desc())
+            .limit(1)
+        )
+    accepted = mood_ingest.latest_accepted(child_id)
+    if accepted and (mood_log is None or accepted["created_at"] > mood_log.created_at):
+        return MoodLogSchema().dump(accepted), 200
+    if mood_log is None:
+        return {"error": "No mood logs found for this child"}, 404
+    return MoodLogSchema().dump(mood_log), 200
+
+
+@router.route("/range/<int:child_id>", methods=["GET"])
+async def get_moods_by_time_range(request, child_id):
+    query_args = load_query(MoodLogsRangeQuery(), request)
+    async with async_db.session() as session:
+        if await session.get(Children, child_id) is None:
+            return {"error": "Child not found"}, 404
+        if query_args.get("granularity"):
+            series = mood_series(await session.execute(mood_series_query(
+                child_id, query_args["start"], query_args["end"], query_args["granularity"],
+            )))
+            if not series:
+                return {"error": "No mood logs found in the specified range"}, 404
+            return series, 200
+        page = await keyset_paginate_async(
+            session, select(*MOOD_LOG_COLUMNS).where(
+                MoodLog.child_id == child_id,
+                MoodLog.created_at >= query_args["start"],
+                MoodLog.created_at <= query_args["end"],
+            ),
+            MoodLog.created_at, MoodLog.mood_log_id,
+            cursor=query_args.get("cursor"), limit=query_args["limit"], ascending=True,
+        )
+    if not page["items"] and not query_args.get("cursor"):
+        return {"error": "No mood logs found in the specified range"}, 404
+    return rows_to_dicts(page["items"]), 200, page_headers(page)
@@ -1,3 +1,13 @@
+from collections import Counter
+
+from sqlalchemy import delete, func, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from extension import db
+from models import MoodDailyRollup, MoodLog
+from time_buckets import bucket_start
+
 mood_db = {}  # In-memory storage for demonstration
 
 def add_mood_entry(child_id, mood):
@@ -7,3 +17,125 @@ def add_mood_entry(child_id, mood):
 
 def get_mood_entries(child_id):
     return mood_db.get(child_id, [])
+
+
+# ---------------------------
+# Daily mood rollup
+# ---------------------------
+_UPSERTS = {"postgresql": pg_insert, "sqlite": sqlite_insert}
+ROLLUP_KEY = ["child_id", "day", "mood"]
+
+
+def rollup_changes(added=(), removed=()):
+    """Net count change per (child_id, day, mood) for mood logs added/removed."""
+    changes = Counter()
+    for mood_log in added:
+        changes[mood_log.child_id, mood_log.created_at.date(), mood_log.mood] += 1
+    for mood_log in removed:
+        changes[mood_log.child_id, mood_log.created_at.date(), mood_log.mood] -= 1
+    return changes
+
+
+def rollup_statements(dialect_name, changes):
+    """(statement, params) pairs applying `changes` to mood_daily_rollup."""
+    rows = [
+        {"child_id": child_id, "day": day, "mood": mood, "count": delta}
+        for (child_id, day, mood), delta in changes.items() if delta
+    ]
+    if not rows:
+        return []
+    insert = _UPSERTS[dialect_name](MoodDailyRollup)
+    upsert = insert.on_conflict_do_update(
+        index_elements=ROLLUP_KEY,
+        set_={"count": MoodDailyRollup.count + insert.excluded["count"]},
+    )
+    statements = [(upsert, rows)]
+    if any(row["count"] < 0 for row in rows):
+        statements.append((
+            delete(MoodDailyRollup).where(
+                MoodDailyRollup.child_id.in_({row["child_id"] for row in rows}),
+                MoodDailyRollup.count <= 0,
+            ),
+            None,
+        ))
+    return statements
+
+
+def apply_rollup_changes(changes):
+    """Apply in the current db.session transaction; the caller commits."""
+    dialect_name = db.session.get_bind(MoodDailyRollup).dialect.name
+    for statement, params in rollup_statements(dialect_name, changes):
+        db.session.execute(statement, params)
+
+
+def backfill_mood_rollup(child_id=None):
+    """
+    Rebuild mood_daily_rollup from mood_logs (one child or all) and commit.
+
+    On PostgreSQL the rollup is locked against writers first, so a mood log
+    committed during the rebuild is counted exactly once: either it is
+    visible to the rebuild, or its writer's upsert waits for it to finish.
+    """
+    if db.session.get_bind(MoodDailyRollup).dialect.name == "postgresql":
+        db.session.execute(text("LOCK TABLE mood_daily_rollup IN SHARE ROW EXCLUSIVE MODE"))
+    day = bucket_start(MoodLog.created_at, "day")
+    counts = (
+        select(MoodLog.child_id, day, MoodLog.mood, func.count())
+        .group_by(MoodLog.child_id, day, MoodLog.mood)
+    )
+    clear = delete(MoodDailyRollup)
+    if child_id is not None:
+        counts = counts.where(MoodLog.child_id == child_id)
+        clear = clear.where(MoodDailyRollup.child_id == child_id)
+    db.session.execute(clear)
+    result = db.session.execute(
+        MoodDailyRollup.__table__.insert().from_select(
+            ["child_id", "day", "mood", "count"], counts
+        )
+    )
+    db.session.commit()
+    return result.rowcount
+
+
+def mood_series_query(child_id, start, end, bucket):
+    """SELECT of (period_start, mood, count) for one child's mood logs, grouped in SQL."""
+    period = bucket_start(MoodLog.created_at, bucket).label("period_start")
+    return (
+        select(period, MoodLog.mood, func.count(MoodLog.mood_log_id).label("count"))
+        .where(
+            MoodLog.child_id == child_id,
+            MoodLog.created_at >= start,
+            MoodLog.created_at <= end,
+        )
+        .group_by(period, MoodLog.mood)
+        .order_by(period, MoodLog.mood)
+    )
+
+
+def mood_series(rows):
+    """Fold mood_series_query rows into one dict per period, oldest first."""
+    periods = {}
+    for period_start, mood, count in rows:
+        entry = periods.setdefault(period_start, {"period_start": period_start, "total": 0, "counts": {}})
+        entry["counts"][mood] = count
+        entry["total"] += count
+    return list(periods.values())
+
+
+def daily_mood_counts(child_id, start, end):
+    """One dict per day with any mood logs in [start, end], oldest first."""
+    rows = db.session.execute(
+        select(MoodDailyRollup.day, MoodDailyRollup.mood, MoodDailyRollup.count)
+        .where(
+            MoodDailyRollup.child_id == child_id,
+            MoodDailyRollup.day >= start,
+            MoodDailyRollup.day <= end,
+        )
+        .order_by(MoodDailyRollup.day, MoodDailyRollup.mood)
+    )
+    days = {}
+    for day, mood, count in rows:
+        entry = days.setdefault(day, {"day": day, "total": 0, "counts": {}})
+        entry["counts"][mood] = count
+        entry["total"] += count
+    return list(days.values())
@@ -0,0 +1,70 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from sqlalchemy import Select, tuple_
+
+from extension import db
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+# Raw time-range reads return a bare list; this bounds one response
+MAX_RANGE_PAGE_SIZE = 1000
+
+
+def encode_cursor(created_at, row_id):
+    raw = json.dumps([created_at.isoformat(), row_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """Return (created_at, id) from an opaque cursor, or raise ValueError."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (binascii.Error, TypeError, ValueError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def _keyset_window(query, created_col, id_col, cursor, limit, ascending):
+    key = tuple_(created_col, id_col)
+    if cursor:
+        query = query.filter(key > tuple_(*cursor) if ascending else key < tuple_(*cursor))
+    if ascending:
+        return query.order_by(created_col.asc(), id_col.asc()).limit(limit + 1)
+    return query.order_by(created_col.desc(), id_col.desc()).limit(limit + 1)
+
+
+def _page(rows, created_col, id_col, limit):
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(
+            getattr(last, created_col.key), getattr(last, id_col.key)
+        )
+    return {"items": rows, "next_cursor": next_cursor}
+
+
+def keyset_paginate(query, created_col, id_col, cursor=None, limit=DEFAULT_PAGE_SIZE, ascending=False):
+    """
+    Newest-first (or with `ascending`, oldest-first) keyset pagination on
+    (created_at, id).
+
+    `cursor` is the decoded (created_at, id) of the last row of the previous
+    page. Only `limit + 1` rows are read per page, so page N costs the same
+    as page 1. `query` is either a Model.query or a column `select()`, in
+    which case the items are Rows.
+    """
+    window = _keyset_window(query, created_col, id_col, cursor, limit, ascending)
+    rows = db.session.execute(window).all() if isinstance(query, Select) else window.all()
+    return _page(rows, created_col, id_col, limit)
+
+
+async def keyset_paginate_async(session, stmt, created_col, id_col, cursor=None, limit=DEFAULT_PAGE_SIZE,
+                                ascending=False):
+    """`keyset_paginate` for a column `select()` run on an AsyncSession; items are Rows."""
+    result = await session.execute(_keyset_window(stmt, created_col, id_col, cursor, limit, ascending))
+    return _page(result.all(), created_col, id_col, limit)
@@ -0,0 +1,34 @@
+from flask import g, has_app_context
+from sqlalchemy import event
+
+from extension import db
+
+
+def query_count(state=None):
+    """Number of SQL statements executed so far in the current request.
+
+    `state` is a request's `g` captured earlier, for use once its context
+    has been popped (e.g. after a streamed body is sent)."""
+    return (state if state is not None else g).get("sql_query_count", 0)
+
+
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    if has_app_context():
+        g.sql_query_count = g.get("sql_query_count", 0) + 1
+
+
+def init_app(app):
+    """Count SQL statements per request; optionally report them in X-Query-Count."""
+    with app.app_context():
+        for engine in db.engines.values():
+            event.listen(engine, "before_cursor_execute", _count_statement)
+
+    @app.before_request
+    def reset_query_count():
+        g.sql_query_count = 0
+
+    if app.config.get("SQL_QUERY_COUNT_HEADER"):
+        @app.after_request
+        def add_query_count_header(response):
+            response.headers["X-Query-Count"] = str(query_count())
+            return response
@@ -0,0 +1,121 @@
+"""
+Query-count regression check for the list endpoints.
+
+Runs each GET endpoint below against a throwaway SQLite database seeded
+at two sizes and counts the SQL statements it executes (query_counter).
+Exits non-zero if any endpoint runs more statements on the larger data
+set, i.e. its query count grows with the number of rows returned (an
+N+1 lazy load, or a per-ID query).
+
+    python query_counts.py
+"""
+import os
+import sys
+
+os.environ["DATABASE_URL"] = "sqlite://"
+os.environ["SQL_QUERY_COUNT_HEADER"] = "true"
+
+from datetime import date, datetime, timedelta
+
+from app import create_app
+from extension import db
+from models import Children, Ingredient, Meals, MoodLog, Recipe, RecipeIngredient
+from mood.services import backfill_mood_rollup
+from recipes.http_cache import response_cache
+
+app = create_app()
+
+SIZES = (3, 30)
+INGREDIENTS_PER_RECIPE = 3
+
+START = "2025-01-01T00:00:00"
+END = "2025-02-01T00:00:00"
+
+# (label, url) for each endpoint whose query count must not depend on the
+# data size; {n} is the size and {ids} every child ID
+ENDPOINTS = [
+    ("recipes.get_recipe_ingredients", "/recipes/recipe_ingredients"),
+    ("recipes.get_all_recipes", "/recipes/"),
+    ("recipes.get_all_ingredients", "/recipes/ingredients"),
+    ("children.get_children", "/children/"),
+    ("children.get_dashboard", "/children/dashboard?ids={ids}"),
+    ("mood_logs.get_all_mood_logs", "/mood_logs/?limit={n}"),
+    ("mood_logs.get_mood_log", "/mood_logs/1?limit={n}"),
+    ("mood_logs.get_moods_by_time_range", f"/mood_logs/range/1?start={START}&end={END}"),
+    ("meals.get_meals_by_child", "/meals/child/1?limit={n}"),
+    ("meals.get_meals_by_time_range", f"/meals/range/1?start={START}&end={END}"),
+]
+
+
+def _seed(n):
+    t0 = datetime(2025, 1, 1)
+    ingredients = [Ingredient(ingredient_name=f"ingredient{i}", category="Vegetables")
+                   for i in range(n + INGREDIENTS_PER_RECIPE)]
+    db.session.add_all(ingredients)
+    for i in range(n):
+        recipe = Recipe(recipe_name=f"recipe{i}", cooking_steps="Mix and bake.")
+        recipe.recipe_ingredients = [RecipeIngredient(ingredient=ingredient, grams=100)
+                                     for ingredient in ingredients[i:i + INGREDIENTS_PER_RECIPE]]
+        db.session.add(recipe)
+
+    child_ids = []
+    for child_no in range(n):
+        child = Children(name=f"child{child_no}", gender="F",
+                         date_of_birth=date(2019, 1, 1), meals_per_day=3)
+        db.session.add(child)
+        db.session.flush()
+        child_ids.append(child.child_id)
+        for i in range(n):
+            at = t0 + timedelta(hours=6 * i)
+            db.session.add(MoodLog(child_id=child.child_id, mood="happy", created_at=at))
+            db.session.add(Meals(child_id=child.child_id, meal_name="meal",
+                                 meal_type="Lunch", created_at=at))
+    db.session.commit()
+    backfill_mood_rollup()
+    return child_ids
+
+
+def _count(client, url):
+    # Warm the per-worker indexes first so their (size-independent) reload
+    # queries are not counted, then bypass the cached response
+    client.get(url)
+    response_cache.backend.bump_version()
+    response = client.get(url)
+    return response.status_code, int(response.headers.get("X-Query-Count", -1))
+
+
+def count_queries(n):
+    """{label: (status, statements)} for every endpoint with `n` rows of everything."""
+    counts = {}
+    with app.app_context():
+        db.create_all(bind_key=None)  # replicas get the schema by replication
+        child_ids = _seed(n)
+        client = app.test_client()
+        for label, url in ENDPOINTS:
+            counts[label] = _count(client, url.format(n=n, ids=",".join(map(str, child_ids))))
+        db.session.remove()
+        db.drop_all(bind_key=None)
+    return counts
+
+
+def check_query_counts():
+    """Return a list of (label, message) for every endpoint whose count grows."""
+    small, large = (count_queries(n) for n in SIZES)
+    failures = []
+    for label, _ in ENDPOINTS:
+        (small_status, small_count), (large_status, large_count) = small[label], large[label]
+        if small_status != 200 or large_status != 200:
+            failures.append((label, f"HTTP {small_status}/{large_status}"))
+        elif large_count > small_count:
+            failures.append((label, f"{small_count} statements for {SIZES[0]} rows, "
+                                    f"{large_count} for {SIZES[1]}"))
+    return failures
+
+
+if __name__ == "__main__":
+    failures = check_query_counts()
+    for label, message in failures:
+        print(f"FAIL {label}: {message}")
+    if failures:
+        sys.exit(1)
+    print(f"OK: {len(ENDPOINTS)} endpoints run a constant number of queries")
@@ -0,0 +1,133 @@
+"""
+Query-plan regression check for the time-series read endpoints.
+
+Runs every GET endpoint that reads mood_logs or meals against a
+throwaway SQLite database, captures the SQL each one actually emits and
+runs it through EXPLAIN QUERY PLAN. Exits non-zero if any statement falls
+back to a full table scan or a temporary sort on a time-series table.
+
+    python query_plans.py
+"""
+import os
+import re
+import sys
+
+os.environ["DATABASE_URL"] = "sqlite://"
+
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import event
+
+from app import create_app
+from extension import db
+from models import Children, Meals, MoodLog
+from mood.services import backfill_mood_rollup
+from pagination import encode_cursor
+
+app = create_app()
+
+WATCHED_TABLES = ("mood_logs", "meals", "mood_daily_rollup")
+# A full scan reads "SCAN <table>", or "SCAN TABLE <table>" before SQLite 3.36;
+# "SCAN <table> [AS x] USING [COVERING] INDEX ..." walks an index and is fine
+FULL_SCAN = re.compile(rf"SCAN (?:TABLE )?(?:{'|'.join(WATCHED_TABLES)})\b")
+INDEX_SCAN = re.compile(r"\bUSING (?:COVERING )?INDEX\b")
+
+START = "2025-01-01T00:00:00"
+END = "2025-02-01T00:00:00"
+CURSOR = encode_cursor(datetime(2025, 1, 5), 20)
+
+# (label, url) for each read endpoint whose query must stay index-backed
+ENDPOINTS = [
+    ("mood_logs.get_all_mood_logs", "/mood_logs/?limit=5"),
+    ("mood_logs.get_mood_log", "/mood_logs/1?limit=5"),
+    ("mood_logs.get_mood_log (next page)", f"/mood_logs/1?limit=5&cursor={CURSOR}"),
+    ("mood_logs.get_latest_mood", "/mood_logs/latest/1"),
+    ("mood_logs.get_moods_by_time_range", f"/mood_logs/range/1?start={START}&end={END}"),
+    ("mood_logs.get_moods_by_time_range (hour)", f"/mood_logs/range/1?start={START}&end={END}&granularity=hour"),
+    ("meals.get_meals_by_child", "/meals/child/1?limit=5"),
+    ("meals.get_meals_by_child (next page)", f"/meals/child/1?limit=5&cursor={CURSOR}"),
+    ("meals.get_meals_by_time_range", f"/meals/range/1?start={START}&end={END}"),
+    ("meals.get_meals_by_time_range (week)", f"/meals/range/1?start={START}&end={END}&granularity=week"),
+    ("children.export_child_history", "/children/1/export"),
+    ("children.get_dashboard", "/children/dashboard?ids=1,2,3"),
+    ("meals.get_meals_summary", f"/meals/summary/1?start={START}&end={END}&bucket=week"),
+    ("mood_logs.get_mood_summary", "/mood_logs/summary/1?start=2025-01-01&end=2025-02-01"),
+    ("insights.get_mood_nutrition_correlation", "/insights/mood-nutrition/1?start=2025-01-01&end=2025-02-01"),
+]
+
+
+def _seed():
+    t0 = datetime(2025, 1, 1)
+    for child_no in range(3):
+        child = Children(name=f"child{child_no}", gender="F",
+                         date_of_birth=date(2019, 1, 1), meals_per_day=3)
+        db.session.add(child)
+        db.session.flush()
+        for i in range(50):
+            at = t0 + timedelta(hours=6 * i)
+            db.session.add(MoodLog(child_id=child.child_id, mood="happy", created_at=at))
+            db.session.add(Meals(child_id=child.child_id, meal_name="meal",
+                                 meal_type="Lunch", created_at=at))
+    db.session.commit()
+    backfill_mood_rollup()
+    db.session.execute(db.text("ANALYZE"))
+
+
+def _capture(client, url):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        response = client.get(url)
+    finally:
+        event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
+    return response, statements
+
+
+def _bad_steps(plan_rows):
+    bad = []
+    for row in plan_rows:
+        detail = row[-1]
+        if FULL_SCAN.match(detail) and not INDEX_SCAN.search(detail):
+            bad.append(detail)
+        elif "USE TEMP B-TREE FOR ORDER BY" in detail:
+            bad.append(detail)
+    return bad
+
+
+def check_query_plans():
+    """Return a list of (label, sql, bad plan steps) for every failing query."""
+    failures = []
+    with app.app_context():
+        db.create_all(bind_key=None)  # replicas get the schema by replication
+        _seed()
+        client = app.test_client()
+        for label, url in ENDPOINTS:
+            response, statements = _capture(client, url)
+            if response.status_code >= 500:
+                failures.append((label, url, [f"HTTP {response.status_code}"]))
+                continue
+            with db.engine.connect() as conn:
+                for statement, parameters in statements:
+                    if not any(table in statement for table in WATCHED_TABLES):
+                        continue
+                    plan = conn.exec_driver_sql(
+                        "EXPLAIN QUERY PLAN " + statement, parameters
+                    ).fetchall()
+                    bad = _bad_steps(plan)
+                    if bad:
+                        failures.append((label, statement, bad))
+        db.drop_all(bind_key=None)
+    return failures
+
+
+if __name__ == "__main__":
+    failures = check_query_plans()
+    for label, sql, bad in failures:
+        print(f"FAIL {label}: {'; '.join(bad)}\n    {' '.join(sql.split())}")
+    if failures:
+        sys.exit(1)
+    print(f"OK: {len(ENDPOINTS)} endpoints use index-backed plans")
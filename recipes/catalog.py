@@ -0,0 +1,61 @@
+"""
+Change notifications for the recipe catalog reference tables.
+
+Per-worker structures built from the catalog (guideline index, search
+index, ...) register a listener with `on_catalog_change`. Listeners run
+after a commit that touched a catalog row, with one `CatalogChange` per
+row; `values` is None when the row was deleted.
+"""
+from collections import namedtuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from models import DietaryGuidelines, Ingredient, Recipe, RecipeIngredient
+
+CATALOG_MODELS = (Recipe, Ingredient, RecipeIngredient, DietaryGuidelines)
+
+CatalogChange = namedtuple("CatalogChange", ["model", "pk", "values"])
+
+_listeners = []
+
+
+def on_catalog_change(listener):
+    """Register `listener(changes)`; usable as a decorator."""
+    _listeners.append(listener)
+    return listener
+
+
+def _pk(obj):
+    return inspect(obj).mapper.primary_key_from_instance(obj)[0]
+
+
+def _snapshot(obj):
+    return {attr.key: getattr(obj, attr.key) for attr in inspect(obj).mapper.column_attrs}
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changes(session, flush_context):
+    # new/dirty/deleted still describe the flush that just ran, with PKs assigned
+    changes = []
+    for obj in session.new | session.dirty:
+        if isinstance(obj, CATALOG_MODELS):
+            changes.append(CatalogChange(type(obj), _pk(obj), _snapshot(obj)))
+    for obj in session.deleted:
+        if isinstance(obj, CATALOG_MODELS):
+            changes.append(CatalogChange(type(obj), _pk(obj), None))
+    if changes:
+        session.info.setdefault("catalog_changes", []).extend(changes)
+
+
+@event.listens_for(Session, "after_commit")
+def _notify_listeners(session):
+    changes = session.info.pop("catalog_changes", None)
+    if changes:
+        for listener in _listeners:
+            listener(changes)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changes(session):
+    session.info.pop("catalog_changes", None)
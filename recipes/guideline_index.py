@@ -0,0 +1,88 @@
+import threading
+import time
+from bisect import bisect_right
+from collections import namedtuple
+
+from flask import current_app
+
+from models import DietaryGuidelines
+from recipes.catalog import on_catalog_change
+
+# Immutable snapshot of a DietaryGuidelines row, safe to share across requests
+Guideline = namedtuple("Guideline", [c.name for c in DietaryGuidelines.__table__.columns])
+
+
+class GuidelineIndex:
+    """
+    Per-worker copy of dietary_guidelines with O(log n) age lookup.
+
+    Rows are grouped by gender and sorted by min_age; age bands within a
+    gender are assumed not to overlap. The snapshot is rebuilt when
+    `reload()` is called, when it is older than GUIDELINE_CACHE_TTL seconds,
+    or after this worker writes to dietary_guidelines.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # (rows, {gender: (sorted min_ages, bands)}, loaded_at); swapped atomically
+        self._snapshot = None
+
+    def reload(self):
+        rows = [
+            Guideline(*(getattr(g, f) for f in Guideline._fields))
+            for g in DietaryGuidelines.query.order_by(DietaryGuidelines.guideline_id)
+        ]
+        by_gender = {}
+        for row in sorted(rows, key=lambda r: r.min_age):
+            mins, bands = by_gender.setdefault(row.gender, ([], []))
+            mins.append(row.min_age)
+            bands.append(row)
+        snapshot = (rows, by_gender, time.monotonic())
+        with self._lock:
+            self._snapshot = snapshot
+        return snapshot
+
+    def invalidate(self):
+        with self._lock:
+            self._snapshot = None
+
+    def _current(self):
+        snapshot = self._snapshot
+        ttl = current_app.config.get("GUIDELINE_CACHE_TTL", 300)
+        if snapshot is None or time.monotonic() - snapshot[2] > ttl:
+            snapshot = self.reload()
+        return snapshot
+
+    @staticmethod
+    def _lookup(by_gender, gender, age):
+        mins, bands = by_gender.get(gender, ((), ()))
+        i = bisect_right(mins, age) - 1
+        if i >= 0 and bands[i].max_age >= age:
+            return bands[i]
+        return None
+
+    def lookup(self, gender, age):
+        """The guideline whose [min_age, max_age] band contains `age`, or None."""
+        return self._lookup(self._current()[1], gender, age)
+
+    def filter(self, ids=None, gender=None, age=None):
+        rows, by_gender, _ = self._current()
+        if age is not None:
+            genders = [gender] if gender else list(by_gender)
+            rows = [g for g in (self._lookup(by_gender, x, age) for x in genders) if g]
+            rows.sort(key=lambda g: g.guideline_id)
+        elif gender:
+            rows = [g for g in rows if g.gender == gender]
+        if ids:
+            wanted = set(ids)
+            rows = [g for g in rows if g.guideline_id in wanted]
+        return rows
+
+
+guideline_index = GuidelineIndex()
+
+
+@on_catalog_change
+def _invalidate_on_write(changes):
+    if any(change.model is DietaryGuidelines for change in changes):
+        guideline_index.invalidate()
@@ -0,0 +1,201 @@
+"""
+Response cache and conditional GET for the recipe catalog endpoints.
+
+One mechanism serves both. Each request maps to a key: catalog version +
+endpoint + normalized query args. The weak ETag is a SHA-1 of that key and
+the current RESPONSE_CACHE_TTL window, so it is known before the view runs:
+a matching If-None-Match is answered 304 without even a cache lookup.
+Otherwise `catalog_cached` serves the body stored under the key, or runs
+the view and stores its body. Only a miss runs SQL or marshmallow. Every
+response carries Cache-Control: public, max-age=CATALOG_CACHE_MAX_AGE and
+X-Cache: HIT/MISS.
+
+Any committed change to a catalog row bumps the version, so stale entries
+are simply never looked up again and age out of the backend, and old
+ETags stop matching. The TTL window in the ETag gives conditional requests
+the same bound on unseen writes as the cached bodies.
+
+Backends:
+  - LocalBackend: bounded in-process LRU (default). The version is per
+    worker (and unique to it, so ETags from two workers or from before a
+    restart never match), so RESPONSE_CACHE_TTL bounds how long another
+    worker's write goes unseen.
+  - RedisBackend: shared entries and version across workers, selected by
+    RESPONSE_CACHE_URL. Needs the `redis` package.
+"""
+import hashlib
+import json
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from copy import deepcopy
+from functools import wraps
+
+from flask import current_app, make_response, request
+
+from recipes.catalog import on_catalog_change
+
+try:
+    import redis
+except ImportError:  # only needed when RESPONSE_CACHE_URL is set
+    redis = None
+
+VERSION_KEY = "catalog:version"
+
+
+class LocalBackend:
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (value, expires_at)
+        self._version = 0
+        # Keeps this worker's versions, and so its ETags, distinct from other workers'
+        self._instance = uuid.uuid4().hex[:8]
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if time.monotonic() > expires_at:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def version(self):
+        return f"{self._instance}.{self._version}"
+
+    def bump_version(self):
+        with self._lock:
+            self._version += 1
+
+
+class RedisBackend:
+    def __init__(self, url):
+        if redis is None:
+            raise RuntimeError(
+                "RESPONSE_CACHE_URL is set but the redis package is not installed "
+                "(pip install redis), or unset RESPONSE_CACHE_URL to use the in-process cache"
+            )
+        self._client = redis.Redis.from_url(url)
+
+    def get(self, key):
+        raw = self._client.get(key)
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, key, value, ttl):
+        self._client.set(key, json.dumps(value), ex=ttl)
+
+    def version(self):
+        return int(self._client.get(VERSION_KEY) or 0)
+
+    def bump_version(self):
+        self._client.incr(VERSION_KEY)
+
+
+class ResponseCache:
+    def __init__(self):
+        self.backend = LocalBackend()
+        self._lock = threading.Lock()
+        self.hits = Counter()
+        self.misses = Counter()
+
+    def init_app(self, app):
+        url = app.config.get("RESPONSE_CACHE_URL")
+        if url:
+            self.backend = RedisBackend(url)
+        else:
+            self.backend = LocalBackend(app.config.get("RESPONSE_CACHE_SIZE", 1024))
+
+    def record(self, endpoint, hit):
+        with self._lock:
+            (self.hits if hit else self.misses)[endpoint] += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                endpoint: {"hits": self.hits[endpoint], "misses": self.misses[endpoint]}
+                for endpoint in sorted(set(self.hits) | set(self.misses))
+            }
+
+
+response_cache = ResponseCache()
+
+
+@on_catalog_change
+def _bump_version(changes):
+    response_cache.backend.bump_version()
+
+
+def _request_key(version):
+    args = sorted((k, ",".join(sorted(request.args.getlist(k)))) for k in request.args)
+    query = "&".join(f"{k}={v}" for k, v in args)
+    return f"catalog:{version}:{request.endpoint}?{query}"
+
+
+def _etag(key, ttl):
+    return hashlib.sha1(f"{key}@{int(time.time() // ttl)}".encode()).hexdigest()
+
+
+def _respond(entry, max_age, hit):
+    if request.if_none_match.contains_weak(entry["etag"]):
+        response = make_response("", 304)
+    else:
+        response = make_response(entry["body"], 200)
+        response.mimetype = entry["mimetype"]
+    response.set_etag(entry["etag"], weak=True)
+    response.cache_control.public = True
+    response.cache_control.max_age = max_age
+    response.headers["X-Cache"] = "HIT" if hit else "MISS"
+    return response
+
+
+def catalog_cached(view):
+    """
+    Cache a catalog GET and answer conditional requests from the cache.
+
+    Apply directly under `@blp.route`. A matching If-None-Match yields a
+    304 before the view runs, cached or not; on a hit, neither the DB nor
+    marshmallow is touched.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        config = current_app.config
+        max_age = config.get("CATALOG_CACHE_MAX_AGE", 60)
+        ttl = config.get("RESPONSE_CACHE_TTL", 60)
+        backend = response_cache.backend
+        key = _request_key(backend.version())
+        etag = _etag(key, ttl)
+
+        if request.if_none_match.contains_weak(etag):
+            response_cache.record(request.endpoint, hit=True)
+            return _respond({"etag": etag}, max_age, hit=True)
+
+        entry = backend.get(key)
+        response_cache.record(request.endpoint, hit=entry is not None)
+        if entry is not None:
+            return _respond(entry, max_age, hit=True)
+
+        response = make_response(view(*args, **kwargs))
+        if response.status_code != 200:
+            return response
+
+        body = response.get_data(as_text=True)
+        entry = {"etag": etag, "body": body, "mimetype": response.mimetype}
+        backend.set(key, entry, ttl)
+        return _respond(entry, max_age, hit=False)
+
+    # Let flask-smorest document If-None-Match, the 304 and the ETag header
+    wrapper._apidoc = deepcopy(getattr(wrapper, "_apidoc", {}))
+    wrapper._apidoc["etag"] = True
+    return wrapper
@@ -0,0 +1,185 @@
+"""
+Weekly meal plans: DAYS days x meals_per_day recipes whose daily servings
+come as close as possible to a dietary guideline.
+
+The cost of a plan is the sum over days and food groups of the squared
+relative miss, ((day total - target) / target)^2, with targets floored at
+MIN_TARGET so a tiny target cannot dominate. No recipe repeats within the
+week unless there are fewer candidates than slots.
+
+The solver works on the recipe_matrix servings array, narrowed to the
+POOL_SIZE recipes closest to a per-meal share of the target:
+  1. greedy: fill each day slot by slot, taking the unused recipe that
+     brings the running total closest to the pro-rata target;
+  2. local search: apply the best single move (replace one slot with an
+     unused recipe, or swap two slots on different days) until no move
+     lowers the cost or MEAL_PLAN_TIME_BUDGET_MS runs out.
+Everything is deterministic, so a plan depends only on the guideline, the
+meals per day, the preference filter and the catalog.
+"""
+import math
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+from flask import current_app
+
+from models import DietaryGuidelines, Recipe, SERVING_FIELDS
+from recipes.catalog import on_catalog_change
+from recipes.recommender import recipe_matrix
+
+DAYS = 7
+MIN_TARGET = 0.5
+POOL_SIZE = 2000
+IMPROVEMENT_EPSILON = 1e-9
+
+
+def _cost(totals, target, weights):
+    return (((totals - target) * weights) ** 2).sum(axis=-1)
+
+
+def _greedy(servings, target, weights, meals_per_day, max_uses):
+    uses = np.zeros(len(servings), dtype=int)
+    plan = np.empty((DAYS, meals_per_day), dtype=int)
+    for day in range(DAYS):
+        total = np.zeros(len(SERVING_FIELDS))
+        for slot in range(meals_per_day):
+            costs = _cost(total + servings, target * (slot + 1) / meals_per_day, weights)
+            costs[uses >= max_uses] = np.inf
+            pick = int(np.argmin(costs))
+            plan[day, slot] = pick
+            uses[pick] += 1
+            total += servings[pick]
+    return plan, uses
+
+
+def _local_search(plan, uses, servings, target, weights, max_uses, deadline):
+    """Improve `plan` in place; returns True if it reached a local optimum in time."""
+    meals_per_day = plan.shape[1]
+    day_of = np.repeat(np.arange(DAYS), meals_per_day)
+    while time.monotonic() < deadline:
+        slots = plan.reshape(-1)
+        totals = servings[plan].sum(axis=1)                  # (DAYS, 5)
+        day_costs = _cost(totals, target, weights)           # (DAYS,)
+        slot_servings = servings[slots]                      # (slots, 5)
+
+        # Replace slot i with recipe r: (slots, pool) change in cost
+        base = totals[day_of] - slot_servings                # day total without the slot
+        replace = _cost(base[:, None, :] + servings[None, :, :], target, weights) - day_costs[day_of][:, None]
+        replace[:, uses >= max_uses] = np.inf
+        i, r = np.unravel_index(np.argmin(replace), replace.shape)
+        best_replace = replace[i, r]
+
+        # Swap slots i and j on different days: (slots, slots) change in cost
+        diff = slot_servings[None, :, :] - slot_servings[:, None, :]  # [i, j] = s_j - s_i
+        swap = (
+            _cost(totals[day_of][:, None, :] + diff, target, weights)
+            + _cost(totals[day_of][None, :, :] - diff, target, weights)
+            - day_costs[day_of][:, None] - day_costs[day_of][None, :]
+        )
+        swap[day_of[:, None] == day_of[None, :]] = np.inf
+        a, b = np.unravel_index(np.argmin(swap), swap.shape)
+        best_swap = swap[a, b]
+
+        if min(best_replace, best_swap) >= -IMPROVEMENT_EPSILON:
+            return True
+        if best_replace <= best_swap:
+            uses[slots[i]] -= 1
+            uses[r] += 1
+            slots[i] = r
+        else:
+            slots[a], slots[b] = slots[b], slots[a]
+    return False
+
+
+def build_meal_plan(guideline, meals_per_day, time_budget, **filters):
+    """
+    A DAYS-day plan for `guideline`, or None when no recipe matches `filters`.
+
+    Returns {"target", "days": [{"day", "recipe_ids", "totals"}], "cost",
+    "converged"}; `converged` is False when the time budget cut the local
+    search short.
+    """
+    deadline = time.monotonic() + time_budget
+    ids, servings = recipe_matrix.candidates(**filters)
+    if not len(ids):
+        return None
+    target = np.array([float(getattr(guideline, f) or 0.0) for f in SERVING_FIELDS])
+    weights = 1.0 / np.maximum(target, MIN_TARGET)
+
+    if len(ids) > POOL_SIZE:
+        distance = _cost(servings, target / meals_per_day, weights)
+        pool = np.argpartition(distance, POOL_SIZE - 1)[:POOL_SIZE]
+        pool = pool[np.argsort(ids[pool], kind="stable")]
+        ids, servings = ids[pool], servings[pool]
+
+    max_uses = math.ceil(DAYS * meals_per_day / len(ids))
+    plan, uses = _greedy(servings, target, weights, meals_per_day, max_uses)
+    converged = _local_search(plan, uses, servings, target, weights, max_uses, deadline)
+
+    totals = servings[plan].sum(axis=1)
+    return {
+        "target": dict(zip(SERVING_FIELDS, target.tolist())),
+        "days": [
+            {
+                "day": day + 1,
+                "recipe_ids": ids[plan[day]].tolist(),
+                "totals": dict(zip(SERVING_FIELDS, np.round(totals[day], 2).tolist())),
+            }
+            for day in range(DAYS)
+        ],
+        "cost": round(float(_cost(totals, target, weights).sum()), 4),
+        "converged": converged,
+    }
+
+
+class MealPlanCache:
+    """
+    Per-worker LRU of plans keyed by (guideline_id, meals_per_day, filters).
+
+    Children sharing a guideline band, meals per day and preferences share
+    one plan. Dropped on any recipe or guideline change in this worker;
+    MEAL_PLAN_CACHE_TTL bounds how long other workers' changes go unseen.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (plan, computed_at)
+        self._generation = 0
+
+    def get(self, guideline, meals_per_day, **filters):
+        key = (guideline.guideline_id, meals_per_day, tuple(sorted(filters.items())))
+        config = current_app.config
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and time.monotonic() - entry[1] <= config.get("MEAL_PLAN_CACHE_TTL", 600):
+                self._entries.move_to_end(key)
+                return entry[0]
+            generation = self._generation
+
+        plan = build_meal_plan(
+            guideline, meals_per_day, config.get("MEAL_PLAN_TIME_BUDGET_MS", 200) / 1000, **filters
+        )
+        with self._lock:
+            if self._generation != generation:
+                return plan  # catalog changed while solving; don't cache
+            self._entries[key] = (plan, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > config.get("MEAL_PLAN_CACHE_SIZE", 256):
+                self._entries.popitem(last=False)
+        return plan
+
+    def invalidate(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+
+meal_plan_cache = MealPlanCache()
+
+
+@on_catalog_change
+def _invalidate_on_write(changes):
+    if any(change.model in (Recipe, DietaryGuidelines) for change in changes):
+        meal_plan_cache.invalidate()
@@ -0,0 +1,112 @@
+import threading
+import time
+
+import numpy as np
+from flask import current_app
+from sqlalchemy import select
+
+from extension import db
+from models import Ingredient, Recipe, RecipeIngredient
+from recipes.catalog import on_catalog_change
+
+
+class PantryIndex:
+    """
+    Per-worker inverted lists from recipe_ingredients, for "cook with what I have".
+
+    Recipes are numbered 0..n-1 in the snapshot. For every ingredient the
+    index keeps the sorted numbers of the recipes that use it, and for every
+    recipe its distinct ingredients, both as CSR arrays. Counting how many
+    of a recipe's ingredients are on hand is one bincount over the lists of
+    the available ingredients. Rebuilt after any recipe or ingredient change
+    in this worker or when older than PANTRY_INDEX_TTL seconds.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshot = None
+
+    def reload(self):
+        rows = db.session.execute(select(RecipeIngredient.recipe_id, RecipeIngredient.ingredient_id)).all()
+        # fromiter over plain ints; np.array() on a list of Row objects is ~100x slower
+        flat = np.fromiter((value for row in rows for value in row), dtype=np.int64, count=2 * len(rows))
+        pairs = np.unique(flat.reshape(-1, 2), axis=0)
+        recipe_ids, recipe_no = np.unique(pairs[:, 0], return_inverse=True)
+        ingredient_ids, ingredient_no = np.unique(pairs[:, 1], return_inverse=True)
+
+        by_ingredient = np.lexsort((recipe_no, ingredient_no))
+        recipes_of = recipe_no[by_ingredient].astype(np.int32)
+        recipes_start = np.searchsorted(ingredient_no[by_ingredient], np.arange(len(ingredient_ids) + 1))
+
+        by_recipe = np.lexsort((ingredient_no, recipe_no))
+        ingredients_of = ingredient_ids[ingredient_no[by_recipe]]
+        ingredients_start = np.searchsorted(recipe_no[by_recipe], np.arange(len(recipe_ids) + 1))
+
+        snapshot = {
+            "recipe_ids": recipe_ids,
+            "ingredient_ids": ingredient_ids,
+            "recipes_of": recipes_of,
+            "recipes_start": recipes_start,
+            "ingredients_of": ingredients_of,
+            "ingredients_start": ingredients_start,
+            "loaded_at": time.monotonic(),
+        }
+        with self._lock:
+            self._snapshot = snapshot
+        return snapshot
+
+    def invalidate(self):
+        with self._lock:
+            self._snapshot = None
+
+    def _current(self):
+        snapshot = self._snapshot
+        ttl = current_app.config.get("PANTRY_INDEX_TTL", 600)
+        if snapshot is None or time.monotonic() - snapshot["loaded_at"] > ttl:
+            snapshot = self.reload()
+        return snapshot
+
+    def makeable(self, available, max_missing=0, limit=20):
+        """
+        Recipes needing at most `max_missing` ingredients beyond `available`.
+
+        Returns [(recipe_id, matched, [missing ingredient ids])], fewest
+        missing first, then the larger share of ingredients on hand, then
+        recipe_id. Recipes with no ingredients listed are never returned.
+        """
+        s = self._current()
+        known = np.intersect1d(np.fromiter(available, dtype=np.int64), s["ingredient_ids"])
+        numbers = np.searchsorted(s["ingredient_ids"], known)
+        starts, ends = s["recipes_start"][numbers], s["recipes_start"][numbers + 1]
+        lists = [s["recipes_of"][a:b] for a, b in zip(starts, ends)]
+
+        n_recipes = len(s["recipe_ids"])
+        matched = np.bincount(np.concatenate(lists), minlength=n_recipes) if lists else np.zeros(n_recipes, int)
+        totals = np.diff(s["ingredients_start"])
+        missing = totals - matched
+
+        candidates = np.flatnonzero(missing <= max_missing)
+        order = np.lexsort((
+            s["recipe_ids"][candidates],
+            -matched[candidates] / totals[candidates],
+            missing[candidates],
+        ))[:limit]
+
+        results = []
+        for number in candidates[order]:
+            own = s["ingredients_of"][s["ingredients_start"][number]:s["ingredients_start"][number + 1]]
+            results.append((
+                int(s["recipe_ids"][number]),
+                int(matched[number]),
+                own[~np.isin(own, known)].tolist(),
+            ))
+        return results
+
+
+pantry_index = PantryIndex()
+
+
+@on_catalog_change
+def _invalidate_on_write(changes):
+    if any(change.model in (Recipe, Ingredient, RecipeIngredient) for change in changes):
+        pantry_index.invalidate()
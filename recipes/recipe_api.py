@@ -1,47 +1,56 @@
-from flask_smorest import Blueprint
+from metrics import InstrumentedBlueprint
 from flask import jsonify
-from models import DietaryGuidelines, Ingredient, Recipe, RecipeIngredient
+from models import Children, Ingredient, Recipe, RecipeIngredient
 from schemas.dietary_guidelines import DietaryGuideline as DietaryGuidelineSchema, GetDietaryGuidelinesQuery
 from schemas.ingredients import Ingredient as IngredientSchema, GetIngredientsQuery
-from schemas.recipes import Recipe as RecipeSchema, GetRecipesQuery
+from schemas.recipes import (
+    Recipe as RecipeSchema, GetRecipesQuery, RecipeSearchQuery, RecipeSearchHit,
+    MakeableRecipesQuery, MakeableRecipe, MealPlanQuery, MealPlan,
+    RecommendationsQuery, Recommendations,
+)
 from schemas.recipe_ingredients import RecipeIngredient as RecipeIngredientSchema, GetRecipeIngredientsQuery
+from recipes.guideline_index import guideline_index
+from recipes.search_index import MAX_NAME_MATCHES, ingredient_search, recipe_search
+from recipes.text_index import recipe_text_search
+from recipes.pantry import pantry_index
+from recipes.services import get_guideline_for_child, get_recommended_recipes
+from recipes.meal_plan import meal_plan_cache
+from recipes.http_cache import catalog_cached
+from sqlalchemy.orm import joinedload
 from typing import Optional
 
-blp = Blueprint("recipes", __name__, url_prefix="/recipes", description="Recipe Recommender API")
+blp = InstrumentedBlueprint("recipes", __name__, url_prefix="/recipes", description="Recipe Recommender API")
 
 def _parse_ids(csv: Optional[str]):
     if not csv:
         return []
     return [int(x) for x in csv.split(",") if x.strip().isdigit()]
 
+def _in_rank_order(rows, ranked_ids, id_attr):
+    rank = {row_id: i for i, row_id in enumerate(ranked_ids)}
+    return sorted(rows, key=lambda row: rank[getattr(row, id_attr)])
+
 # ---------------------------
 # GET /recipes/dietary-guidelines
 # ---------------------------
 @blp.route("/dietary-guidelines", methods=["GET"])
+@catalog_cached
 @blp.arguments(GetDietaryGuidelinesQuery, location="query")
 @blp.response(200, DietaryGuidelineSchema(many=True))
 @blp.doc(description="Get dietary guidelines with optional filters.", tags=["recipes"])
 def get_all_dietary_guidelines(q):
-    ids = _parse_ids(q.get("ids"))
-    gender = q.get("gender")
-    age = q.get("age")
-
-    query = DietaryGuidelines.query
-    if ids:
-        # NOTE: correct column name is guideline_id (not id)
-        query = query.filter(DietaryGuidelines.guideline_id.in_(ids))
-    if gender:
-        query = query.filter(DietaryGuidelines.gender == gender)
-    if age is not None:
-        query = query.filter(DietaryGuidelines.min_age <= age,
-                             DietaryGuidelines.max_age >= age)
-
-    return query.all()
+    # Served from the per-worker guideline index; no DB round trip
+    return guideline_index.filter(
+        ids=_parse_ids(q.get("ids")),
+        gender=q.get("gender"),
+        age=q.get("age"),
+    )
 
 # ---------------------------
 # GET /recipes/ingredients
 # ---------------------------
 @blp.route("/ingredients", methods=["GET"])
+@catalog_cached
 @blp.arguments(GetIngredientsQuery, location="query")
 @blp.response(200, IngredientSchema(many=True))
 @blp.doc(description="Get all ingredients with optional filters", tags=["recipes"])
@@ -56,7 +65,10 @@ def get_all_ingredients(q):
     if category:
         query = query.filter(Ingredient.category == category)
     if ingredient_name:
-        query = query.filter(Ingredient.ingredient_name.ilike(f"%{ingredient_name}%"))
+        # Trigram index instead of a leading-wildcard ILIKE table scan
+        match_ids = ingredient_search.search(ingredient_name, limit=MAX_NAME_MATCHES)
+        query = query.filter(Ingredient.ingredient_id.in_(match_ids))
+        return _in_rank_order(query.all(), match_ids, "ingredient_id")
 
     return query.all()
 
@@ -64,6 +76,7 @@ def get_all_ingredients(q):
 # GET /recipes/
 # ---------------------------
 @blp.route("/", methods=["GET"])
+@catalog_cached
 @blp.arguments(GetRecipesQuery, location="query")
 @blp.response(200, RecipeSchema(many=True))
 @blp.doc(description="Get recipes with optional filters.", tags=["recipes"])
@@ -77,8 +90,10 @@ def get_all_recipes(q):
     query = Recipe.query
     if ids:
         query = query.filter(Recipe.recipe_id.in_(ids))
+    match_ids = None
     if recipe_name:
-        query = query.filter(Recipe.recipe_name.ilike(f"%{recipe_name}%"))
+        match_ids = recipe_search.search(recipe_name, limit=MAX_NAME_MATCHES)
+        query = query.filter(Recipe.recipe_id.in_(match_ids))
     if recipe_type:
         query = query.filter(Recipe.recipe_type == recipe_type)
     if cuisine_type:
@@ -86,12 +101,61 @@ def get_all_recipes(q):
     if dietary_preferences:
         query = query.filter(Recipe.dietary_preferences == dietary_preferences)
 
+    if match_ids is not None:
+        return _in_rank_order(query.all(), match_ids, "recipe_id")
     return query.all()
 
+# ---------------------------
+# GET /recipes/search
+# ---------------------------
+@blp.route("/search", methods=["GET"])
+@catalog_cached
+@blp.arguments(RecipeSearchQuery, location="query")
+@blp.response(200, RecipeSearchHit(many=True))
+@blp.doc(description="Full-text search over recipe names and cooking steps, best match first.", tags=["recipes"])
+def search_recipes(q):
+    hits = recipe_text_search.search(q["q"], limit=q["limit"])
+    if not hits:
+        return []
+    recipes = {r.recipe_id: r for r in Recipe.query.filter(Recipe.recipe_id.in_([i for i, _ in hits]))}
+    results = []
+    for recipe_id, score in hits:
+        if recipe_id in recipes:
+            row = recipes[recipe_id].to_dict()
+            row["score"] = round(score, 4)
+            results.append(row)
+    return results
+
+# ---------------------------
+# GET /recipes/makeable
+# ---------------------------
+@blp.route("/makeable", methods=["GET"])
+@catalog_cached
+@blp.arguments(MakeableRecipesQuery, location="query")
+@blp.response(200, MakeableRecipe(many=True))
+@blp.doc(description="Recipes that can be cooked from the given ingredients, or are missing at most "
+                     "max_missing of them; fewest missing first.", tags=["recipes"])
+def get_makeable_recipes(q):
+    matches = pantry_index.makeable(
+        set(_parse_ids(q["ingredient_ids"])), max_missing=q["max_missing"], limit=q["limit"],
+    )
+    if not matches:
+        return []
+    recipes = {r.recipe_id: r for r in Recipe.query.filter(Recipe.recipe_id.in_([m[0] for m in matches]))}
+    results = []
+    for recipe_id, matched, missing in matches:
+        if recipe_id in recipes:
+            row = recipes[recipe_id].to_dict()
+            row["matched"] = matched
+            row["missing_ingredient_ids"] = missing
+            results.append(row)
+    return results
+
 # ---------------------------
 # GET /recipes/recipe_ingredients
 # ---------------------------
 @blp.route("/recipe_ingredients", methods=["GET"])
+@catalog_cached
 @blp.arguments(GetRecipeIngredientsQuery, location="query")
 @blp.response(200, RecipeIngredientSchema(many=True))
 @blp.doc(description="Get recipe ingredients with optional filters.", tags=["recipes"])
@@ -100,7 +164,12 @@ def get_recipe_ingredients(q):
     recipe_ids = _parse_ids(q.get("recipe_id"))
     ingredient_ids = _parse_ids(q.get("ingredient_id"))
 
-    query = RecipeIngredient.query
+    # recipe_name/ingredient_name come from the relationships; load them in the
+    # same SELECT instead of two lazy loads per row
+    query = RecipeIngredient.query.options(
+        joinedload(RecipeIngredient.recipe).load_only(Recipe.recipe_name),
+        joinedload(RecipeIngredient.ingredient).load_only(Ingredient.ingredient_name),
+    )
     if ids:
         query = query.filter(RecipeIngredient.recipe_ingredient_id.in_(ids))
     if recipe_ids:
@@ -108,4 +177,79 @@ def get_recipe_ingredients(q):
     if ingredient_ids:
         query = query.filter(RecipeIngredient.ingredient_id.in_(ingredient_ids))
 
-    return query.all()
\ No newline at end of file
+    return query.all()
+
+# ---------------------------
+# GET /recipes/recommendations/<child_id>
+# ---------------------------
+@blp.route("/recommendations/<int:child_id>", methods=["GET"])
+@blp.arguments(RecommendationsQuery, location="query")
+@blp.response(200, Recommendations)
+@blp.doc(description="Recipes that best fill a child's remaining servings for today.", tags=["recipes"])
+def get_recipe_recommendations(q, child_id):
+    child = Children.query.get(child_id)
+    if not child:
+        return jsonify({"error": "Child not found"}), 404
+
+    result = get_recommended_recipes(
+        child,
+        limit=q["limit"],
+        recipe_type=q.get("recipe_type"),
+        cuisine_type=q.get("cuisine_type"),
+        dietary_preferences=q.get("dietary_preferences"),
+    )
+    if result is None:
+        return jsonify({"error": "No dietary guideline found for this child"}), 404
+
+    recipes = []
+    for recipe, distance in result["recipes"]:
+        row = recipe.to_dict()
+        row["distance"] = distance
+        recipes.append(row)
+
+    return {
+        "child_id": child_id,
+        "guideline_id": result["guideline"].guideline_id,
+        "remaining": result["remaining"],
+        "recipes": recipes,
+    }
+
+# ---------------------------
+# GET /recipes/meal-plan/<child_id>
+# ---------------------------
+@blp.route("/meal-plan/<int:child_id>", methods=["GET"])
+@blp.arguments(MealPlanQuery, location="query")
+@blp.response(200, MealPlan)
+@blp.doc(description="A 7-day plan of recipes meeting the child's daily guideline servings, "
+                     "without repeats.", tags=["recipes"])
+def get_meal_plan(q, child_id):
+    child = Children.query.get(child_id)
+    if not child:
+        return jsonify({"error": "Child not found"}), 404
+    guideline = get_guideline_for_child(child)
+    if guideline is None:
+        return jsonify({"error": "No dietary guideline found for this child"}), 404
+
+    meals_per_day = child.meals_per_day or 3
+    plan = meal_plan_cache.get(guideline, meals_per_day, dietary_preferences=q.get("dietary_preferences"))
+    if plan is None:
+        return jsonify({"error": "No recipes match these preferences"}), 404
+
+    recipe_ids = {i for day in plan["days"] for i in day["recipe_ids"]}
+    recipes = {r.recipe_id: r for r in Recipe.query.filter(Recipe.recipe_id.in_(recipe_ids))}
+    return {
+        "child_id": child_id,
+        "guideline_id": guideline.guideline_id,
+        "meals_per_day": meals_per_day,
+        "target": plan["target"],
+        "days": [
+            {
+                "day": day["day"],
+                "recipes": [recipes[i] for i in day["recipe_ids"] if i in recipes],
+                "totals": day["totals"],
+            }
+            for day in plan["days"]
+        ],
+        "cost": plan["cost"],
+        "converged": plan["converged"],
+    }
@@ -0,0 +1,98 @@
+import threading
+import time
+
+import numpy as np
+from flask import current_app
+
+from extension import db
+from models import Recipe, SERVING_FIELDS
+from recipes.catalog import on_catalog_change
+
+FILTER_FIELDS = ["recipe_type", "cuisine_type", "dietary_preferences"]
+
+
+class RecipeMatrix:
+    """
+    Per-worker (n_recipes x 5) float matrix of recipe servings.
+
+    Column order follows SERVING_FIELDS; missing servings are 0. The filter
+    columns are kept as parallel object arrays so filtering is a boolean
+    mask rather than a query. Rebuilt after any recipe change in this worker
+    or when older than RECIPE_MATRIX_TTL seconds.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshot = None
+
+    def reload(self):
+        rows = db.session.query(
+            Recipe.recipe_id,
+            *[getattr(Recipe, f) for f in FILTER_FIELDS],
+            *[getattr(Recipe, f) for f in SERVING_FIELDS],
+        ).all()
+        n_filters = len(FILTER_FIELDS)
+        ids = np.array([row[0] for row in rows], dtype=np.int64)
+        filters = {
+            f: np.array([row[1 + i] for row in rows], dtype=object)
+            for i, f in enumerate(FILTER_FIELDS)
+        }
+        servings = np.nan_to_num(
+            np.array([row[1 + n_filters:] for row in rows], dtype=float).reshape(-1, len(SERVING_FIELDS))
+        )
+        snapshot = (ids, filters, servings, time.monotonic())
+        with self._lock:
+            self._snapshot = snapshot
+        return snapshot
+
+    def invalidate(self):
+        with self._lock:
+            self._snapshot = None
+
+    def _current(self):
+        snapshot = self._snapshot
+        ttl = current_app.config.get("RECIPE_MATRIX_TTL", 600)
+        if snapshot is None or time.monotonic() - snapshot[3] > ttl:
+            snapshot = self.reload()
+        return snapshot
+
+    def _mask(self, ids, columns, filters):
+        mask = np.ones(len(ids), dtype=bool)
+        for field, value in filters.items():
+            if value is not None:
+                mask &= columns[field] == value
+        return mask
+
+    def candidates(self, **filters):
+        """(ids, servings rows) of the recipes matching the FILTER_FIELDS filters."""
+        ids, columns, servings, _ = self._current()
+        mask = self._mask(ids, columns, filters)
+        return ids[mask], servings[mask]
+
+    def nearest(self, target, limit=10, **filters):
+        """
+        Recipe ids whose servings are closest (Euclidean) to `target`.
+
+        `target` is a length-5 vector in SERVING_FIELDS order. Keyword
+        filters match FILTER_FIELDS exactly; None means no filter.
+        Returns (ids, distances), nearest first.
+        """
+        ids, columns, servings, _ = self._current()
+        candidates = np.flatnonzero(self._mask(ids, columns, filters))
+        distances = np.linalg.norm(servings[candidates] - np.asarray(target, dtype=float), axis=1)
+
+        k = min(limit, len(candidates))
+        if k == 0:
+            return [], []
+        top = np.argpartition(distances, k - 1)[:k]
+        top = top[np.lexsort((ids[candidates[top]], distances[top]))]
+        return ids[candidates[top]].tolist(), distances[top].tolist()
+
+
+recipe_matrix = RecipeMatrix()
+
+
+@on_catalog_change
+def _invalidate_on_write(changes):
+    if any(change.model is Recipe for change in changes):
+        recipe_matrix.invalidate()
@@ -0,0 +1,133 @@
+import heapq
+import threading
+import time
+
+from flask import current_app
+
+from models import Ingredient, Recipe
+from recipes.catalog import on_catalog_change
+
+# Most ids a name filter passes to the `IN (...)` of the catalog queries;
+# a short term can match most of the catalog
+MAX_NAME_MATCHES = 500
+
+
+def _trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class TrigramIndex:
+    """
+    Case-insensitive substring index over one name column.
+
+    Matches are exactly what `ILIKE '%term%'` would return, but candidates
+    come from intersecting trigram posting sets instead of scanning every
+    row. Terms shorter than three characters fall back to a scan of the
+    in-memory names. Results are ranked: exact match, then prefix, then
+    word-start, then any substring; ties go to the shorter name.
+    """
+
+    def __init__(self, model, id_attr, name_attr):
+        self.model = model
+        self.id_attr = id_attr
+        self.name_attr = name_attr
+        self._lock = threading.RLock()
+        self._names = None  # id -> lowercased name
+        self._postings = {}  # trigram -> set of ids
+        self._loaded_at = 0.0
+
+    def reload(self):
+        id_col = getattr(self.model, self.id_attr)
+        name_col = getattr(self.model, self.name_attr)
+        rows = self.model.query.with_entities(id_col, name_col).all()
+        names, postings = {}, {}
+        for row_id, name in rows:
+            lowered = (name or "").lower()
+            names[row_id] = lowered
+            for gram in _trigrams(lowered):
+                postings.setdefault(gram, set()).add(row_id)
+        with self._lock:
+            self._names, self._postings = names, postings
+            self._loaded_at = time.monotonic()
+
+    def _ensure_loaded(self):
+        ttl = current_app.config.get("SEARCH_INDEX_TTL", 600)
+        if self._names is None or time.monotonic() - self._loaded_at > ttl:
+            self.reload()
+
+    def upsert(self, row_id, name):
+        with self._lock:
+            if self._names is None:
+                return
+            self._discard(row_id)
+            lowered = (name or "").lower()
+            self._names[row_id] = lowered
+            for gram in _trigrams(lowered):
+                self._postings.setdefault(gram, set()).add(row_id)
+
+    def remove(self, row_id):
+        with self._lock:
+            if self._names is not None:
+                self._discard(row_id)
+
+    def _discard(self, row_id):
+        old = self._names.pop(row_id, None)
+        if old is None:
+            return
+        for gram in _trigrams(old):
+            ids = self._postings.get(gram)
+            if ids is not None:
+                ids.discard(row_id)
+                if not ids:
+                    del self._postings[gram]
+
+    def search(self, term, limit=None):
+        """Ids whose name contains `term` (case-insensitive), best match first;
+        at most `limit` of them if given."""
+        self._ensure_loaded()
+        term = term.lower()
+        with self._lock:
+            names = self._names
+            if len(term) < 3:
+                candidates = names.keys()
+            else:
+                posting_sets = sorted(
+                    (self._postings.get(g, set()) for g in _trigrams(term)), key=len
+                )
+                candidates = set.intersection(*posting_sets) if posting_sets[0] else ()
+            hits = [(row_id, names[row_id]) for row_id in candidates if term in names[row_id]]
+
+        def rank(hit):
+            row_id, name = hit
+            pos = name.find(term)
+            if name == term:
+                tier = 0
+            elif pos == 0:
+                tier = 1
+            elif not name[pos - 1].isalnum():
+                tier = 2
+            else:
+                tier = 3
+            return tier, len(name), row_id
+
+        if limit is not None and limit < len(hits):
+            hits = heapq.nsmallest(limit, hits, key=rank)
+        else:
+            hits.sort(key=rank)
+        return [row_id for row_id, _ in hits]
+
+
+ingredient_search = TrigramIndex(Ingredient, "ingredient_id", "ingredient_name")
+recipe_search = TrigramIndex(Recipe, "recipe_id", "recipe_name")
+
+
+@on_catalog_change
+def _sync_search_indexes(changes):
+    for index in (ingredient_search, recipe_search):
+        for change in changes:
+            if change.model is not index.model:
+                continue
+            if change.values is None:
+                index.remove(change.pk)
+            else:
+                index.upsert(change.pk, change.values[index.name_attr])
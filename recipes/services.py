@@ -1,9 +1,51 @@
-def get_recommended_recipes(age, gender):
-    # Dummy implementation for demonstration purposes
-    # Database query from here
-    if age < 5:
-        return ["Mashed Pumpkin", "Rice Porridge"]
-    elif gender == "female":
-        return ["Salad Bowl", "Fruit Smoothie"]
-    else:
-        return ["Grilled Chicken", "Veggie Soup"]
+from datetime import date, datetime, time
+
+from models import Recipe, SERVING_FIELDS
+from meals.services import summarize_servings
+from recipes.guideline_index import guideline_index
+from recipes.recommender import recipe_matrix
+
+def age_in_years(date_of_birth, on=None):
+    on = on or date.today()
+    return on.year - date_of_birth.year - (
+        (on.month, on.day) < (date_of_birth.month, date_of_birth.day)
+    )
+
+def get_guideline_for_child(child, on=None):
+    """The DietaryGuidelines row matching the child's gender and age, if any."""
+    return guideline_index.lookup(child.gender, age_in_years(child.date_of_birth, on))
+
+def get_remaining_servings(child, guideline, on=None):
+    """Guideline servings for the day minus what the child has eaten so far (floored at 0)."""
+    on = on or date.today()
+    eaten = summarize_servings(
+        child.child_id, datetime.combine(on, time.min), datetime.combine(on, time.max)
+    )
+    eaten = eaten[0] if eaten else {}
+    return {
+        f: max((getattr(guideline, f) or 0.0) - float(eaten.get(f) or 0), 0.0)
+        for f in SERVING_FIELDS
+    }
+
+def get_recommended_recipes(child, limit=10, **filters):
+    """
+    Recipes that best fill the child's remaining servings for today.
+
+    Returns None when no dietary guideline matches the child, otherwise the
+    guideline, the remaining servings and (Recipe, distance) pairs, best first.
+    """
+    guideline = get_guideline_for_child(child)
+    if guideline is None:
+        return None
+
+    remaining = get_remaining_servings(child, guideline)
+    ids, distances = recipe_matrix.nearest(
+        [remaining[f] for f in SERVING_FIELDS], limit, **filters
+    )
+    recipes = {r.recipe_id: r for r in Recipe.query.filter(Recipe.recipe_id.in_(ids))}
+
+    return {
+        "guideline": guideline,
+        "remaining": remaining,
+        "recipes": [(recipes[i], d) for i, d in zip(ids, distances) if i in recipes],
+    }
@@ -0,0 +1,265 @@
+"""
+Ranked full-text search over recipe names and cooking steps.
+
+Text is lowercased, split on non-alphanumerics, stripped of stop words and
+stemmed (Porter step 1: plurals, -ed, -ing), so "baked", "bakes" and
+"baking" all match "bake". A query matches recipes that contain every
+term; results are ranked by BM25 with name terms weighted NAME_WEIGHT
+times a cooking-step term.
+
+The index is an immutable base built by reload(), with each term's
+postings held as sorted numpy arrays, plus a small delta. Catalog commits
+write to the delta and tombstone the base copy, so changes are visible at
+once. The base is rebuilt when the delta grows past DELTA_REBUILD_FRACTION
+of the catalog, or after SEARCH_INDEX_TTL.
+"""
+import math
+import re
+import threading
+import time
+from functools import lru_cache
+
+import numpy as np
+from flask import current_app
+
+from models import Recipe
+from recipes.catalog import on_catalog_change
+
+NAME_WEIGHT = 3.0
+BM25_K1 = 1.2
+BM25_B = 0.75
+DELTA_REBUILD_FRACTION = 0.05
+
+STOP_WORDS = frozenset(
+    "a an and are as at be by for from in into is it of on or the then to with".split()
+)
+_TOKEN = re.compile(r"[a-z0-9]+")
+_VOWELS = frozenset("aeiou")
+
+
+# ---------------------------
+# Analysis
+# ---------------------------
+def _is_consonant(word, i):
+    if word[i] in _VOWELS:
+        return False
+    if word[i] == "y":
+        return i == 0 or not _is_consonant(word, i - 1)
+    return True
+
+
+def _measure(stem):
+    """Porter's m: the number of vowel-consonant sequences in `stem`."""
+    m, prev_vowel = 0, False
+    for i in range(len(stem)):
+        vowel = not _is_consonant(stem, i)
+        if prev_vowel and not vowel:
+            m += 1
+        prev_vowel = vowel
+    return m
+
+
+def _has_vowel(stem):
+    return any(not _is_consonant(stem, i) for i in range(len(stem)))
+
+
+def _ends_cvc(word):
+    return (
+        len(word) >= 3
+        and _is_consonant(word, len(word) - 3)
+        and not _is_consonant(word, len(word) - 2)
+        and _is_consonant(word, len(word) - 1)
+        and word[-1] not in "wxy"
+    )
+
+
+@lru_cache(maxsize=65536)
+def stem(word):
+    """Porter stemmer, step 1 (1a plurals, 1b -ed/-ing, 1c y -> i)."""
+    if len(word) <= 2:
+        return word
+    if word.endswith("sses") or word.endswith("ies"):
+        word = word[:-2]
+    elif word.endswith("s") and not word.endswith("ss"):
+        word = word[:-1]
+
+    if word.endswith("eed"):
+        if _measure(word[:-3]) > 0:
+            word = word[:-1]
+    else:
+        for suffix in ("ed", "ing"):
+            if word.endswith(suffix) and _has_vowel(word[:-len(suffix)]):
+                word = word[:-len(suffix)]
+                if word.endswith(("at", "bl", "iz")):
+                    word += "e"
+                elif len(word) >= 2 and word[-1] == word[-2] and word[-1] not in "lsz" \
+                        and _is_consonant(word, len(word) - 1):
+                    word = word[:-1]
+                elif _measure(word) == 1 and _ends_cvc(word):
+                    word += "e"
+                break
+
+    if word.endswith("y") and _has_vowel(word[:-1]):
+        word = word[:-1] + "i"
+    return word
+
+
+def analyze(text):
+    """Search terms of `text`, in order, repeats kept."""
+    return [stem(t) for t in _TOKEN.findall((text or "").lower()) if t not in STOP_WORDS]
+
+
+# ---------------------------
+# Index
+# ---------------------------
+class FullTextIndex:
+    def __init__(self, model, id_attr, field_weights):
+        self.model = model
+        self.id_attr = id_attr
+        self.field_weights = field_weights
+        self._lock = threading.RLock()
+        self._loaded_at = 0.0
+        self._ids = None            # base position -> row id
+        self._positions = {}        # row id -> base position
+        self._alive = None          # base position -> not deleted/replaced since reload
+        self._postings = {}         # term -> (sorted positions int32, BM25 weights float32)
+        self._avg_length = 1.0
+        self._delta = {}            # row id -> {term: BM25 weight}, rows changed since reload
+        self._delta_df = {}         # term -> rows in the delta containing it
+
+    def _term_frequencies(self, values):
+        tf, length = {}, 0.0
+        for field, weight in self.field_weights.items():
+            for term in analyze(values.get(field)):
+                tf[term] = tf.get(term, 0.0) + weight
+                length += weight
+        return tf, length
+
+    def _bm25(self, tf, length):
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * length / self._avg_length)
+        return {term: f * (BM25_K1 + 1) / (f + norm) for term, f in tf.items()}
+
+    def reload(self):
+        id_col = getattr(self.model, self.id_attr)
+        columns = [getattr(self.model, field) for field in self.field_weights]
+        rows = self.model.query.with_entities(id_col, *columns).order_by(id_col).all()
+
+        docs = [self._term_frequencies(dict(zip(self.field_weights, row[1:]))) for row in rows]
+        avg_length = (sum(length for _, length in docs) / len(docs)) if docs else 1.0
+        norm_base = BM25_K1 * (1 - BM25_B)
+        norm_length = BM25_K1 * BM25_B / (avg_length or 1.0)
+
+        grouped = {}
+        for position, (tf, length) in enumerate(docs):
+            norm = norm_base + norm_length * length
+            for term, f in tf.items():
+                entry = grouped.get(term)
+                if entry is None:
+                    entry = grouped[term] = ([], [])
+                entry[0].append(position)
+                entry[1].append(f * (BM25_K1 + 1) / (f + norm))
+        postings = {
+            term: (np.array(positions, dtype=np.int32), np.array(weights, dtype=np.float32))
+            for term, (positions, weights) in grouped.items()
+        }
+        ids = np.array([row[0] for row in rows], dtype=np.int64)
+
+        with self._lock:
+            self._ids = ids
+            self._positions = {row_id: i for i, row_id in enumerate(ids.tolist())}
+            self._alive = np.ones(len(ids), dtype=bool)
+            self._postings = postings
+            self._avg_length = avg_length or 1.0
+            self._delta, self._delta_df = {}, {}
+            self._loaded_at = time.monotonic()
+
+    def _ensure_loaded(self):
+        ttl = current_app.config.get("SEARCH_INDEX_TTL", 600)
+        stale = self._ids is None or time.monotonic() - self._loaded_at > ttl
+        if stale or len(self._delta) > max(100, DELTA_REBUILD_FRACTION * len(self._ids)):
+            self.reload()
+
+    def upsert(self, row_id, values):
+        with self._lock:
+            if self._ids is None:
+                return
+            self._discard(row_id)
+            weights = self._bm25(*self._term_frequencies(values))
+            self._delta[row_id] = weights
+            for term in weights:
+                self._delta_df[term] = self._delta_df.get(term, 0) + 1
+
+    def remove(self, row_id):
+        with self._lock:
+            if self._ids is not None:
+                self._discard(row_id)
+
+    def _discard(self, row_id):
+        position = self._positions.pop(row_id, None)
+        if position is not None:
+            self._alive[position] = False
+        for term in self._delta.pop(row_id, ()):
+            self._delta_df[term] -= 1
+
+    def search(self, text, limit=20):
+        """[(row id, score)] of rows containing every term of `text`, best first."""
+        self._ensure_loaded()
+        terms = list(dict.fromkeys(analyze(text)))
+        if not terms:
+            return []
+        with self._lock:
+            # Tombstoned base rows keep counting until the next rebuild, in
+            # n_docs and in df alike, so idf stays positive
+            n_docs = len(self._ids) + len(self._delta)
+            idf = {}
+            for term in terms:
+                df = len(self._postings.get(term, ((),))[0]) + self._delta_df.get(term, 0)
+                idf[term] = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+
+            hits = self._search_base(terms, idf, limit)
+            for row_id, weights in self._delta.items():
+                if all(term in weights for term in terms):
+                    hits.append((row_id, sum(idf[t] * weights[t] for t in terms)))
+
+        hits.sort(key=lambda hit: (-hit[1], hit[0]))
+        return hits[:limit]
+
+    def _search_base(self, terms, idf, limit):
+        lists = [self._postings.get(term) for term in terms]
+        if any(entry is None for entry in lists):
+            return []
+        # Intersect starting from the rarest term; every array is sorted by position
+        order = sorted(range(len(terms)), key=lambda i: len(lists[i][0]))
+        positions, weights = lists[order[0]]
+        scores = weights * idf[terms[order[0]]]
+        for i in order[1:]:
+            other_positions, other_weights = lists[i]
+            at = np.searchsorted(other_positions, positions)
+            at[at == len(other_positions)] = 0
+            found = other_positions[at] == positions
+            positions, at, scores = positions[found], at[found], scores[found]
+            scores = scores + other_weights[at] * idf[terms[i]]
+            if not len(positions):
+                return []
+        alive = self._alive[positions]
+        positions, scores = positions[alive], scores[alive]
+        if len(scores) > limit:
+            top = np.argpartition(-scores, limit - 1)[:limit]
+            positions, scores = positions[top], scores[top]
+        return list(zip(self._ids[positions].tolist(), scores.tolist()))
+
+
+recipe_text_search = FullTextIndex(
+    Recipe, "recipe_id", {"recipe_name": NAME_WEIGHT, "cooking_steps": 1.0}
+)
+
+
+@on_catalog_change
+def _sync_text_index(changes):
+    for change in changes:
+        if change.model is not Recipe:
+            continue
+        if change.values is None:
+            recipe_text_search.remove(change.pk)
+        else:
+            recipe_text_search.upsert(change.pk, change.values)
@@ -0,0 +1,113 @@
+"""
+Local check of read-replica routing (db_routing.py) with two SQLite files.
+
+Points DATABASE_URL and DATABASE_REPLICA_URLS at two throwaway SQLite
+databases holding the same child under different names, so every
+response shows which database answered, and records which engine ran
+each statement. Exits non-zero unless:
+  - GET requests read from the replica only,
+  - POST requests run on the primary only,
+  - a flush inside a GET request goes to the primary,
+  - a GET falls back to the primary while the replica is marked down.
+
+    python replica_routing.py
+
+To try routing by hand, run the app the same way:
+
+    DATABASE_URL=sqlite:///$PWD/primary.db DATABASE_REPLICA_URLS=sqlite:///$PWD/replica.db \\
+        flask --app app:create_app run
+"""
+import os
+import sys
+import tempfile
+from datetime import date
+
+_tmp = tempfile.mkdtemp(prefix="replica-routing-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp}/primary.db"
+os.environ["DATABASE_REPLICA_URLS"] = f"sqlite:///{_tmp}/replica.db"
+
+from sqlalchemy import event
+
+import db_routing
+from app import create_app
+from extension import db
+from models import Children
+
+app = create_app()
+
+REPLICA = "replica_0"
+
+
+def _seed():
+    """The same child on both databases, named after the one it lives on."""
+    for key, name in ((None, "primary"), (REPLICA, "replica")):
+        engine = db.engines[key]
+        db.metadata.create_all(engine)
+        with engine.begin() as conn:
+            conn.execute(Children.__table__.insert(), [
+                {"child_id": 1, "name": name, "gender": "F",
+                 "date_of_birth": date(2019, 1, 1), "meals_per_day": 3},
+            ])
+
+
+def _capture(engines, action):
+    """Run `action()` and return (its result, the bind keys that ran SQL, in order)."""
+    used = []
+    listeners = []
+    for key, engine in engines.items():
+        def record(conn, cursor, statement, parameters, context, executemany, key=key):
+            used.append(key or "primary")
+        event.listen(engine, "before_cursor_execute", record)
+        listeners.append((engine, record))
+    try:
+        return action(), used
+    finally:
+        for engine, record in listeners:
+            event.remove(engine, "before_cursor_execute", record)
+
+
+def _flush_in_get():
+    with app.test_request_context("/children/", method="GET"):
+        db.session.add(Children(name="flushed", gender="F",
+                                date_of_birth=date(2019, 1, 1), meals_per_day=3))
+        db.session.flush()
+        db.session.rollback()
+
+
+def check_replica_routing():
+    """Return a list of (check, message) for every routing rule that does not hold."""
+    failures = []
+    with app.app_context():
+        _seed()
+        engines = dict(db.engines)
+    # Requests run outside any app context, as in production: an enclosing
+    # one would be reused, and with it g.read_replica, by every request
+    client = app.test_client()
+
+    response, used = _capture(engines, lambda: client.get("/children/?ids=1"))
+    if set(used) != {REPLICA} or response.json[0]["name"] != "replica":
+        failures.append(("GET reads from the replica", f"ran on {used}, got {response.json}"))
+
+    child = {"name": "new", "gender": "M", "date_of_birth": "2020-01-01", "meals_per_day": 3}
+    response, used = _capture(engines, lambda: client.post("/children/", json=child))
+    if response.status_code != 201 or set(used) != {"primary"}:
+        failures.append(("POST writes to the primary", f"HTTP {response.status_code}, ran on {used}"))
+
+    _, used = _capture(engines, _flush_in_get)
+    if set(used) != {"primary"}:
+        failures.append(("a flush in a GET goes to the primary", f"ran on {used}"))
+
+    db_routing.mark_down(REPLICA)
+    response, used = _capture(engines, lambda: client.get("/children/?ids=1"))
+    if set(used) != {"primary"} or response.json[0]["name"] != "primary":
+        failures.append(("GET falls back to the primary", f"ran on {used}, got {response.json}"))
+    return failures
+
+
+if __name__ == "__main__":
+    failures = check_replica_routing()
+    for check, message in failures:
+        print(f"FAIL {check}: {message}")
+    if failures:
+        sys.exit(1)
+    print(f"OK: reads go to {REPLICA}, writes and flushes to the primary ({_tmp})")
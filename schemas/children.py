@@ -1,7 +1,10 @@
 # schemas/children.py
-from marshmallow import Schema, fields, validate
+from marshmallow import Schema, ValidationError, fields, validate, validates
+from schemas.meals import ServingTotals
+from schemas.mood_logs import MoodLog
 
 GENDERS = ["M", "F"]
+MAX_DASHBOARD_CHILDREN = 100
 
 # ----- Core entity -----
 class _ChildFields(Schema):
@@ -32,4 +35,32 @@ class GetChildrenQuery(Schema):
     ids = fields.String(
         required=False,
         metadata={"description": "Comma-separated child IDs (e.g., 1,2,3)"}
-    )
\ No newline at end of file
+    )
+
+class ExportQuery(Schema):
+    format = fields.String(load_default="ndjson", validate=validate.OneOf(["ndjson", "csv"]))
+
+class DashboardQuery(Schema):
+    ids = fields.String(
+        required=True,
+        metadata={"description": f"Comma-separated child IDs (e.g., 1,2,3), at most {MAX_DASHBOARD_CHILDREN}"}
+    )
+
+    @validates("ids")
+    def _check_ids(self, value, **kwargs):
+        parts = [x.strip() for x in value.split(",")]
+        if not all(x.isdigit() for x in parts):
+            raise ValidationError("Must be comma-separated integers.")
+        if len(parts) > MAX_DASHBOARD_CHILDREN:
+            raise ValidationError(f"At most {MAX_DASHBOARD_CHILDREN} IDs.")
+
+# ----- Responses -----
+class DayNutrition(ServingTotals):
+    meal_count = fields.Int(required=True)
+
+class DashboardEntry(Schema):
+    child = fields.Nested(Child, required=True)
+    latest_mood = fields.Nested(MoodLog, allow_none=True, required=True)
+    today = fields.Nested(DayNutrition, required=True)
+    targets = fields.Nested(ServingTotals, allow_none=True, required=True,
+                            metadata={"description": "Daily guideline servings; null when no guideline matches"})
@@ -1,4 +1,6 @@
-from marshmallow import Schema, fields
+from marshmallow import Schema, fields, validate, ValidationError
+from pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, MAX_RANGE_PAGE_SIZE, decode_cursor
+from bulk import MAX_BULK_ITEMS
 
 class MessageSchema(Schema):
     message = fields.String(required=True)
@@ -7,4 +9,63 @@ class ErrorSchema(Schema):
     code = fields.Integer(load_default=None, allow_none=True)
     status = fields.String(load_default=None, allow_none=True)
     message = fields.String(required=True)
-    errors = fields.Dict(keys=fields.String(), values=fields.Raw(), load_default=None, allow_none=True)
\ No newline at end of file
+    errors = fields.Dict(keys=fields.String(), values=fields.Raw(), load_default=None, allow_none=True)
+
+# ----- Pagination -----
+class Cursor(fields.String):
+    """Opaque keyset cursor; loads to a (created_at, id) tuple."""
+
+    def _deserialize(self, value, attr, data, **kwargs):
+        raw = super()._deserialize(value, attr, data, **kwargs)
+        try:
+            return decode_cursor(raw)
+        except ValueError as exc:
+            raise ValidationError("Invalid cursor.") from exc
+
+class PageQuery(Schema):
+    limit = fields.Integer(
+        load_default=DEFAULT_PAGE_SIZE,
+        validate=validate.Range(min=1, max=MAX_PAGE_SIZE),
+        metadata={"description": f"Page size (max {MAX_PAGE_SIZE})"},
+    )
+    cursor = Cursor(
+        required=False,
+        metadata={"description": "next_cursor from the previous page"},
+    )
+
+class PageSchema(Schema):
+    next_cursor = fields.String(allow_none=True)
+
+class RangePageQuery(Schema):
+    # Time-range reads keep returning a bare list, oldest first; the cursor
+    # for the rest travels in the X-Next-Cursor header
+    limit = fields.Integer(
+        load_default=MAX_RANGE_PAGE_SIZE,
+        validate=validate.Range(min=1, max=MAX_RANGE_PAGE_SIZE),
+        metadata={"description": f"Most rows to return (max {MAX_RANGE_PAGE_SIZE}); "
+                                 "X-Next-Cursor is set when more remain"},
+    )
+    cursor = Cursor(
+        required=False,
+        metadata={"description": "X-Next-Cursor from the previous response"},
+    )
+
+NEXT_CURSOR_HEADER = {
+    "X-Next-Cursor": {
+        "description": "Cursor for the rest of the range; absent on the last page",
+        "schema": {"type": "string"},
+    }
+}
+
+# ----- Bulk create -----
+def bulk_items(item_schema):
+    # Items are validated one by one in the handler so errors can be reported per item
+    return fields.List(
+        fields.Dict(), required=True,
+        validate=validate.Length(min=1, max=MAX_BULK_ITEMS),
+        metadata={"description": f"Each item is a {item_schema} body"},
+    )
+
+class BulkItemError(Schema):
+    index = fields.Int(required=True, metadata={"description": "Position in the request items"})
+    errors = fields.Dict(keys=fields.String(), values=fields.Raw(), required=True)
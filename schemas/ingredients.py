@@ -1,4 +1,5 @@
 from marshmallow import Schema, fields, validate
+from recipes.search_index import MAX_NAME_MATCHES
 
 class _IngredientFields(Schema):
     ingredient_name = fields.String()
@@ -18,4 +19,5 @@ class UpdateIngredient(_IngredientFields):
 class GetIngredientsQuery(Schema):
     ids = fields.String(required=False, metadata={"description": "Comma-separated ingredient IDs"})
     category = fields.String(required=False)
-    ingredient_name = fields.String(required=False, metadata={"description": "Partial match"})
\ No newline at end of file
+    ingredient_name = fields.String(required=False, metadata={
+        "description": f"Partial match, best matches first; at most the {MAX_NAME_MATCHES} best are returned"})
\ No newline at end of file
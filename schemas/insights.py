@@ -0,0 +1,33 @@
+from marshmallow import Schema, fields, validate, validates_schema, ValidationError
+
+MAX_WINDOW_DAYS = 366
+
+# Query schemas
+class CorrelationQuery(Schema):
+    start = fields.Date(required=True)
+    end = fields.Date(required=True)
+    max_lag = fields.Integer(load_default=3, validate=validate.Range(min=0, max=14),
+                             metadata={"description": "Largest lag in days between meals and mood"})
+
+    @validates_schema
+    def _check_window(self, data, **kwargs):
+        if "start" in data and "end" in data:
+            days = (data["end"] - data["start"]).days
+            if not 0 <= days < MAX_WINDOW_DAYS:
+                raise ValidationError(f"end must be on or after start, within {MAX_WINDOW_DAYS} days.", "end")
+
+# ----- Responses -----
+class LaggedCorrelation(Schema):
+    feature = fields.String(required=True, metadata={"description": "Serving field, or meal_count"})
+    lag = fields.Int(required=True, metadata={"description": "Mood is taken this many days after the meals"})
+    r = fields.Float(allow_none=True, metadata={"description": "Pearson correlation; null with too few paired days"})
+    paired_days = fields.Int(required=True)
+
+class MoodNutritionCorrelation(Schema):
+    child_id = fields.Int(required=True)
+    start = fields.Date(required=True)
+    end = fields.Date(required=True)
+    max_lag = fields.Int(required=True)
+    days_with_meals = fields.Int(required=True)
+    days_with_moods = fields.Int(required=True)
+    correlations = fields.List(fields.Nested(LaggedCorrelation), required=True)
@@ -1,4 +1,6 @@
 from marshmallow import Schema, fields, validate
+from schemas.common import PageSchema, RangePageQuery, BulkItemError, bulk_items
+from time_buckets import BUCKETS, GRANULARITIES
 
 MEAL_TYPES = ["Breakfast", "Lunch", "Dinner", "Snack", "Dessert"]
 
@@ -29,10 +31,52 @@ class CreateMeal(_MealFields):
 class UpdateMeal(_MealFields):
     pass
 
-class MealsRangeQuery(Schema):
+class _MealsWindow(Schema):
     start = fields.DateTime(required=True)
     end = fields.DateTime(required=True)
+
+class MealsRangeQuery(_MealsWindow, RangePageQuery):
+    # limit/cursor page the raw meals; a granularity series is not paged
+    granularity = fields.String(required=False, validate=validate.OneOf(GRANULARITIES),
+                                metadata={"description": "Return per-period meal counts and servings instead of raw meals"})
+
+class MealsSummaryQuery(_MealsWindow):
+    bucket = fields.String(load_default="day", validate=validate.OneOf(BUCKETS))
 # Response envelopes
 class MealMessageResponse(Schema):
     message = fields.String(required=True)
     meal = fields.Nested(Meal, required=True)
+
+class MealPage(PageSchema):
+    items = fields.List(fields.Nested(Meal), required=True)
+
+class ServingTotals(Schema):
+    servings_fruit = fields.Float(allow_none=True)
+    servings_grain = fields.Float(allow_none=True)
+    servings_meat_fish_eggs_nuts_seeds = fields.Float(allow_none=True)
+    servings_milk_yoghurt_cheese = fields.Float(allow_none=True)
+    servings_veg_legumes_beans = fields.Float(allow_none=True)
+
+class MealsSummaryBucket(ServingTotals):
+    period_start = fields.Date(required=True)
+    meal_count = fields.Int(required=True)
+
+class MealsPeriod(ServingTotals):
+    period_start = fields.String(required=True,
+                                 metadata={"description": "A date, or a date-time for granularity=hour"})
+    meal_count = fields.Int(required=True)
+
+class MealsSummary(Schema):
+    child_id = fields.Int(required=True)
+    bucket = fields.String(required=True)
+    guideline_id = fields.Int(allow_none=True)
+    targets = fields.Nested(ServingTotals, allow_none=True,
+                            metadata={"description": "Guideline servings per bucket"})
+    buckets = fields.List(fields.Nested(MealsSummaryBucket), required=True)
+
+class BulkCreateMeals(Schema):
+    items = bulk_items("CreateMeal")
+
+class BulkMealsResponse(Schema):
+    created = fields.List(fields.Nested(Meal), required=True)
+    errors = fields.List(fields.Nested(BulkItemError), required=True)
@@ -1,4 +1,6 @@
 from marshmallow import Schema, fields, validate
+from schemas.common import PageSchema, RangePageQuery, BulkItemError, bulk_items
+from time_buckets import GRANULARITIES
 
 # Define allowed mood types
 MOOD_TYPES = ["laugh", "happy", "neutral", "sad", "angry"]
@@ -12,9 +14,16 @@ class MoodLog(Schema):
     created_at = fields.DateTime(dump_only=True)
 
 # Query schemas
-class MoodLogsRangeQuery(Schema):
+class MoodLogsRangeQuery(RangePageQuery):
+    # limit/cursor page the raw mood logs; a granularity series is not paged
     start = fields.DateTime(required=True)
     end = fields.DateTime(required=True)
+    granularity = fields.String(required=False, validate=validate.OneOf(GRANULARITIES),
+                                metadata={"description": "Return per-period mood counts instead of raw mood logs"})
+
+class MoodSummaryQuery(Schema):
+    start = fields.Date(required=True)
+    end = fields.Date(required=True)
 
 # ----- Requests -----
 class CreateMoodLog(Schema):
@@ -31,3 +40,30 @@ class UpdateMoodLog(Schema):
 class MoodLogMessageResponse(Schema):
     message = fields.String(required=True)
     mood_log = fields.Nested(MoodLog, required=True)
+
+class MoodLogPage(PageSchema):
+    items = fields.List(fields.Nested(MoodLog), required=True)
+
+class BulkCreateMoodLogs(Schema):
+    items = bulk_items("CreateMoodLog")
+
+class BulkMoodLogsResponse(Schema):
+    created = fields.List(fields.Nested(MoodLog), required=True)
+    errors = fields.List(fields.Nested(BulkItemError), required=True)
+
+class MoodDay(Schema):
+    day = fields.Date(required=True)
+    total = fields.Int(required=True)
+    counts = fields.Dict(keys=fields.String(), values=fields.Int(), required=True,
+                         metadata={"description": "Mood logs per mood on this day"})
+
+class MoodPeriod(Schema):
+    period_start = fields.String(required=True,
+                                 metadata={"description": "A date, or a date-time for granularity=hour"})
+    total = fields.Int(required=True)
+    counts = fields.Dict(keys=fields.String(), values=fields.Int(), required=True,
+                         metadata={"description": "Mood logs per mood in this period"})
+
+class MoodSummary(Schema):
+    child_id = fields.Int(required=True)
+    days = fields.List(fields.Nested(MoodDay), required=True)
@@ -7,8 +7,8 @@ class _RecipeIngredientFields(Schema):
 
 class RecipeIngredient(_RecipeIngredientFields):
     recipe_ingredient_id = fields.Int(dump_only=True)
-    recipe_name = fields.String(dump_only=True, allow_none=True)
-    ingredient_name = fields.String(dump_only=True, allow_none=True)
+    recipe_name = fields.String(attribute="recipe.recipe_name", dump_only=True, allow_none=True)
+    ingredient_name = fields.String(attribute="ingredient.ingredient_name", dump_only=True, allow_none=True)
 
 class CreateRecipeIngredient(_RecipeIngredientFields):
     recipe_id = fields.Int(required=True)
@@ -1,4 +1,6 @@
 from marshmallow import Schema, fields, validate
+from schemas.meals import ServingTotals
+from recipes.search_index import MAX_NAME_MATCHES
 
 def _serv():
     return fields.Float(allow_none=True, validate=validate.Range(min=0))
@@ -28,7 +30,60 @@ class UpdateRecipe(_RecipeFields):
 
 class GetRecipesQuery(Schema):
     ids = fields.String(required=False, metadata={"description": "Comma-separated recipe IDs"})
-    recipe_name = fields.String(required=False, metadata={"description": "ILIKE match"})
+    recipe_name = fields.String(required=False, metadata={
+        "description": f"Case-insensitive substring match, best matches first; "
+                       f"at most the {MAX_NAME_MATCHES} best name matches are returned"})
     recipe_type = fields.String(required=False)
     cuisine_type = fields.String(required=False)
-    dietary_preferences = fields.String(required=False)
\ No newline at end of file
+    dietary_preferences = fields.String(required=False)
+
+class RecipeSearchQuery(Schema):
+    q = fields.String(required=True, validate=validate.Length(min=1, max=200),
+                      metadata={"description": "Words to find in recipe names and cooking steps; all must match"})
+    limit = fields.Integer(load_default=20, validate=validate.Range(min=1, max=100))
+
+class RecipeSearchHit(Recipe):
+    score = fields.Float(required=True, metadata={"description": "BM25 relevance; higher is better"})
+
+class MakeableRecipesQuery(Schema):
+    ingredient_ids = fields.String(required=True, metadata={"description": "Comma-separated ingredient IDs on hand"})
+    max_missing = fields.Integer(load_default=0, validate=validate.Range(min=0, max=20),
+                                 metadata={"description": "Also return recipes missing up to this many ingredients"})
+    limit = fields.Integer(load_default=20, validate=validate.Range(min=1, max=100))
+
+class MakeableRecipe(Recipe):
+    matched = fields.Int(required=True, metadata={"description": "Recipe ingredients on hand"})
+    missing_ingredient_ids = fields.List(fields.Int(), required=True)
+
+class RecommendationsQuery(Schema):
+    recipe_type = fields.String(required=False)
+    cuisine_type = fields.String(required=False)
+    dietary_preferences = fields.String(required=False)
+    limit = fields.Integer(load_default=10, validate=validate.Range(min=1, max=100))
+
+class RecommendedRecipe(Recipe):
+    distance = fields.Float(required=True, metadata={"description": "Distance from remaining servings; lower is better"})
+
+class Recommendations(Schema):
+    child_id = fields.Int(required=True)
+    guideline_id = fields.Int(required=True)
+    remaining = fields.Nested(ServingTotals, required=True,
+                              metadata={"description": "Servings still needed today"})
+    recipes = fields.List(fields.Nested(RecommendedRecipe), required=True)
+
+class MealPlanQuery(Schema):
+    dietary_preferences = fields.String(required=False)
+
+class MealPlanDay(Schema):
+    day = fields.Int(required=True, metadata={"description": "1-7"})
+    recipes = fields.List(fields.Nested(Recipe), required=True)
+    totals = fields.Nested(ServingTotals, required=True)
+
+class MealPlan(Schema):
+    child_id = fields.Int(required=True)
+    guideline_id = fields.Int(required=True)
+    meals_per_day = fields.Int(required=True)
+    target = fields.Nested(ServingTotals, required=True, metadata={"description": "Guideline servings per day"})
+    days = fields.List(fields.Nested(MealPlanDay), required=True)
+    cost = fields.Float(required=True, metadata={"description": "Sum of squared relative misses; lower is better"})
+    converged = fields.Bool(required=True, metadata={"description": "False if the time budget cut the search short"})
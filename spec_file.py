@@ -0,0 +1,34 @@
+"""
+Serve a pre-generated OpenAPI document instead of building it per worker.
+
+Generate it at deploy time, with OPENAPI_SPEC_FILE unset:
+
+    DATABASE_URL=sqlite:// flask --app app:create_app openapi write --format=json openapi.json
+
+then run with OPENAPI_SPEC_FILE=openapi.json. Blueprints are registered
+without converting their views' schemas into the apispec, and
+/openapi.json returns the file's bytes as is.
+"""
+from flask import current_app
+from flask_smorest import Api
+
+
+class SpecFileApi(Api):
+    def init_app(self, app, **kwargs):
+        self._spec_body = None
+        path = app.config.get("OPENAPI_SPEC_FILE")
+        if path:
+            with open(path, "rb") as f:
+                self._spec_body = f.read()
+        super().init_app(app, **kwargs)
+
+    def register_blueprint(self, blp, *, parameters=None, **options):
+        if self._spec_body is None:
+            return super().register_blueprint(blp, parameters=parameters, **options)
+        self._app.extensions["flask-smorest"]["blp_name_to_api"][options.get("name", blp.name)] = self
+        self._app.register_blueprint(blp, **options)
+
+    def _openapi_json(self):
+        if self._spec_body is None:
+            return super()._openapi_json()
+        return current_app.response_class(self._spec_body, mimetype="application/json")
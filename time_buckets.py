@@ -0,0 +1,49 @@
+from sqlalchemy import Date, DateTime
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+# Buckets for the summary endpoints, whose targets scale per day
+BUCKETS = ["day", "week"]
+# Granularities accepted by the range endpoints
+GRANULARITIES = ["hour", "day", "week", "month"]
+
+
+class bucket_start(FunctionElement):
+    """
+    Start of the hour/day/week/month a timestamp falls in.
+
+    A TIMESTAMP for hours, otherwise a DATE. Weeks start on Monday on every
+    backend, matching PostgreSQL's date_trunc('week', ...).
+    """
+    # bucket is not part of the SQL cache key, so never share compiled SQL
+    inherit_cache = False
+    name = "bucket_start"
+
+    def __init__(self, column, bucket):
+        if bucket not in GRANULARITIES:
+            raise ValueError(f"Unknown bucket {bucket!r}")
+        self.bucket = bucket
+        self.type = DateTime() if bucket == "hour" else Date()
+        super().__init__(column)
+
+
+@compiles(bucket_start, "postgresql")
+def _bucket_start_pg(element, compiler, **kw):
+    column = compiler.process(list(element.clauses)[0], **kw)
+    if element.bucket == "hour":
+        return f"date_trunc('hour', {column})"
+    return f"CAST(date_trunc('{element.bucket}', {column}) AS DATE)"
+
+
+@compiles(bucket_start, "sqlite")
+def _bucket_start_sqlite(element, compiler, **kw):
+    column = compiler.process(list(element.clauses)[0], **kw)
+    if element.bucket == "hour":
+        return f"strftime('%Y-%m-%d %H:00:00.000000', {column})"
+    if element.bucket == "week":
+        # Step back six days, then 'weekday 1' moves forward to the first
+        # Monday on or after that: the Monday that starts the week
+        return f"date({column}, '-6 days', 'weekday 1')"
+    if element.bucket == "month":
+        return f"date({column}, 'start of month')"
+    return f"date({column})"
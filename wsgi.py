@@ -1,5 +1,7 @@
-from app import app
+from app import create_app
 
+# Built once per process; with gunicorn --preload (gunicorn.conf.py) that is
+# once in the master, before the workers fork.
 app = create_app()
 # if __name__ == "__main__":
 #     app.run()